@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Benchmark de Tiempo de Arranque - Proyecto Linked Data Universidades
+Mide, en procesos nuevos, cuánto tarda en importarse el módulo de cada comando
+y qué bibliotecas pesadas (pandas, plotly, matplotlib, seaborn, networkx) quedan cargadas
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_DIR = os.path.join(BASE_DIR, "src")
+
+# Comando -> módulo que importa su punto de entrada
+COMMANDS = {
+    'consultas SPARQL': "sparql_analyzer",
+    'transformación': "data_transformer_fixed",
+    'ontología': "ontology_creator",
+    'orquestador': "pipeline",
+    'carga RDF': "rdf_loader",
+    'análisis exploratorio': "data_analysis",
+    'visualizaciones': "final_visualizations",
+}
+
+# Bibliotecas pesadas cuya carga se informa
+HEAVY_MODULES = ("pandas", "numpy", "plotly", "matplotlib", "seaborn", "networkx", "rdflib")
+
+# Programa ejecutado en cada proceso: importa el módulo y devuelve el tiempo y lo cargado
+PROBE = """
+import json, sys, time
+sys.path.insert(0, {src!r})
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{'seconds': elapsed,
+                   'loaded': [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure(module, repeat):
+    """Mediana del tiempo de importación de un módulo en `repeat` procesos nuevos"""
+    samples = []
+    for _ in range(repeat):
+        code = PROBE.format(src=SRC_DIR, module=module, heavy=HEAVY_MODULES)
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                                check=True, cwd=SRC_DIR).stdout
+        samples.append(json.loads(output.strip().splitlines()[-1]))
+    return statistics.median(s['seconds'] for s in samples), samples[-1]['loaded']
+
+
+def main():
+    """Función principal del benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="procesos por comando; se informa la mediana (por defecto 5)")
+    parser.add_argument("--commands", nargs="+", choices=list(COMMANDS), default=list(COMMANDS),
+                        help="comandos a medir (por defecto todos)")
+    args = parser.parse_args()
+
+    print("\n=== BENCHMARK TIEMPO DE ARRANQUE ===")
+    print(f"Python {sys.version.split()[0]}, mediana de {args.repeat} procesos por comando")
+    for command in args.commands:
+        seconds, loaded = measure(COMMANDS[command], args.repeat)
+        print(f"{command:<22} {seconds * 1000:7.0f} ms  carga: {', '.join(loaded) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark del Almacén de Enteros - Proyecto Linked Data Universidades
+Compara memoria y tiempo de carga del store Memory de rdflib con IntegerStore
+sobre ISOFV163_A8_Anexo.csv escalado N veces (transformación vectorizada)
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BASE_DIR, "src"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_term_pool import ONTOLOGY_PATH, peak_rss_mb
+
+STORES = ["default", "IntegerStore"]
+
+
+def measure(csv_path, store):
+    """Construir el grafo en este proceso con el store indicado"""
+    from data_transformer_fixed import DataTransformer
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        transformer = DataTransformer(csv_path, ONTOLOGY_PATH, vectorized=True, store=store)
+        baseline = peak_rss_mb()
+        start = time.perf_counter()
+        transformer.transform_students()
+        transformer.transform_universities()
+        transformer.transform_academic_decisions()
+        transformer.add_metadata()
+        count = len(transformer.g)
+        elapsed = time.perf_counter() - start
+    return {'seconds': elapsed, 'graph_mb': peak_rss_mb() - baseline, 'triples': count}
+
+
+def run_isolated(csv_path, store):
+    """Medir un store en un proceso nuevo para que la memoria no se mezcle"""
+    command = [sys.executable, os.path.abspath(__file__), "--measure", csv_path, "--store", store]
+    output = subprocess.run(command, capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    """Función principal del benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scale", type=int, default=10,
+                        help="veces que se replica el CSV original (por defecto 10)")
+    parser.add_argument("--measure", help=argparse.SUPPRESS)
+    parser.add_argument("--store", default="default", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        # Modo interno: una sola medición, resultado en JSON por stdout
+        print(json.dumps(measure(args.measure, args.store)))
+        return
+
+    from bench_vectorized_transform import build_scaled_csv
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = build_scaled_csv(args.scale, tmp)
+        results = [(store, run_isolated(csv_path, store)) for store in STORES]
+
+    print("\n=== BENCHMARK ALMACÉN DE ENTEROS ===")
+    print(f"Escala: x{args.scale} ({args.scale * 10000} registros)")
+    for store, result in results:
+        per_triple = result['graph_mb'] * 1024 * 1024 / result['triples']
+        print(f"{store}: {result['graph_mb']:.0f} MB ({per_triple:.0f} bytes por triple), "
+              f"{result['seconds']:.2f} s, {result['triples']} triples")
+
+
+if __name__ == "__main__":
+    main()
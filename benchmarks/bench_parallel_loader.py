@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Benchmark de Carga Paralela - Proyecto Linked Data Universidades
+Compara el rendimiento (triples/s) de Graph.parse con load_rdf por fragmentos en un pool de procesos,
+para N-Triples y Turtle generados a partir de ISOFV163_A8_Anexo.csv escalado N veces
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BASE_DIR, "src"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from rdflib import Graph
+
+from data_transformer_fixed import DataTransformer
+from rdf_export import write_format
+from rdf_loader import load_rdf
+from bench_vectorized_transform import build_scaled_csv, ONTOLOGY_PATH
+
+
+def build_dumps(scale, directory):
+    """Generar los volcados .nt y .ttl del CSV escalado"""
+    csv_path = build_scaled_csv(scale, directory)
+    with contextlib.redirect_stdout(io.StringIO()):
+        transformer = DataTransformer(csv_path, ONTOLOGY_PATH, vectorized=True)
+        transformer.transform_students()
+        transformer.transform_universities()
+        transformer.transform_academic_decisions()
+        transformer.add_metadata()
+    paths = {}
+    for extension in ("nt", "ttl"):
+        paths[extension] = os.path.join(directory, f"anexo_x{scale}.{extension}")
+        write_format(transformer.g, extension, paths[extension])
+    return paths
+
+
+def time_current(path, rdf_format):
+    """Ruta actual: Graph.parse en un solo proceso"""
+    graph = Graph()
+    start = time.perf_counter()
+    graph.parse(path, format=rdf_format)
+    return len(graph), time.perf_counter() - start
+
+
+def main():
+    """Función principal del benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scale", type=int, default=10,
+                        help="veces que se replica el CSV original (por defecto 10)")
+    parser.add_argument("--workers", type=int, nargs="+", default=[2, 4, os.cpu_count() or 1],
+                        help="número de procesos a probar")
+    args = parser.parse_args()
+
+    print("\n=== BENCHMARK CARGA PARALELA ===")
+    print(f"Escala: x{args.scale} ({args.scale * 10000} registros), CPUs: {os.cpu_count()}")
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = build_dumps(args.scale, tmp)
+        for extension, rdf_format in (("nt", "nt"), ("ttl", "turtle")):
+            count, seconds = time_current(paths[extension], rdf_format)
+            print(f"{extension} Graph.parse: {count / seconds:,.0f} triples/s ({seconds:.2f} s)")
+            for workers in sorted(set(args.workers)):
+                graph = Graph()
+                loaded, seconds = load_rdf(graph, paths[extension], workers=workers)
+                status = "idéntico" if loaded == count else f"distinto ({loaded} triples)"
+                print(f"{extension} load_rdf con {workers} procesos: {loaded / seconds:,.0f} triples/s "
+                      f"({seconds:.2f} s, {status})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark de Motores de Consulta - Proyecto Linked Data Universidades
+Compara el tiempo de las nueve consultas de análisis con rdflib y con el motor vectorizado
+(NumPy) y comprueba con el modo crosscheck que ambos dan los mismos resultados
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BASE_DIR, "src"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from data_transformer_fixed import DataTransformer
+from sparql_analyzer import SPARQLPatternAnalyzer, ANALYSIS_SUITE
+from bench_vectorized_transform import build_scaled_csv, ONTOLOGY_PATH
+
+
+def build_graph(scale, directory, store):
+    """Grafo del CSV escalado, construido con la transformación vectorizada"""
+    csv_path = build_scaled_csv(scale, directory)
+    with contextlib.redirect_stdout(io.StringIO()):
+        transformer = DataTransformer(csv_path, ONTOLOGY_PATH, vectorized=True, store=store)
+        transformer.transform_students()
+        transformer.transform_universities()
+        transformer.transform_academic_decisions()
+        transformer.add_metadata()
+    return transformer.g
+
+
+def time_call(function, *args, **kwargs):
+    """Ejecutar una función sin mostrar su salida; devuelve (resultado, segundos)"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        result = function(*args, **kwargs)
+        return result, time.perf_counter() - start
+
+
+def main():
+    """Función principal del benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scale", type=int, default=1,
+                        help="veces que se replica el CSV original (por defecto 1)")
+    parser.add_argument("--store", choices=["default", "IntegerStore"], default="default",
+                        help="store del grafo (IntegerStore comparte sus índices con el motor)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        graph = build_graph(args.scale, tmp, args.store)
+
+    reference, _ = time_call(SPARQLPatternAnalyzer, graph, use_cache=False, engine="rdflib")
+    vector, build_seconds = time_call(SPARQLPatternAnalyzer, graph, use_cache=False, engine="vector")
+    checker, _ = time_call(SPARQLPatternAnalyzer, graph, use_cache=False, engine="crosscheck")
+    # CrossCheckError si alguna consulta difiere entre motores
+    time_call(checker.run_suite, 1)
+
+    print("\n=== BENCHMARK MOTORES DE CONSULTA ===")
+    print(f"Escala: x{args.scale} ({len(graph)} triples, store {args.store})")
+    print(f"Construcción de los arreglos por predicado: {build_seconds:.2f} s")
+    print(f"{'consulta':<38} {'rdflib':>9} {'vectorizado':>12} {'aceleración':>12}")
+    totals = [0.0, 0.0]
+    for method in ANALYSIS_SUITE:
+        _, slow = time_call(getattr(reference, method))
+        _, fast = time_call(getattr(vector, method))
+        totals[0] += slow
+        totals[1] += fast
+        print(f"{method:<38} {slow:8.2f}s {fast * 1000:10.1f}ms {slow / fast:11.0f}x")
+    print(f"{'total':<38} {totals[0]:8.2f}s {totals[1] * 1000:10.1f}ms {totals[0] / totals[1]:11.0f}x")
+    print(f"Crosscheck: resultados idénticos en las {len(checker.query_results)} consultas")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark del Pool de Términos - Proyecto Linked Data Universidades
+Mide la memoria del grafo construido por DataTransformer con y sin internado de términos
+(y con timestamp por fila o por ejecución) sobre ISOFV163_A8_Anexo.csv escalado N veces
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BASE_DIR, "src"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+ONTOLOGY_PATH = os.path.join(BASE_DIR, "output", "university_ontology.ttl")
+
+# Configuraciones comparadas: (nombre, internar términos, timestamp por ejecución)
+CONFIGURATIONS = [
+    ("sin pool, timestamp por fila", False, False),
+    ("con pool, timestamp por fila", True, False),
+    ("con pool, timestamp por ejecución", True, True),
+]
+
+
+def peak_rss_mb():
+    """Memoria residente máxima del proceso en MB"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def measure(csv_path, intern_terms, run_timestamp, vectorized):
+    """Construir el grafo en este proceso y devolver tiempo y memoria consumida"""
+    import contextlib
+    import io
+    from data_transformer_fixed import DataTransformer
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        transformer = DataTransformer(csv_path, ONTOLOGY_PATH, vectorized=vectorized,
+                                      intern_terms=intern_terms, run_timestamp=run_timestamp)
+        baseline = peak_rss_mb()
+        start = time.perf_counter()
+        transformer.transform_students()
+        transformer.transform_universities()
+        transformer.transform_academic_decisions()
+        transformer.add_metadata()
+        elapsed = time.perf_counter() - start
+    return {'seconds': elapsed, 'graph_mb': peak_rss_mb() - baseline,
+            'triples': len(transformer.g), 'terms': len(transformer.terms)}
+
+
+def run_isolated(csv_path, intern_terms, run_timestamp, vectorized):
+    """Medir una configuración en un proceso nuevo para que la memoria no se mezcle"""
+    command = [sys.executable, os.path.abspath(__file__), "--measure", csv_path,
+               "--intern", str(int(intern_terms)), "--run-timestamp", str(int(run_timestamp))]
+    if vectorized:
+        command.append("--vectorized")
+    output = subprocess.run(command, capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    """Función principal del benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scale", type=int, default=100,
+                        help="veces que se replica el CSV original (por defecto 100, 1M de filas)")
+    parser.add_argument("--vectorized", action="store_true",
+                        help="usar el modo vectorizado en lugar del fila a fila")
+    parser.add_argument("--measure", help=argparse.SUPPRESS)
+    parser.add_argument("--intern", type=int, default=1, help=argparse.SUPPRESS)
+    parser.add_argument("--run-timestamp", type=int, default=0, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        # Modo interno: una sola medición, resultado en JSON por stdout
+        print(json.dumps(measure(args.measure, bool(args.intern), bool(args.run_timestamp),
+                                 args.vectorized)))
+        return
+
+    from bench_vectorized_transform import build_scaled_csv
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = build_scaled_csv(args.scale, tmp)
+        results = [(name, run_isolated(csv_path, intern_terms, run_timestamp, args.vectorized))
+                   for name, intern_terms, run_timestamp in CONFIGURATIONS]
+
+    print("\n=== BENCHMARK POOL DE TÉRMINOS ===")
+    print(f"Escala: x{args.scale} ({args.scale * 10000} registros), "
+          f"modo {'vectorizado' if args.vectorized else 'fila a fila'}")
+    base_mb = results[0][1]['graph_mb']
+    for name, result in results:
+        saved = 100 * (base_mb - result['graph_mb']) / base_mb if base_mb else 0
+        print(f"{name}: {result['graph_mb']:.0f} MB, {result['seconds']:.2f} s, "
+              f"{result['triples']} triples, {result['terms']} términos en el pool "
+              f"({saved:.1f}% de memoria ahorrada)")
+
+
+if __name__ == "__main__":
+    main()
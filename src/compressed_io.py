@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Entrada/Salida Comprimida - Proyecto Linked Data Universidades
+Apertura transparente de archivos gzip, bz2 y xz según su extensión (solo biblioteca estándar)
+"""
+
+import bz2
+import gzip
+import hashlib
+import lzma
+import os
+
+# Extensión -> función de apertura en streaming
+COMPRESSORS = {
+    '.gz': lambda path, mode, **kwargs: gzip.open(path, mode, compresslevel=6, **kwargs),
+    '.bz2': bz2.open,
+    '.xz': lzma.open,
+}
+
+# Extensiones de compresión reconocidas
+COMPRESSION_EXTENSIONS = tuple(COMPRESSORS)
+
+# Tamaño de bloque al calcular huellas de archivos
+HASH_BLOCK = 1024 * 1024
+
+
+def split_compression(path):
+    """Separar la extensión de compresión de una ruta: ('datos.nt', '.gz')"""
+    root, extension = os.path.splitext(str(path))
+    if extension in COMPRESSORS:
+        return root, extension
+    return str(path), ""
+
+
+def strip_compression(path):
+    """Ruta sin la extensión de compresión (para deducir el formato del contenido)"""
+    return split_compression(path)[0]
+
+
+def is_compressed(path):
+    """Indicar si la ruta tiene una extensión de compresión"""
+    return bool(split_compression(path)[1])
+
+
+def open_compressed(path, mode="r", encoding="utf-8"):
+    """Abrir un archivo, comprimiendo o descomprimiendo en streaming según su extensión"""
+    compression = split_compression(path)[1]
+    binary = "b" in mode
+    if not compression:
+        return open(path, mode) if binary else open(path, mode, encoding=encoding)
+    if binary:
+        return COMPRESSORS[compression](path, mode)
+    # Los módulos de compresión abren en binario salvo que se pida texto explícitamente
+    return COMPRESSORS[compression](path, mode.replace("t", "") + "t", encoding=encoding)
+
+
+def file_stamp(path):
+    """Versión de un archivo sin leerlo: tamaño, fecha de modificación (ns) e inodo"""
+    stat = os.stat(path)
+    return f"{stat.st_size}-{stat.st_mtime_ns}-{stat.st_ino}"
+
+
+def file_digest(path):
+    """Huella SHA-256 del contenido de un archivo (tal como está en disco)"""
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK), b""):
+            sha.update(block)
+    return sha.hexdigest()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Esquema e Ingesta del CSV - Proyecto Linked Data Universidades
+Lectura tipada de ISOFV163_A8_Anexo.csv (categóricas y enteros compactos) con caché binaria
+de columnas .npy, abierta con mmap mientras el CSV no cambie
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from compressed_io import file_digest
+
+# Tipo declarado de cada columna del CSV
+CSV_SCHEMA = {
+    'id_estudiante': "string",
+    'edad': "int8",
+    'genero': "category",
+    'ciudad_origen': "category",
+    'departamento_origen': "category",
+    'estrato': "int8",
+    'puntaje_saber11': "float64",
+    'preferencia_area': "category",
+    'universidad_codigo': "category",
+    'universidad_nombre': "category",
+    'universidad_departamento': "category",
+    'universidad_tipo': "category",
+    'universidad_acreditada': "category",
+    'ranking_nacional': "int16",
+    'modalidad_programa': "category",
+    'convenio_internacional': "category",
+    'beca_disponible': "category",
+    'eligio_universidad': "category",
+}
+
+# Tipos que se pueden pedir directamente a read_csv (los enteros se reducen después,
+# porque una columna entera con nulos no admite un tipo entero de NumPy)
+READ_DTYPES = {column: (object if kind == "string" else kind)
+               for column, kind in CSV_SCHEMA.items() if not kind.startswith("int")}
+
+# Sufijo del directorio de caché junto al CSV
+SIDECAR_SUFFIX = ".cache"
+
+# Versión del formato de la caché (se invalida si cambia el esquema o el formato)
+SIDECAR_VERSION = hashlib.sha256(
+    json.dumps([1, CSV_SCHEMA], sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+def apply_schema(df):
+    """Reducir las columnas enteras declaradas a su tipo compacto (si no tienen nulos)"""
+    for column, kind in CSV_SCHEMA.items():
+        if kind.startswith("int") and column in df and not df[column].isna().any():
+            df[column] = df[column].astype(kind)
+    return df
+
+
+def read_typed_csv(path, **kwargs):
+    """Leer el CSV con los tipos del esquema (acepta .gz, .bz2 y .xz como read_csv)"""
+    return apply_schema(pd.read_csv(path, dtype=READ_DTYPES, **kwargs))
+
+
+def read_typed_chunks(path, chunksize, **kwargs):
+    """Leer el CSV por lotes de chunksize filas con los mismos tipos que read_typed_csv
+
+    Sin el esquema, read_csv deduce los tipos de cada lote por separado (p. ej. '001' -> 1).
+    """
+    with pd.read_csv(path, dtype=READ_DTYPES, chunksize=chunksize, **kwargs) as reader:
+        for chunk in reader:
+            yield apply_schema(chunk)
+
+
+def sidecar_path(csv_path):
+    """Directorio de la caché binaria de un CSV"""
+    return str(csv_path) + SIDECAR_SUFFIX
+
+
+def write_sidecar(df, directory, digest):
+    """Guardar cada columna como .npy (códigos para categóricas) junto con sus metadatos
+
+    Devuelve False si alguna columna no se puede representar (texto con nulos u otro tipo).
+    """
+    columns = []
+    parent = os.path.dirname(os.path.abspath(directory))
+    temporary = tempfile.mkdtemp(prefix=".csv_cache_", dir=parent)
+    try:
+        for position, column in enumerate(df.columns):
+            series = df[column]
+            entry = {'name': column, 'file': f"{position:03d}.npy"}
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                entry['categories'] = series.cat.categories.tolist()
+                values = series.cat.codes.to_numpy()
+            elif series.dtype == object:
+                if series.isna().any() or not all(isinstance(v, str) for v in series):
+                    return False
+                entry['string'] = True
+                values = series.to_numpy(dtype=str)
+            elif np.issubdtype(series.dtype, np.number) or series.dtype == bool:
+                values = series.to_numpy()
+            else:
+                return False
+            np.save(os.path.join(temporary, entry['file']), values, allow_pickle=False)
+            columns.append(entry)
+        meta = {'version': SIDECAR_VERSION, 'sha256': digest, 'rows': len(df), 'columns': columns}
+        with open(os.path.join(temporary, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+        # Sustituir la caché anterior solo cuando la nueva está completa
+        if os.path.exists(directory):
+            shutil.rmtree(directory)
+        os.replace(temporary, directory)
+        return True
+    finally:
+        if os.path.exists(temporary):
+            shutil.rmtree(temporary)
+
+
+def read_sidecar(directory, digest):
+    """Reconstruir el DataFrame desde la caché con mmap, o None si no existe o está obsoleta
+
+    Las columnas numéricas y los códigos de las categóricas quedan mapeados (copia en escritura),
+    sin copiarlos a memoria; solo las columnas de texto se convierten a objetos de Python.
+    """
+    try:
+        with open(os.path.join(directory, "meta.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if meta.get('version') != SIDECAR_VERSION or meta.get('sha256') != digest:
+        return None
+    data = {}
+    for entry in meta['columns']:
+        # Vista ndarray del memmap: mismo mapeo, sin la subclase en las operaciones de pandas
+        values = np.load(os.path.join(directory, entry['file']), mmap_mode="c",
+                         allow_pickle=False).view(np.ndarray)
+        if 'categories' in entry:
+            # Los códigos se validaron al escribir la caché (misma versión y huella del CSV)
+            data[entry['name']] = pd.Categorical.from_codes(values, entry['categories'], validate=False)
+        elif entry.get('string'):
+            data[entry['name']] = values.astype(object)
+        else:
+            data[entry['name']] = values
+    # Sin copy=False, pandas copiaría y agruparía las columnas del mismo tipo en bloques nuevos
+    return pd.DataFrame(data, copy=False)
+
+
+def load_csv(path, cache=True):
+    """Cargar el CSV tipado, reutilizando la caché binaria mientras su contenido no cambie"""
+    if not cache:
+        return read_typed_csv(path)
+    directory = sidecar_path(path)
+    digest = file_digest(path)
+    df = read_sidecar(directory, digest)
+    if df is not None:
+        return df
+    df = read_typed_csv(path)
+    try:
+        write_sidecar(df, directory, digest)
+    except OSError as e:
+        # Directorio de solo lectura u otro problema: se sigue sin caché
+        print(f"No se pudo guardar la caché del CSV: {e}")
+    return df
@@ -7,11 +7,9 @@ Análisis de patrones de comportamiento estudiantil en la selección universitar
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import numpy as np
 import warnings
+from csv_schema import load_csv
 warnings.filterwarnings('ignore')
 
 # Configuración de estilo
@@ -30,7 +28,8 @@ class UniversityDataAnalyzer:
     def load_data(self):
         """Cargar y limpiar los datos"""
         try:
-            self.df = pd.read_csv(self.csv_path)
+            # Columnas categóricas y enteros compactos; la caché binaria evita reparsear el CSV
+            self.df = load_csv(self.csv_path)
             print(f"Dataset cargado exitosamente: {len(self.df)} registros")
             print(f"Columnas: {list(self.df.columns)}")
             
@@ -49,7 +48,8 @@ class UniversityDataAnalyzer:
         
         # Universidades únicas
         universities = self.df.groupby(['universidad_codigo', 'universidad_nombre', 
-                                      'universidad_departamento', 'universidad_tipo']).size().reset_index(name='estudiantes')
+                                      'universidad_departamento', 'universidad_tipo'],
+                                     observed=True).size().reset_index(name='estudiantes')
         print(f"Total de universidades en el dataset: {len(universities)}")
         print("\nUniversidades ordenadas por número de estudiantes:")
         universities_sorted = universities.sort_values('estudiantes', ascending=False)
@@ -116,7 +116,7 @@ class UniversityDataAnalyzer:
             print(f"- {dep}: {count} estudiantes ({pct:.1f}%)")
         
         # Patrón de migración académica
-        migration = self.df.groupby(['departamento_origen', 'universidad_departamento']).size().reset_index(name='count')
+        migration = self.df.groupby(['departamento_origen', 'universidad_departamento'], observed=True).size().reset_index(name='count')
         migration = migration.sort_values('count', ascending=False)
         print("\nPrincipales flujos de migración académica:")
         for _, row in migration.head(10).iterrows():
@@ -158,6 +158,11 @@ class UniversityDataAnalyzer:
     
     def create_visualizations(self):
         """Crear visualizaciones de los patrones encontrados"""
+        # plotly solo se importa al graficar: el análisis estadístico no lo necesita
+        import plotly.express as px
+        import plotly.graph_objects as go
+        from plotly.subplots import make_subplots
+        
         print("\n=== CREANDO VISUALIZACIONES ===")
         
         # Configurar subplots
@@ -199,7 +204,7 @@ class UniversityDataAnalyzer:
         print("Visualización guardada en: visualizations/patrones_comportamiento.html")
         
         # Crear mapa de flujos de migración académica
-        migration = self.df.groupby(['departamento_origen', 'universidad_departamento']).size().reset_index(name='estudiantes')
+        migration = self.df.groupby(['departamento_origen', 'universidad_departamento'], observed=True).size().reset_index(name='estudiantes')
         migration_top = migration.sort_values('estudiantes', ascending=False).head(15)
         
         fig_migration = px.bar(migration_top, 
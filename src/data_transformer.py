@@ -10,6 +10,7 @@ from rdflib.namespace import FOAF, DC, DCTERMS
 import hashlib
 from datetime import datetime
 import re
+from rdf_export import export_graph
 
 class DataTransformer:
     """Transformador de datos CSV a formato RDF"""
@@ -242,4 +243,191 @@ class DataTransformer:
             self.g.add((decision_uri, RDF.type, self.BEHAVIOR.AcademicDecision))
             
             # Relación estudiante -> decisión
-            self.g.add((student_uri, self.BEHAVIOR.makes, decision_uri))\n            \n            # Información de la decisión\n            self.g.add((decision_uri, RDFS.label, \n                       Literal(f\"Decisión de {row['id_estudiante']} sobre {row['universidad_codigo']}\", lang=\"es\")))\n            \n            # Decisión final\n            if not pd.isna(row['eligio_universidad']):\n                final_decision = self.convert_boolean(row['eligio_universidad'])\n                self.g.add((decision_uri, self.BEHAVIOR.finalDecision, \n                           Literal(final_decision)))\n            \n            # Modalidad del programa\n            if not pd.isna(row['modalidad_programa']):\n                self.g.add((decision_uri, self.EDU.programModality, \n                           Literal(row['modalidad_programa'], lang=\"es\")))\n            \n            # Convenio internacional\n            if not pd.isna(row['convenio_internacional']):\n                has_agreement = self.convert_boolean(row['convenio_internacional'])\n                self.g.add((university_uri, self.UNIV.hasInternationalAgreement, \n                           Literal(has_agreement)))\n            \n            # Beca disponible\n            if not pd.isna(row['beca_disponible']):\n                has_scholarship = self.convert_boolean(row['beca_disponible'])\n                self.g.add((university_uri, self.UNIV.hasScholarship, \n                           Literal(has_scholarship)))\n            \n            # Relacionar decisión con universidad\n            self.g.add((decision_uri, DC.subject, university_uri))\n            \n            # Timestamp de creación\n            self.g.add((decision_uri, DCTERMS.created, \n                       Literal(datetime.now().isoformat(), datatype=XSD.dateTime)))\n            \n            self.stats['decisions'] += 1\n        \n        print(f\"Transformadas {self.stats['decisions']} decisiones académicas\")\n    \n    def add_metadata(self):\n        \"\"\"Agregar metadatos al dataset\"\"\"\n        print(\"Agregando metadatos del dataset...\")\n        \n        # URI del dataset\n        dataset_uri = self.UNIV[\"dataset_university_choices\"]\n        \n        # Información del dataset\n        self.g.add((dataset_uri, RDF.type, self.SCHEMA.Dataset))\n        self.g.add((dataset_uri, DC.title, \n                   Literal(\"Dataset de Decisiones Universitarias Colombia\", lang=\"es\")))\n        self.g.add((dataset_uri, DC.description, \n                   Literal(\"Datos sobre patrones de comportamiento estudiantil en la selección de universidades en Colombia\", lang=\"es\")))\n        self.g.add((dataset_uri, DCTERMS.created, \n                   Literal(datetime.now().isoformat(), datatype=XSD.dateTime)))\n        self.g.add((dataset_uri, DC.creator, \n                   Literal(\"Proyecto Linked Data - Web Semántica\", lang=\"es\")))\n        self.g.add((dataset_uri, DC.language, Literal(\"es\")))\n        self.g.add((dataset_uri, DCTERMS.spatial, \n                   Literal(\"Colombia\", lang=\"es\")))\n        \n        # Estadísticas del dataset\n        self.g.add((dataset_uri, self.SCHEMA.numberOfItems, \n                   Literal(len(self.df))))\n        \n        print(\"Metadatos agregados\")\n    \n    def generate_sample_triples(self, n=10):\n        \"\"\"Generar muestra de triples para revisión\"\"\"\n        print(f\"\\n=== MUESTRA DE {n} TRIPLES GENERADOS ===\")\n        count = 0\n        for s, p, o in self.g:\n            if count >= n:\n                break\n            print(f\"{s} {p} {o}\")\n            count += 1\n    \n    def save_rdf_data(self, filename):\n        \"\"\"Guardar datos RDF en diferentes formatos\"\"\"\n        print(\"Guardando datos RDF...\")\n        \n        # RDF/XML\n        with open(f\"/Users/leomos/Downloads/web_semantica/output/{filename}.rdf\", \"w\", encoding=\"utf-8\") as f:\n            f.write(self.g.serialize(format=\"xml\"))\n        \n        # Turtle\n        with open(f\"/Users/leomos/Downloads/web_semantica/output/{filename}.ttl\", \"w\", encoding=\"utf-8\") as f:\n            f.write(self.g.serialize(format=\"turtle\"))\n        \n        # N-Triples\n        with open(f\"/Users/leomos/Downloads/web_semantica/output/{filename}.nt\", \"w\", encoding=\"utf-8\") as f:\n            f.write(self.g.serialize(format=\"nt\"))\n        \n        # JSON-LD\n        with open(f\"/Users/leomos/Downloads/web_semantica/output/{filename}.jsonld\", \"w\", encoding=\"utf-8\") as f:\n            f.write(self.g.serialize(format=\"json-ld\"))\n        \n        print(f\"Datos RDF guardados como {filename}.* en múltiples formatos\")\n    \n    def print_transformation_stats(self):\n        \"\"\"Mostrar estadísticas de la transformación\"\"\"\n        self.stats['total_triples'] = len(self.g)\n        \n        print(\"\\n=== ESTADÍSTICAS DE TRANSFORMACIÓN ===\")\n        print(f\"Registros CSV procesados: {len(self.df)}\")\n        print(f\"Estudiantes transformados: {self.stats['students']}\")\n        print(f\"Universidades transformadas: {self.stats['universities']}\")\n        print(f\"Decisiones académicas: {self.stats['decisions']}\")\n        print(f\"Total de triples RDF: {self.stats['total_triples']}\")\n        \n        # Estadísticas por tipo de entidad\n        students_count = len(list(self.g.subjects(RDF.type, self.UNIV.Student)))\n        universities_count = len(list(self.g.subjects(RDF.type, self.UNIV.University)))\n        decisions_count = len(list(self.g.subjects(RDF.type, self.BEHAVIOR.AcademicDecision)))\n        areas_count = len(list(self.g.subjects(RDF.type, self.EDU.KnowledgeArea)))\n        cities_count = len(list(self.g.subjects(RDF.type, self.GEO.City)))\n        departments_count = len(list(self.g.subjects(RDF.type, self.GEO.Department)))\n        \n        print(\"\\n=== ENTIDADES CREADAS ===\")\n        print(f\"Estudiantes: {students_count}\")\n        print(f\"Universidades: {universities_count}\")\n        print(f\"Decisiones académicas: {decisions_count}\")\n        print(f\"Áreas de conocimiento: {areas_count}\")\n        print(f\"Ciudades: {cities_count}\")\n        print(f\"Departamentos: {departments_count}\")\n    \n    def validate_data_quality(self):\n        \"\"\"Validar calidad de los datos transformados\"\"\"\n        print(\"\\n=== VALIDACIÓN DE CALIDAD DE DATOS ===\")\n        \n        # Verificar que cada estudiante tenga al menos una aplicación\n        students_with_applications = set()\n        for s, p, o in self.g.triples((None, self.UNIV.appliesTo, None)):\n            students_with_applications.add(s)\n        \n        total_students = len(list(self.g.subjects(RDF.type, self.UNIV.Student)))\n        print(f\"Estudiantes con aplicaciones: {len(students_with_applications)}/{total_students}\")\n        \n        # Verificar que cada decisión tenga un resultado\n        decisions_with_result = 0\n        total_decisions = 0\n        for s, p, o in self.g.triples((None, RDF.type, self.BEHAVIOR.AcademicDecision)):\n            total_decisions += 1\n            if (s, self.BEHAVIOR.finalDecision, None) in self.g:\n                decisions_with_result += 1\n        \n        print(f\"Decisiones con resultado: {decisions_with_result}/{total_decisions}\")\n        \n        # Verificar integridad referencial\n        orphaned_decisions = 0\n        for s, p, o in self.g.triples((None, RDF.type, self.BEHAVIOR.AcademicDecision)):\n            # Verificar que la decisión esté vinculada a un estudiante\n            if not any(self.g.triples((None, self.BEHAVIOR.makes, s))):\n                orphaned_decisions += 1\n        \n        print(f\"Decisiones huérfanas (sin estudiante): {orphaned_decisions}\")\n        \n        if orphaned_decisions == 0 and decisions_with_result == total_decisions:\n            print(\"✓ Validación de calidad exitosa\")\n        else:\n            print(\"⚠ Se encontraron problemas de calidad de datos\")\n\ndef main():\n    \"\"\"Función principal para transformar datos\"\"\"\n    print(\"=== TRANSFORMACIÓN DE DATOS CSV A RDF ===\")\n    print(\"Convirtiendo dataset de estudiantes a formato Linked Data\\n\")\n    \n    # Inicializar transformador\n    transformer = DataTransformer(\n        csv_file_path=\"/Users/leomos/Downloads/web_semantica/ISOFV163_A8_Anexo.csv\",\n        ontology_file_path=\"/Users/leomos/Downloads/web_semantica/output/university_ontology.ttl\"\n    )\n    \n    # Realizar transformaciones\n    transformer.transform_students()\n    transformer.transform_universities()\n    transformer.transform_academic_decisions()\n    transformer.add_metadata()\n    \n    # Mostrar estadísticas\n    transformer.print_transformation_stats()\n    \n    # Validar calidad\n    transformer.validate_data_quality()\n    \n    # Generar muestra\n    transformer.generate_sample_triples()\n    \n    # Guardar resultados\n    transformer.save_rdf_data(\"university_linked_data\")\n    \n    print(\"\\n=== TRANSFORMACIÓN COMPLETADA ===\")\n    print(\"Archivos generados:\")\n    print(\"- output/university_linked_data.rdf (RDF/XML)\")\n    print(\"- output/university_linked_data.ttl (Turtle)\")\n    print(\"- output/university_linked_data.nt (N-Triples)\")\n    print(\"- output/university_linked_data.jsonld (JSON-LD)\")\n    \n    return transformer\n\nif __name__ == \"__main__\":\n    data_transformer = main()
\ No newline at end of file
+            self.g.add((student_uri, self.BEHAVIOR.makes, decision_uri))
+            
+            # Información de la decisión
+            self.g.add((decision_uri, RDFS.label, 
+                       Literal(f"Decisión de {row['id_estudiante']} sobre {row['universidad_codigo']}", lang="es")))
+            
+            # Decisión final
+            if not pd.isna(row['eligio_universidad']):
+                final_decision = self.convert_boolean(row['eligio_universidad'])
+                self.g.add((decision_uri, self.BEHAVIOR.finalDecision, 
+                           Literal(final_decision)))
+            
+            # Modalidad del programa
+            if not pd.isna(row['modalidad_programa']):
+                self.g.add((decision_uri, self.EDU.programModality, 
+                           Literal(row['modalidad_programa'], lang="es")))
+            
+            # Convenio internacional
+            if not pd.isna(row['convenio_internacional']):
+                has_agreement = self.convert_boolean(row['convenio_internacional'])
+                self.g.add((university_uri, self.UNIV.hasInternationalAgreement, 
+                           Literal(has_agreement)))
+            
+            # Beca disponible
+            if not pd.isna(row['beca_disponible']):
+                has_scholarship = self.convert_boolean(row['beca_disponible'])
+                self.g.add((university_uri, self.UNIV.hasScholarship, 
+                           Literal(has_scholarship)))
+            
+            # Relacionar decisión con universidad
+            self.g.add((decision_uri, DC.subject, university_uri))
+            
+            # Timestamp de creación
+            self.g.add((decision_uri, DCTERMS.created, 
+                       Literal(datetime.now().isoformat(), datatype=XSD.dateTime)))
+            
+            self.stats['decisions'] += 1
+        
+        print(f"Transformadas {self.stats['decisions']} decisiones académicas")
+    
+    def add_metadata(self):
+        """Agregar metadatos al dataset"""
+        print("Agregando metadatos del dataset...")
+        
+        # URI del dataset
+        dataset_uri = self.UNIV["dataset_university_choices"]
+        
+        # Información del dataset
+        self.g.add((dataset_uri, RDF.type, self.SCHEMA.Dataset))
+        self.g.add((dataset_uri, DC.title, 
+                   Literal("Dataset de Decisiones Universitarias Colombia", lang="es")))
+        self.g.add((dataset_uri, DC.description, 
+                   Literal("Datos sobre patrones de comportamiento estudiantil en la selección de universidades en Colombia", lang="es")))
+        self.g.add((dataset_uri, DCTERMS.created, 
+                   Literal(datetime.now().isoformat(), datatype=XSD.dateTime)))
+        self.g.add((dataset_uri, DC.creator, 
+                   Literal("Proyecto Linked Data - Web Semántica", lang="es")))
+        self.g.add((dataset_uri, DC.language, Literal("es")))
+        self.g.add((dataset_uri, DCTERMS.spatial, 
+                   Literal("Colombia", lang="es")))
+        
+        # Estadísticas del dataset
+        self.g.add((dataset_uri, self.SCHEMA.numberOfItems, 
+                   Literal(len(self.df))))
+        
+        print("Metadatos agregados")
+    
+    def generate_sample_triples(self, n=10):
+        """Generar muestra de triples para revisión"""
+        print(f"\n=== MUESTRA DE {n} TRIPLES GENERADOS ===")
+        count = 0
+        for s, p, o in self.g:
+            if count >= n:
+                break
+            print(f"{s} {p} {o}")
+            count += 1
+    
+    def save_rdf_data(self, filename, formats=("rdf", "ttl", "nt", "jsonld"), compression=""):
+        """Guardar datos RDF en los formatos indicados, en paralelo y directamente a archivo"""
+        print("Guardando datos RDF...")
+        paths = export_graph(self.g, f"/Users/leomos/Downloads/web_semantica/output/{filename}", formats,
+                             compression=compression)
+        print(f"Datos RDF guardados como {filename}.* en múltiples formatos")
+        return paths
+    
+    def print_transformation_stats(self):
+        """Mostrar estadísticas de la transformación"""
+        self.stats['total_triples'] = len(self.g)
+        
+        print("\n=== ESTADÍSTICAS DE TRANSFORMACIÓN ===")
+        print(f"Registros CSV procesados: {len(self.df)}")
+        print(f"Estudiantes transformados: {self.stats['students']}")
+        print(f"Universidades transformadas: {self.stats['universities']}")
+        print(f"Decisiones académicas: {self.stats['decisions']}")
+        print(f"Total de triples RDF: {self.stats['total_triples']}")
+        
+        # Estadísticas por tipo de entidad
+        students_count = len(list(self.g.subjects(RDF.type, self.UNIV.Student)))
+        universities_count = len(list(self.g.subjects(RDF.type, self.UNIV.University)))
+        decisions_count = len(list(self.g.subjects(RDF.type, self.BEHAVIOR.AcademicDecision)))
+        areas_count = len(list(self.g.subjects(RDF.type, self.EDU.KnowledgeArea)))
+        cities_count = len(list(self.g.subjects(RDF.type, self.GEO.City)))
+        departments_count = len(list(self.g.subjects(RDF.type, self.GEO.Department)))
+        
+        print("\n=== ENTIDADES CREADAS ===")
+        print(f"Estudiantes: {students_count}")
+        print(f"Universidades: {universities_count}")
+        print(f"Decisiones académicas: {decisions_count}")
+        print(f"Áreas de conocimiento: {areas_count}")
+        print(f"Ciudades: {cities_count}")
+        print(f"Departamentos: {departments_count}")
+    
+    def validate_data_quality(self):
+        """Validar calidad de los datos transformados"""
+        print("\n=== VALIDACIÓN DE CALIDAD DE DATOS ===")
+        
+        # Verificar que cada estudiante tenga al menos una aplicación
+        students_with_applications = set()
+        for s, p, o in self.g.triples((None, self.UNIV.appliesTo, None)):
+            students_with_applications.add(s)
+        
+        total_students = len(list(self.g.subjects(RDF.type, self.UNIV.Student)))
+        print(f"Estudiantes con aplicaciones: {len(students_with_applications)}/{total_students}")
+        
+        # Verificar que cada decisión tenga un resultado
+        decisions_with_result = 0
+        total_decisions = 0
+        for s, p, o in self.g.triples((None, RDF.type, self.BEHAVIOR.AcademicDecision)):
+            total_decisions += 1
+            if (s, self.BEHAVIOR.finalDecision, None) in self.g:
+                decisions_with_result += 1
+        
+        print(f"Decisiones con resultado: {decisions_with_result}/{total_decisions}")
+        
+        # Verificar integridad referencial
+        orphaned_decisions = 0
+        for s, p, o in self.g.triples((None, RDF.type, self.BEHAVIOR.AcademicDecision)):
+            # Verificar que la decisión esté vinculada a un estudiante
+            if not any(self.g.triples((None, self.BEHAVIOR.makes, s))):
+                orphaned_decisions += 1
+        
+        print(f"Decisiones huérfanas (sin estudiante): {orphaned_decisions}")
+        
+        if orphaned_decisions == 0 and decisions_with_result == total_decisions:
+            print("✓ Validación de calidad exitosa")
+        else:
+            print("⚠ Se encontraron problemas de calidad de datos")
+
+def main():
+    """Función principal para transformar datos"""
+    print("=== TRANSFORMACIÓN DE DATOS CSV A RDF ===")
+    print("Convirtiendo dataset de estudiantes a formato Linked Data\n")
+    
+    # Inicializar transformador
+    transformer = DataTransformer(
+        csv_file_path="/Users/leomos/Downloads/web_semantica/ISOFV163_A8_Anexo.csv",
+        ontology_file_path="/Users/leomos/Downloads/web_semantica/output/university_ontology.ttl"
+    )
+    
+    # Realizar transformaciones
+    transformer.transform_students()
+    transformer.transform_universities()
+    transformer.transform_academic_decisions()
+    transformer.add_metadata()
+    
+    # Mostrar estadísticas
+    transformer.print_transformation_stats()
+    
+    # Validar calidad
+    transformer.validate_data_quality()
+    
+    # Generar muestra
+    transformer.generate_sample_triples()
+    
+    # Guardar resultados
+    transformer.save_rdf_data("university_linked_data")
+    
+    print("\n=== TRANSFORMACIÓN COMPLETADA ===")
+    print("Archivos generados:")
+    print("- output/university_linked_data.rdf (RDF/XML)")
+    print("- output/university_linked_data.ttl (Turtle)")
+    print("- output/university_linked_data.nt (N-Triples)")
+    print("- output/university_linked_data.jsonld (JSON-LD)")
+    
+    return transformer
+
+if __name__ == "__main__":
+    data_transformer = main()
@@ -5,26 +5,68 @@ Conversión del dataset de estudiantes a triples RDF basados en la ontología cr
 """
 
 import pandas as pd
+import numpy as np
+import os
+import io
+import shutil
+import tempfile
+import contextlib
+import json
+import uuid
+import argparse
+from concurrent.futures import ProcessPoolExecutor
 from rdflib import Graph, Namespace, RDF, RDFS, XSD, URIRef, Literal, BNode
 from rdflib.namespace import FOAF, DC, DCTERMS
-import hashlib
+import gc
 from datetime import datetime
-import re
+from itertools import islice, repeat
+from rdf_writers import NTriplesWriter
+from uri_minter import URIMinter, clean_uri_component, decision_component
+from entity_registry import EntityRegistry
+from term_pool import TermPool
+from int_store import IntegerStore
+from sqlite_store import open_store
+from rdf_export import export_graph, context_path, EXPORT_FORMATS, DEFAULT_FORMATS, FORMAT_NAMES
+from compressed_io import open_compressed, split_compression, strip_compression, is_compressed
+from csv_schema import load_csv, read_typed_chunks, read_typed_csv
+from ontology_cache import load_ontology
+
+# Columnas que describen una universidad
+UNIVERSITY_COLUMNS = ['universidad_codigo', 'universidad_nombre', 
+                      'universidad_departamento', 'universidad_tipo',
+                      'universidad_acreditada', 'ranking_nacional']
 
 class DataTransformer:
     """Transformador de datos CSV a formato RDF"""
     
-    def __init__(self, csv_file_path, ontology_file_path):
+    def __init__(self, csv_file_path, ontology_file_path, vectorized=False, streaming=False,
+                 intern_terms=True, run_timestamp=False, store="default"):
         """Inicializar con archivos CSV y ontología"""
         self.csv_path = csv_file_path
         self.ontology_path = ontology_file_path
         
-        # Cargar datos CSV
-        self.df = pd.read_csv(csv_file_path)
-        print(f"Datos CSV cargados: {len(self.df)} registros")
+        # Modo vectorizado: triples generados por columnas e insertados en bloque
+        self.vectorized = vectorized
+        
+        # Pool de términos: un único objeto por URI o literal distinto
+        self.terms = TermPool(enabled=intern_terms)
+        
+        # Timestamp de creación único para toda la ejecución (en lugar de uno por fila)
+        self.run_created = (Literal(datetime.now().isoformat(), datatype=XSD.dateTime)
+                            if run_timestamp else None)
         
-        # Inicializar grafo RDF
-        self.g = Graph()
+        # Cargar datos CSV tipados (en modo streaming se leen por lotes en stream_ntriples);
+        # pandas descomprime .gz, .bz2 y .xz según la extensión y la caché binaria evita reparsear
+        if streaming:
+            self.df = None
+        else:
+            self.df = load_csv(csv_file_path)
+            print(f"Datos CSV cargados: {len(self.df)} registros")
+        
+        # Inicializar grafo RDF ("IntegerStore" para el almacén compacto de enteros,
+        # o la ruta de un archivo .sqlite para escribir directamente en un store persistente;
+        # un store que ya existe se vacía para no acumular los triples de ejecuciones anteriores)
+        self.g = Graph(store=open_store(store, overwrite=True))
         
         # Definir namespaces (mismos que en la ontología)
         self.UNIV = Namespace("http://example.org/university/")
@@ -33,6 +75,23 @@ class DataTransformer:
         self.GEO = Namespace("http://example.org/geography/")
         self.BEHAVIOR = Namespace("http://example.org/behavior/")
         
+        # Acuñador de URIs con caché por tipo de entidad
+        self.minter = URIMinter({
+            'student': (self.UNIV, "student_"),
+            'university': (self.UNIV, "university_"),
+            'area': (self.EDU, "area_"),
+            'city': (self.GEO, "city_"),
+            'department': (self.GEO, "dept_"),
+            'decision': (self.BEHAVIOR, "decision_", decision_component),
+        }, intern=self.terms.intern)
+        
+        # Registro de entidades compartidas: se describen una vez y se detectan conflictos
+        self.registry = EntityRegistry(functional_predicates=[
+            RDFS.label, DC.title, DC.identifier, self.GEO.locatedIn,
+            self.UNIV.hasType, self.UNIV.isAccredited, self.UNIV.nationalRanking,
+            self.UNIV.hasInternationalAgreement, self.UNIV.hasScholarship,
+        ])
+        
         # Bind namespaces
         self.g.bind("univ", self.UNIV)
         self.g.bind("schema", self.SCHEMA)
@@ -55,9 +114,9 @@ class DataTransformer:
         }
     
     def load_base_ontology(self):
-        """Cargar la ontología base si existe"""
+        """Cargar la ontología base si existe (parseada una vez por proceso y cacheada en disco)"""
         try:
-            self.g.parse(self.ontology_path, format="turtle")
+            load_ontology(self.ontology_path).add_to(self.g)
             print(f"Ontología base cargada desde: {self.ontology_path}")
         except Exception as e:
             print(f"No se pudo cargar la ontología base: {e}")
@@ -65,108 +124,291 @@ class DataTransformer:
     
     def clean_uri_component(self, text):
         """Limpiar texto para usar en URIs"""
-        if pd.isna(text):
-            return "unknown"
-        # Convertir a string y limpiar
-        text = str(text).strip()
-        # Reemplazar espacios y caracteres especiales
-        text = re.sub(r'[^\w\s-]', '', text)
-        text = re.sub(r'\s+', '_', text)
-        return text.lower()
+        return clean_uri_component(text)
     
     def create_student_uri(self, student_id):
         """Crear URI para estudiante"""
-        clean_id = self.clean_uri_component(student_id)
-        return self.UNIV[f"student_{clean_id}"]
+        return self.minter.mint('student', student_id)
     
     def create_university_uri(self, university_code):
         """Crear URI para universidad"""
-        clean_code = self.clean_uri_component(university_code)
-        return self.UNIV[f"university_{clean_code}"]
+        return self.minter.mint('university', university_code)
     
     def create_area_uri(self, area_name):
         """Crear URI para área de conocimiento"""
-        clean_area = self.clean_uri_component(area_name)
-        return self.EDU[f"area_{clean_area}"]
+        return self.minter.mint('area', area_name)
     
     def create_city_uri(self, city_name):
         """Crear URI para ciudad"""
-        clean_city = self.clean_uri_component(city_name)
-        return self.GEO[f"city_{clean_city}"]
+        return self.minter.mint('city', city_name)
     
     def create_department_uri(self, dept_name):
         """Crear URI para departamento"""
-        clean_dept = self.clean_uri_component(dept_name)
-        return self.GEO[f"dept_{clean_dept}"]
+        return self.minter.mint('department', dept_name)
     
     def create_decision_uri(self, student_id, university_code):
         """Crear URI para decisión académica"""
-        # Crear hash único para la decisión
-        decision_hash = hashlib.md5(f"{student_id}_{university_code}".encode()).hexdigest()[:8]
-        return self.BEHAVIOR[f"decision_{decision_hash}"]
+        # Hash único de la decisión (estudiante, universidad)
+        return self.minter.mint('decision', (student_id, university_code))
+    
+    def created_literal(self):
+        """Literal dcterms:created: el de la ejecución si se fijó, o el instante actual"""
+        if self.run_created is not None:
+            return self.run_created
+        return Literal(datetime.now().isoformat(), datatype=XSD.dateTime)
     
     def convert_boolean(self, value):
         """Convertir valores de string a boolean"""
         if pd.isna(value):
             return False
         return str(value).lower() in ['sí', 'si', 'yes', 'true', '1']
+
+    # === MODO VECTORIZADO ===
+
+    def term_column(self, series, factory, intern=True):
+        """Crear un término RDF por valor distinto de la columna (None para nulos)
+
+        intern=False para columnas con un valor propio por fila, que no se repite en el pool.
+        """
+        codes, uniques = pd.factorize(series)
+        # El código -1 (nulo) apunta a la última posición, que queda en None
+        terms = np.array([factory(value) for value in uniques] + [None], dtype=object)
+        if intern:
+            self.terms.intern_column(terms)
+        return terms[codes]
+
+    def uri_column(self, series, kind, skip_na=False):
+        """Crear las URIs de una columna acuñando cada valor distinto una sola vez"""
+        return self.minter.mint_column(kind, series, skip_na)
+
+    def add_column(self, subjects, predicate, objects):
+        """Insertar en bloque los triples de una columna omitiendo objetos nulos"""
+        if isinstance(objects, np.ndarray):
+            mask = pd.notna(objects) & pd.notna(subjects)
+            objects = objects[mask]
+        else:
+            # Objeto constante (por ejemplo la clase de rdf:type)
+            mask = pd.notna(subjects)
+            objects = repeat(self.terms.intern(objects))
+        predicate = self.terms.intern(predicate)
+        # La inserción masiva crea millones de tuplas: pausar el GC cíclico evita recorridos inútiles
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            self.g.addN(zip(subjects[mask], repeat(predicate), objects, repeat(self.g)))
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+    def add_columns(self, columns):
+        """Insertar en el grafo una secuencia de columnas de triples"""
+        for subjects, predicate, objects in columns:
+            self.add_column(subjects, predicate, objects)
+
+    def object_column(self, values, intern=True):
+        """Convertir una lista de términos en un arreglo de objetos de NumPy"""
+        terms = np.fromiter(values, dtype=object)
+        return self.terms.intern_column(terms) if intern else terms
+
+    def shared_entity_columns(self, series, uris, rdf_class):
+        """Columnas que describen cada entidad compartida (ciudad, área, departamento) una vez"""
+        entities = pd.DataFrame({'value': series, 'uri': uris}).dropna().drop_duplicates('value')
+        values = entities['value'].tolist()
+        entity_uris = self.object_column(entities['uri'])
+        return [
+            (entity_uris, RDF.type, rdf_class),
+            (entity_uris, RDFS.label, self.object_column(Literal(v, lang="es") for v in values)),
+            (entity_uris, DC.identifier, self.object_column(Literal(v) for v in values)),
+        ]
+
+    def student_columns(self, df):
+        """Columnas de triples propios de cada estudiante de un lote"""
+        ids = df['id_estudiante']
+        student_uris = self.uri_column(ids, 'student')
+        return [
+            # Tipo de entidad e información básica
+            (student_uris, RDF.type, self.UNIV.Student),
+            (student_uris, DC.identifier, self.term_column(ids, Literal, intern=False)),
+            (student_uris, RDFS.label,
+             self.term_column(ids, lambda v: Literal(f"Estudiante {v}", lang="es"), intern=False)),
+            # Datos demográficos y puntaje académico
+            (student_uris, self.UNIV.age, self.term_column(df['edad'], lambda v: Literal(int(v)))),
+            (student_uris, self.UNIV.gender,
+             self.term_column(df['genero'], lambda v: Literal(v, lang="es"))),
+            (student_uris, self.UNIV.socioeconomicStratum,
+             self.term_column(df['estrato'], lambda v: Literal(int(v)))),
+            (student_uris, self.EDU.saber11Score,
+             self.term_column(df['puntaje_saber11'], lambda v: Literal(float(v)), intern=False)),
+            # Relaciones con ciudad de origen, área de preferencia y universidad
+            (student_uris, self.GEO.originFrom,
+             self.uri_column(df['ciudad_origen'], 'city', skip_na=True)),
+            (student_uris, self.EDU.prefersArea,
+             self.uri_column(df['preferencia_area'], 'area', skip_na=True)),
+            (student_uris, self.UNIV.appliesTo,
+             self.uri_column(df['universidad_codigo'], 'university', skip_na=True)),
+        ]
+
+    def student_shared_columns(self, df):
+        """Columnas que describen las ciudades y áreas referenciadas por un lote"""
+        city_uris = self.uri_column(df['ciudad_origen'], 'city', skip_na=True)
+        area_uris = self.uri_column(df['preferencia_area'], 'area', skip_na=True)
+        return (self.shared_entity_columns(df['ciudad_origen'], city_uris, self.GEO.City) +
+                self.shared_entity_columns(df['preferencia_area'], area_uris, self.EDU.KnowledgeArea))
+
+    def university_columns(self, universities):
+        """Columnas que describen universidades y sus departamentos (filas ya deduplicadas)"""
+        codes = universities['universidad_codigo']
+        names = universities['universidad_nombre']
+        university_uris = self.uri_column(codes, 'university')
+        dept_uris = self.uri_column(universities['universidad_departamento'], 'department',
+                                    skip_na=True)
+        return [
+            (university_uris, RDF.type, self.UNIV.University),
+            (university_uris, DC.identifier, self.object_column(Literal(v) for v in codes)),
+            (university_uris, RDFS.label, self.object_column(Literal(v, lang="es") for v in names)),
+            (university_uris, DC.title, self.object_column(Literal(v, lang="es") for v in names)),
+            (university_uris, self.UNIV.hasType,
+             self.term_column(universities['universidad_tipo'], lambda v: Literal(v, lang="es"))),
+            (university_uris, self.UNIV.isAccredited,
+             self.term_column(universities['universidad_acreditada'],
+                              lambda v: Literal(self.convert_boolean(v)))),
+            (university_uris, self.UNIV.nationalRanking,
+             self.term_column(universities['ranking_nacional'], lambda v: Literal(int(v)))),
+            (university_uris, self.GEO.locatedIn, dept_uris),
+        ] + self.shared_entity_columns(universities['universidad_departamento'], dept_uris,
+                                       self.GEO.Department)
+
+    def decision_columns(self, df, created):
+        """Columnas de triples propios de cada decisión académica de un lote"""
+        student_uris = self.uri_column(df['id_estudiante'], 'student')
+        university_uris = self.uri_column(df['universidad_codigo'], 'university')
+        pairs = list(zip(df['id_estudiante'].tolist(), df['universidad_codigo'].tolist()))
+        decision_uris = self.object_column((self.create_decision_uri(sid, code) for sid, code in pairs),
+                                           intern=False)
+        return [
+            # Relación estudiante -> decisión, tipo y etiqueta
+            (student_uris, self.BEHAVIOR.makes, decision_uris),
+            (decision_uris, RDF.type, self.BEHAVIOR.AcademicDecision),
+            (decision_uris, RDFS.label,
+             self.object_column((Literal(f"Decisión de {sid} sobre {code}", lang="es")
+                                 for sid, code in pairs), intern=False)),
+            # Decisión final y modalidad del programa
+            (decision_uris, self.BEHAVIOR.finalDecision,
+             self.term_column(df['eligio_universidad'], lambda v: Literal(self.convert_boolean(v)))),
+            (decision_uris, self.EDU.programModality,
+             self.term_column(df['modalidad_programa'], lambda v: Literal(v, lang="es"))),
+            # Relacionar decisión con universidad y timestamp de creación
+            (decision_uris, DC.subject, university_uris),
+            (decision_uris, DCTERMS.created, created),
+        ]
+
+    def decision_shared_columns(self, df):
+        """Columnas de convenio y beca que las decisiones aportan a cada universidad"""
+        columns = []
+        for field, predicate in (('convenio_internacional', self.UNIV.hasInternationalAgreement),
+                                 ('beca_disponible', self.UNIV.hasScholarship)):
+            # Un triple por combinación distinta (universidad, valor), no uno por fila
+            pairs = df[['universidad_codigo', field]].drop_duplicates()
+            columns.append((self.uri_column(pairs['universidad_codigo'], 'university'), predicate,
+                            self.term_column(pairs[field],
+                                             lambda v: Literal(self.convert_boolean(v)))))
+        return columns
+
+    def shared_columns(self, df):
+        """Columnas de todas las entidades compartidas referenciadas por un lote"""
+        return self.registry.filter_columns(
+            self.student_shared_columns(df) +
+            self.university_columns(df[UNIVERSITY_COLUMNS].drop_duplicates()) +
+            self.decision_shared_columns(df))
+
+    def transform_students_vectorized(self):
+        """Transformar estudiantes a RDF por columnas con inserción en bloque"""
+        self.add_columns(self.student_columns(self.df))
+        self.add_columns(self.registry.filter_columns(self.student_shared_columns(self.df)))
+        self.stats['students'] += len(self.df)
+        print(f"Transformados {self.stats['students']} estudiantes")
+
+    def transform_academic_decisions_vectorized(self):
+        """Transformar decisiones académicas a RDF por columnas con inserción en bloque"""
+        # Timestamp de creación: uno por lote en lugar de uno por fila
+        created = self.created_literal()
+        self.add_columns(self.decision_columns(self.df, created))
+        self.add_columns(self.registry.filter_columns(self.decision_shared_columns(self.df)))
+        self.stats['decisions'] += len(self.df)
+        print(f"Transformadas {self.stats['decisions']} decisiones académicas")
+
+    def add_triple(self, triple, row_object=False):
+        """Agregar un triple al grafo internando su predicado y su objeto
+
+        El sujeto llega del acuñador, que ya interna las entidades compartidas; row_object marca
+        un objeto propio de la fila (identificador, etiqueta, puntaje o decisión), que no se interna.
+        """
+        s, p, o = triple
+        self.g.add((s, self.terms.intern(p), o if row_object else self.terms.intern(o)))
+    
+    def add_shared(self, triple):
+        """Agregar un triple de una entidad compartida solo la primera vez que aparece"""
+        if self.registry.add(triple):
+            self.add_triple(triple)
     
     def transform_students(self):
         """Transformar datos de estudiantes a RDF"""
         print("Transformando datos de estudiantes...")
-        
+        if self.vectorized:
+            return self.transform_students_vectorized()
+
         for index, row in self.df.iterrows():
             # URI del estudiante
             student_uri = self.create_student_uri(row['id_estudiante'])
             
             # Tipo de entidad
-            self.g.add((student_uri, RDF.type, self.UNIV.Student))
+            self.add_triple((student_uri, RDF.type, self.UNIV.Student))
             
             # Información básica
-            self.g.add((student_uri, DC.identifier, Literal(row['id_estudiante'])))
-            self.g.add((student_uri, RDFS.label, 
-                       Literal(f"Estudiante {row['id_estudiante']}", lang="es")))
+            self.add_triple((student_uri, DC.identifier, Literal(row['id_estudiante'])), row_object=True)
+            self.add_triple((student_uri, RDFS.label, 
+                            Literal(f"Estudiante {row['id_estudiante']}", lang="es")), row_object=True)
             
             # Datos demográficos
             if not pd.isna(row['edad']):
-                self.g.add((student_uri, self.UNIV.age, Literal(int(row['edad']))))
+                self.add_triple((student_uri, self.UNIV.age, Literal(int(row['edad']))))
             
             if not pd.isna(row['genero']):
-                self.g.add((student_uri, self.UNIV.gender, Literal(row['genero'], lang="es")))
+                self.add_triple((student_uri, self.UNIV.gender, Literal(row['genero'], lang="es")))
             
             if not pd.isna(row['estrato']):
-                self.g.add((student_uri, self.UNIV.socioeconomicStratum, 
-                           Literal(int(row['estrato']))))
+                self.add_triple((student_uri, self.UNIV.socioeconomicStratum, 
+                                Literal(int(row['estrato']))))
             
             # Puntaje académico
             if not pd.isna(row['puntaje_saber11']):
-                self.g.add((student_uri, self.EDU.saber11Score, 
-                           Literal(float(row['puntaje_saber11']))))
+                self.add_triple((student_uri, self.EDU.saber11Score, 
+                                Literal(float(row['puntaje_saber11']))), row_object=True)
             
             # Relación con ciudad de origen
             if not pd.isna(row['ciudad_origen']):
                 city_uri = self.create_city_uri(row['ciudad_origen'])
-                self.g.add((student_uri, self.GEO.originFrom, city_uri))
+                self.add_triple((student_uri, self.GEO.originFrom, city_uri))
                 
-                # Crear ciudad si no existe
-                self.g.add((city_uri, RDF.type, self.GEO.City))
-                self.g.add((city_uri, RDFS.label, Literal(row['ciudad_origen'], lang="es")))
-                self.g.add((city_uri, DC.identifier, Literal(row['ciudad_origen'])))
+                # Describir la ciudad (cada triple una vez; valores distintos quedan como conflicto)
+                self.add_shared((city_uri, RDF.type, self.GEO.City))
+                self.add_shared((city_uri, RDFS.label, Literal(row['ciudad_origen'], lang="es")))
+                self.add_shared((city_uri, DC.identifier, Literal(row['ciudad_origen'])))
             
             # Relación con área de preferencia
             if not pd.isna(row['preferencia_area']):
                 area_uri = self.create_area_uri(row['preferencia_area'])
-                self.g.add((student_uri, self.EDU.prefersArea, area_uri))
+                self.add_triple((student_uri, self.EDU.prefersArea, area_uri))
                 
-                # Crear área si no existe
-                self.g.add((area_uri, RDF.type, self.EDU.KnowledgeArea))
-                self.g.add((area_uri, RDFS.label, Literal(row['preferencia_area'], lang="es")))
-                self.g.add((area_uri, DC.identifier, Literal(row['preferencia_area'])))
+                # Describir el área (cada triple una vez; valores distintos quedan como conflicto)
+                self.add_shared((area_uri, RDF.type, self.EDU.KnowledgeArea))
+                self.add_shared((area_uri, RDFS.label, Literal(row['preferencia_area'], lang="es")))
+                self.add_shared((area_uri, DC.identifier, Literal(row['preferencia_area'])))
             
             # Relación con universidad
             if not pd.isna(row['universidad_codigo']):
                 university_uri = self.create_university_uri(row['universidad_codigo'])
-                self.g.add((student_uri, self.UNIV.appliesTo, university_uri))
+                self.add_triple((student_uri, self.UNIV.appliesTo, university_uri))
             
             self.stats['students'] += 1
         
@@ -177,51 +419,49 @@ class DataTransformer:
         print("Transformando datos de universidades...")
         
         # Obtener universidades únicas
-        universities = self.df[['universidad_codigo', 'universidad_nombre', 
-                               'universidad_departamento', 'universidad_tipo',
-                               'universidad_acreditada', 'ranking_nacional']].drop_duplicates()
+        universities = self.df[UNIVERSITY_COLUMNS].drop_duplicates()
         
         for index, row in universities.iterrows():
             # URI de la universidad
             university_uri = self.create_university_uri(row['universidad_codigo'])
             
             # Tipo de entidad
-            self.g.add((university_uri, RDF.type, self.UNIV.University))
+            self.add_shared((university_uri, RDF.type, self.UNIV.University))
             
             # Información básica
-            self.g.add((university_uri, DC.identifier, Literal(row['universidad_codigo'])))
-            self.g.add((university_uri, RDFS.label, 
-                       Literal(row['universidad_nombre'], lang="es")))
-            self.g.add((university_uri, DC.title, 
-                       Literal(row['universidad_nombre'], lang="es")))
+            self.add_shared((university_uri, DC.identifier, Literal(row['universidad_codigo'])))
+            self.add_shared((university_uri, RDFS.label, 
+                            Literal(row['universidad_nombre'], lang="es")))
+            self.add_shared((university_uri, DC.title, 
+                            Literal(row['universidad_nombre'], lang="es")))
             
             # Tipo de universidad
             if not pd.isna(row['universidad_tipo']):
-                self.g.add((university_uri, self.UNIV.hasType, 
-                           Literal(row['universidad_tipo'], lang="es")))
+                self.add_shared((university_uri, self.UNIV.hasType, 
+                                Literal(row['universidad_tipo'], lang="es")))
             
             # Acreditación
             if not pd.isna(row['universidad_acreditada']):
                 is_accredited = self.convert_boolean(row['universidad_acreditada'])
-                self.g.add((university_uri, self.UNIV.isAccredited, 
-                           Literal(is_accredited)))
+                self.add_shared((university_uri, self.UNIV.isAccredited, 
+                                Literal(is_accredited)))
             
             # Ranking nacional
             if not pd.isna(row['ranking_nacional']):
-                self.g.add((university_uri, self.UNIV.nationalRanking, 
-                           Literal(int(row['ranking_nacional']))))
+                self.add_shared((university_uri, self.UNIV.nationalRanking, 
+                                Literal(int(row['ranking_nacional']))))
             
             # Relación con departamento
             if not pd.isna(row['universidad_departamento']):
                 dept_uri = self.create_department_uri(row['universidad_departamento'])
-                self.g.add((university_uri, self.GEO.locatedIn, dept_uri))
+                self.add_shared((university_uri, self.GEO.locatedIn, dept_uri))
                 
-                # Crear departamento si no existe
-                self.g.add((dept_uri, RDF.type, self.GEO.Department))
-                self.g.add((dept_uri, RDFS.label, 
-                           Literal(row['universidad_departamento'], lang="es")))
-                self.g.add((dept_uri, DC.identifier, 
-                           Literal(row['universidad_departamento'])))
+                # Describir el departamento (cada triple una vez; valores distintos quedan como conflicto)
+                self.add_shared((dept_uri, RDF.type, self.GEO.Department))
+                self.add_shared((dept_uri, RDFS.label, 
+                                Literal(row['universidad_departamento'], lang="es")))
+                self.add_shared((dept_uri, DC.identifier, 
+                                Literal(row['universidad_departamento'])))
             
             self.stats['universities'] += 1
         
@@ -230,6 +470,8 @@ class DataTransformer:
     def transform_academic_decisions(self):
         """Transformar decisiones académicas a RDF"""
         print("Transformando decisiones académicas...")
+        if self.vectorized:
+            return self.transform_academic_decisions_vectorized()
         
         for index, row in self.df.iterrows():
             # URIs relacionadas
@@ -238,42 +480,42 @@ class DataTransformer:
             decision_uri = self.create_decision_uri(row['id_estudiante'], row['universidad_codigo'])
             
             # Tipo de entidad
-            self.g.add((decision_uri, RDF.type, self.BEHAVIOR.AcademicDecision))
+            self.add_triple((decision_uri, RDF.type, self.BEHAVIOR.AcademicDecision))
             
             # Relación estudiante -> decisión
-            self.g.add((student_uri, self.BEHAVIOR.makes, decision_uri))
+            self.add_triple((student_uri, self.BEHAVIOR.makes, decision_uri), row_object=True)
             
             # Información de la decisión
-            self.g.add((decision_uri, RDFS.label, 
-                       Literal(f"Decisión de {row['id_estudiante']} sobre {row['universidad_codigo']}", lang="es")))
+            self.add_triple((decision_uri, RDFS.label, 
+                            Literal(f"Decisión de {row['id_estudiante']} sobre {row['universidad_codigo']}", lang="es")),
+                            row_object=True)
             
             # Decisión final
             if not pd.isna(row['eligio_universidad']):
                 final_decision = self.convert_boolean(row['eligio_universidad'])
-                self.g.add((decision_uri, self.BEHAVIOR.finalDecision, Literal(final_decision)))
+                self.add_triple((decision_uri, self.BEHAVIOR.finalDecision, Literal(final_decision)))
             
             # Modalidad del programa
             if not pd.isna(row['modalidad_programa']):
-                self.g.add((decision_uri, self.EDU.programModality, 
-                           Literal(row['modalidad_programa'], lang="es")))
+                self.add_triple((decision_uri, self.EDU.programModality, 
+                                Literal(row['modalidad_programa'], lang="es")))
             
             # Convenio internacional
             if not pd.isna(row['convenio_internacional']):
                 has_agreement = self.convert_boolean(row['convenio_internacional'])
-                self.g.add((university_uri, self.UNIV.hasInternationalAgreement, 
-                           Literal(has_agreement)))
+                self.add_shared((university_uri, self.UNIV.hasInternationalAgreement, 
+                                Literal(has_agreement)))
             
             # Beca disponible
             if not pd.isna(row['beca_disponible']):
                 has_scholarship = self.convert_boolean(row['beca_disponible'])
-                self.g.add((university_uri, self.UNIV.hasScholarship, Literal(has_scholarship)))
+                self.add_shared((university_uri, self.UNIV.hasScholarship, Literal(has_scholarship)))
             
             # Relacionar decisión con universidad
-            self.g.add((decision_uri, DC.subject, university_uri))
+            self.add_triple((decision_uri, DC.subject, university_uri))
             
-            # Timestamp de creación
-            self.g.add((decision_uri, DCTERMS.created, 
-                       Literal(datetime.now().isoformat(), datatype=XSD.dateTime)))
+            # Timestamp de creación (uno por fila, o el mismo objeto de la ejecución: no se interna)
+            self.add_triple((decision_uri, DCTERMS.created, self.created_literal()), row_object=True)
             
             self.stats['decisions'] += 1
         
@@ -283,48 +525,295 @@ class DataTransformer:
         """Agregar metadatos al dataset"""
         print("Agregando metadatos del dataset...")
         
+        for triple in self.metadata_triples(len(self.df)):
+            self.add_triple(triple)
+        
+        print("Metadatos agregados")
+    
+    def metadata_triples(self, record_count, created=None):
+        """Triples de metadatos del dataset para un número dado de registros"""
         # URI del dataset
         dataset_uri = self.UNIV["dataset_university_choices"]
+        if created is None:
+            created = self.created_literal()
         
         # Información del dataset
-        self.g.add((dataset_uri, RDF.type, self.SCHEMA.Dataset))
-        self.g.add((dataset_uri, DC.title, 
-                   Literal("Dataset de Decisiones Universitarias Colombia", lang="es")))
-        self.g.add((dataset_uri, DC.description, 
-                   Literal("Datos sobre patrones de comportamiento estudiantil en la selección de universidades en Colombia", lang="es")))
-        self.g.add((dataset_uri, DCTERMS.created, 
-                   Literal(datetime.now().isoformat(), datatype=XSD.dateTime)))
-        self.g.add((dataset_uri, DC.creator, 
-                   Literal("Proyecto Linked Data - Web Semántica", lang="es")))
-        self.g.add((dataset_uri, DC.language, Literal("es")))
-        self.g.add((dataset_uri, DCTERMS.spatial, Literal("Colombia", lang="es")))
-        
-        # Estadísticas del dataset
-        self.g.add((dataset_uri, self.SCHEMA.numberOfItems, Literal(len(self.df))))
+        return [
+            (dataset_uri, RDF.type, self.SCHEMA.Dataset),
+            (dataset_uri, DC.title, 
+             Literal("Dataset de Decisiones Universitarias Colombia", lang="es")),
+            (dataset_uri, DC.description, 
+             Literal("Datos sobre patrones de comportamiento estudiantil en la selección de universidades en Colombia", lang="es")),
+            (dataset_uri, DCTERMS.created, created),
+            (dataset_uri, DC.creator, 
+             Literal("Proyecto Linked Data - Web Semántica", lang="es")),
+            (dataset_uri, DC.language, Literal("es")),
+            (dataset_uri, DCTERMS.spatial, Literal("Colombia", lang="es")),
+            # Estadísticas del dataset
+            (dataset_uri, self.SCHEMA.numberOfItems, Literal(record_count)),
+        ]
+    
+    def stream_ntriples(self, output_path, chunksize=100000):
+        """Transformar el CSV por lotes escribiendo N-Triples directamente a disco"""
+        print(f"Transformando en streaming hacia: {output_path}")
         
-        print("Metadatos agregados")
+        # Un único timestamp de creación para toda la ejecución
+        created = self.created_literal()
+        record_count = 0
+        
+        with open_compressed(output_path, "w") as f:
+            writer = NTriplesWriter(f)
+            
+            # Ontología base (tamaño fijo, independiente del número de filas)
+            writer.write_triples_once(self.g)
+            
+            for chunk in read_typed_chunks(self.csv_path, chunksize):
+                # Triples propios de cada fila, agrupados por fila
+                writer.write_rows(self.student_columns(chunk) +
+                                  self.decision_columns(chunk, created))
+                
+                # Entidades compartidas: se describen la primera vez que aparecen
+                writer.write_columns_once(self.shared_columns(chunk))
+                
+                record_count += len(chunk)
+                print(f"  {record_count} registros procesados, {writer.count} triples escritos")
+            
+            # Metadatos del dataset (requieren el total de registros)
+            writer.write_triples_once(self.metadata_triples(record_count))
+        
+        self.stats['students'] += record_count
+        self.stats['decisions'] += record_count
+        self.stats['total_triples'] = writer.count
+        print(f"Transformación en streaming completada: {writer.count} triples en {output_path}")
+        self.minter.print_cache_stats()
+        self.registry.print_conflicts()
+        return writer.count
     
-    def save_rdf_data(self, filename):
-        """Guardar datos RDF en diferentes formatos"""
-        print("Guardando datos RDF...")
+    def shard_ranges(self, shard_rows):
+        """Rangos de bytes del CSV que contienen cada fragmento de `shard_rows` filas"""
+        # Se asume una fila por línea (el anexo no tiene saltos de línea entre comillas)
+        if is_compressed(self.csv_path):
+            raise ValueError("El modo por fragmentos requiere un CSV sin comprimir "
+                             f"(acceso por rangos de bytes): {self.csv_path}")
+        ranges = []
+        with open(self.csv_path, "rb") as f:
+            header = f.readline()
+            start = offset = f.tell()
+            rows = 0
+            for line in f:
+                offset += len(line)
+                rows += 1
+                if rows % shard_rows == 0:
+                    ranges.append((start, offset))
+                    start = offset
+            if offset > start:
+                ranges.append((start, offset))
+        return header, ranges
+    
+    def transform_sharded(self, output_path, workers=None, shard_rows=50000, timestamp=None):
+        """Transformar el CSV en paralelo por fragmentos de filas y fusionarlos en un N-Triples"""
+        # Los fragmentos tienen tamaño fijo: la salida no depende del número de procesos.
+        # El timestamp por defecto sale de la fecha de modificación del CSV, de modo que
+        # dos ejecuciones sobre la misma entrada producen exactamente los mismos bytes.
+        if timestamp is None:
+            timestamp = datetime.fromtimestamp(os.path.getmtime(self.csv_path))
+        created = Literal(timestamp.isoformat(), datatype=XSD.dateTime)
+        header, ranges = self.shard_ranges(shard_rows)
+        print(f"Transformando {len(ranges)} fragmentos de hasta {shard_rows} filas "
+              f"con {workers or os.cpu_count()} procesos...")
         
-        # RDF/XML
-        with open(f"/Users/leomos/Downloads/web_semantica/output/{filename}.rdf", "w", encoding="utf-8") as f:
-            f.write(self.g.serialize(format="xml"))
+        output_dir = os.path.dirname(os.path.abspath(output_path))
+        with tempfile.TemporaryDirectory(dir=output_dir) as shard_dir:
+            shard_paths = [os.path.join(shard_dir, f"shard_{i:05d}.nt") for i in range(len(ranges))]
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_shard_worker,
+                                     initargs=(self.csv_path, self.ontology_path)) as executor:
+                results = list(executor.map(_transform_shard,
+                                            [header] * len(ranges), ranges, shard_paths,
+                                            [created] * len(ranges)))
+            
+            record_count = sum(rows for rows, _, _ in results)
+            for _, _, registry in results:
+                self.registry.merge(registry)
+            base_writer = NTriplesWriter(None)
+            ontology_lines = {base_writer.line(triple) for triple in self.g}
+            shared_lines = set().union(*(lines for _, lines, _ in results)) - ontology_lines
+            
+            # Fusión determinista: ontología, fragmentos en orden, entidades compartidas, metadatos
+            with open_compressed(output_path, "w") as f:
+                f.writelines(sorted(ontology_lines))
+                for shard_path in shard_paths:
+                    with open(shard_path, "r", encoding="utf-8") as shard:
+                        shutil.copyfileobj(shard, f)
+                f.writelines(sorted(shared_lines))
+                f.writelines(base_writer.line(triple)
+                             for triple in self.metadata_triples(record_count, created))
+        
+        self.stats['students'] += record_count
+        self.stats['decisions'] += record_count
+        print(f"Transformación paralela completada: {record_count} registros en {output_path}")
+        self.registry.print_conflicts()
+        return record_count
+    
+    def row_keys(self, df):
+        """Clave estable de cada fila: estudiante|universidad (con sufijo si se repite)"""
+        keys = df['id_estudiante'].astype(str) + "|" + df['universidad_codigo'].astype(str)
+        occurrence = keys.groupby(keys).cumcount()
+        return keys.where(occurrence == 0, keys + "#" + occurrence.astype(str)).tolist()
+    
+    def row_hashes(self, df):
+        """Hash del contenido de cada fila (independiente del tipo de dato de las columnas)"""
+        return [str(h) for h in pd.util.hash_pandas_object(df.astype(str), index=False)]
+    
+    def row_line_blocks(self, df, created):
+        """Bloque de líneas N-Triples propio de cada fila (estudiante y decisión)"""
+        writer = NTriplesWriter(None)
+        columns = self.student_columns(df) + self.decision_columns(df, created)
+        matrix = np.column_stack([writer.column_lines(*column) for column in columns])
+        return ["".join(row) for row in matrix]
+    
+    @staticmethod
+    def dump_blocks(path, manifest):
+        """Recorrer el volcado anterior según su manifiesto: (clave, líneas) de cada fila,
+        con clave None para la cabecera de entidades compartidas y para los metadatos finales"""
+        if manifest['id'] is None:
+            return
+        with open_compressed(path, "r") as f:
+            yield None, list(islice(f, manifest['shared']))
+            for key, _, count in manifest['rows']:
+                yield key, list(islice(f, count))
+            yield None, list(islice(f, manifest['metadata']))
+    
+    def transform_incremental(self, output_path, manifest_path=None, patch_path=None):
+        """Retransformar solo las filas nuevas, modificadas o eliminadas y emitir un RDF Patch
         
-        # Turtle
-        with open(f"/Users/leomos/Downloads/web_semantica/output/{filename}.ttl", "w", encoding="utf-8") as f:
-            f.write(self.g.serialize(format="turtle"))
+        El manifiesto guarda por fila solo el hash y el número de líneas, en el orden del volcado:
+        las filas sin cambios se copian del volcado anterior y solo se generan las demás.
+        """
+        manifest_path = manifest_path or output_path + ".manifest.json"
+        patch_path = patch_path or os.path.splitext(strip_compression(output_path))[0] + ".rdfp"
         
-        # N-Triples
-        with open(f"/Users/leomos/Downloads/web_semantica/output/{filename}.nt", "w", encoding="utf-8") as f:
-            f.write(self.g.serialize(format="nt"))
+        # Manifiesto de la entrega anterior (vacío en la primera ejecución o sin su volcado)
+        previous = {'id': None, 'rows': [], 'shared': 0, 'metadata': 0}
+        if os.path.exists(manifest_path) and os.path.exists(output_path):
+            with open_compressed(manifest_path, "r") as f:
+                previous = json.load(f)
+        old_rows = {key: (position, row_hash, count)
+                    for position, (key, row_hash, count) in enumerate(previous['rows'])}
         
-        # JSON-LD
-        with open(f"/Users/leomos/Downloads/web_semantica/output/{filename}.jsonld", "w", encoding="utf-8") as f:
-            f.write(self.g.serialize(format="json-ld"))
+        # Comparar hashes por fila; las filas sin cambios se copian si conservan su orden relativo
+        created = self.created_literal()
+        keys = self.row_keys(self.df)
+        hashes = self.row_hashes(self.df)
+        counts = {}
+        changed_positions = []
+        last = -1
+        for position, (key, row_hash) in enumerate(zip(keys, hashes)):
+            old = old_rows.get(key)
+            if old is not None and old[1] == row_hash and old[0] > last:
+                counts[key] = old[2]
+                last = old[0]
+            else:
+                changed_positions.append(position)
         
+        # Transformar solo las filas nuevas, modificadas o desplazadas
+        changed = [keys[position] for position in changed_positions]
+        blocks = dict(zip(changed, self.row_line_blocks(self.df.iloc[changed_positions], created)))
+        for key, block in blocks.items():
+            counts[key] = block.count("\n")
+        added = [key for key in changed if key not in old_rows]
+        removed = [key for key in old_rows if key not in counts]
+        
+        # Entidades compartidas y ontología (pocas líneas: se recalculan completas)
+        writer = NTriplesWriter(None)
+        shared_lines = {writer.line(triple) for triple in self.g}
+        for column in self.shared_columns(self.df):
+            shared_lines.update(line for line in writer.column_lines(*column) if line)
+        regenerate_metadata = bool(changed or removed or not previous['metadata'])
+        metadata_lines = []
+        if regenerate_metadata:
+            metadata_lines = [writer.line(triple)
+                              for triple in self.metadata_triples(len(self.df), created)]
+        
+        # Volcado nuevo en un solo recorrido del anterior: las filas sin cambios se copian y
+        # de las demás solo se guardan sus líneas antiguas para el patch
+        affected_students = {key.split("|")[0] for key in changed + removed}
+        old_lines = set()
+        old_shared = set()
+        kept_lines = set()
+        
+        def discard(key, lines):
+            if key is None:
+                old_shared.update(lines)
+            else:
+                old_lines.update(lines)
+        
+        root, compression = split_compression(output_path)
+        tmp_output = f"{root}.tmp{compression}"
+        with open_compressed(tmp_output, "w") as f:
+            f.writelines(sorted(shared_lines))
+            old_blocks = self.dump_blocks(output_path, previous)
+            for key in keys:
+                if key in blocks:
+                    f.write(blocks[key])
+                    continue
+                for old_key, lines in old_blocks:
+                    if old_key == key:
+                        break
+                    discard(old_key, lines)
+                f.writelines(lines)
+                # Líneas del estudiante que siguen en otras filas: no se borran
+                if key.split("|")[0] in affected_students:
+                    kept_lines.update(lines)
+            for old_key, lines in old_blocks:
+                discard(old_key, lines)
+                if old_key is None and not regenerate_metadata:
+                    metadata_lines = lines
+            f.writelines(metadata_lines)
+        os.replace(tmp_output, output_path)
+        
+        # Diferencias por fila y de las entidades compartidas
+        new_lines = set()
+        for block in blocks.values():
+            new_lines.update(block.splitlines(keepends=True))
+        new_shared = shared_lines | set(metadata_lines)
+        deletions = (old_lines - new_lines - kept_lines) | (old_shared - new_shared)
+        additions = (new_lines - old_lines - kept_lines) | (new_shared - old_shared)
+        
+        # RDF Patch: cabeceras, transacción con borrados y adiciones
+        patch_id = f"uuid:{uuid.uuid4()}"
+        with open_compressed(patch_path, "w") as f:
+            f.write(f"H id <{patch_id}> .\n")
+            if previous['id']:
+                f.write(f"H prev <{previous['id']}> .\n")
+            f.write("TX .\n")
+            f.writelines("D " + line for line in sorted(deletions))
+            f.writelines("A " + line for line in sorted(additions))
+            f.write("TC .\n")
+        
+        # Guardar el manifiesto de forma atómica: hash y número de líneas de cada fila
+        root, compression = split_compression(manifest_path)
+        tmp_path = f"{root}.tmp{compression}"
+        with open_compressed(tmp_path, "w") as f:
+            json.dump({'id': patch_id,
+                       'rows': [[key, row_hash, counts[key]] for key, row_hash in zip(keys, hashes)],
+                       'shared': len(shared_lines), 'metadata': len(metadata_lines)}, f, ensure_ascii=False)
+        os.replace(tmp_path, manifest_path)
+        
+        print("\n=== TRANSFORMACIÓN INCREMENTAL ===")
+        print(f"Filas nuevas: {len(added)}")
+        print(f"Filas modificadas: {len(changed) - len(added)}")
+        print(f"Filas eliminadas: {len(removed)}")
+        print(f"Patch: {len(additions)} adiciones, {len(deletions)} borrados en {patch_path}")
+        print(f"Volcado completo actualizado: {output_path}")
+        return additions, deletions
+    
+    def save_rdf_data(self, filename, formats=DEFAULT_FORMATS, compression=""):
+        """Guardar datos RDF en los formatos indicados, en paralelo y directamente a archivo"""
+        print("Guardando datos RDF...")
+        paths = export_graph(self.g, f"/Users/leomos/Downloads/web_semantica/output/{filename}", formats,
+                             compression=compression)
         print(f"Datos RDF guardados como {filename}.* en múltiples formatos")
+        return paths
     
     def print_transformation_stats(self):
         """Mostrar estadísticas de la transformación"""
@@ -352,18 +841,65 @@ class DataTransformer:
         print(f"Áreas de conocimiento: {areas_count}")
         print(f"Ciudades: {cities_count}")
         print(f"Departamentos: {departments_count}")
+        
+        # Eficiencia de la acuñación de URIs
+        self.minter.print_cache_stats()
+        self.terms.print_stats()
+        if isinstance(self.g.store, IntegerStore):
+            self.g.store.print_stats()
+        self.registry.print_conflicts()
+
+# Transformador de cada proceso trabajador (se crea una vez por proceso)
+_shard_transformer = None
+
+def _init_shard_worker(csv_file_path, ontology_file_path):
+    """Inicializar el transformador del proceso trabajador"""
+    global _shard_transformer
+    with contextlib.redirect_stdout(io.StringIO()):
+        _shard_transformer = DataTransformer(csv_file_path, ontology_file_path, streaming=True)
 
-def main():
+def _transform_shard(header, byte_range, shard_path, created):
+    """Transformar un fragmento de filas a N-Triples y devolver sus líneas compartidas"""
+    transformer = _shard_transformer
+    start, end = byte_range
+    with open(transformer.csv_path, "rb") as f:
+        f.seek(start)
+        chunk = read_typed_csv(io.BytesIO(header + f.read(end - start)))
+    
+    with open(shard_path, "w", encoding="utf-8") as shard:
+        writer = NTriplesWriter(shard)
+        writer.write_rows(transformer.student_columns(chunk) +
+                          transformer.decision_columns(chunk, created))
+    
+    shared_lines = set()
+    for column in transformer.shared_columns(chunk):
+        shared_lines.update(line for line in writer.column_lines(*column) if line)
+    return len(chunk), shared_lines, transformer.registry
+
+def main(incremental=False, sqlite=False, formats=DEFAULT_FORMATS, compression=""):
     """Función principal para transformar datos"""
     print("=== TRANSFORMACIÓN DE DATOS CSV A RDF ===")
     print("Convirtiendo dataset de estudiantes a formato Linked Data\n")
     
-    # Inicializar transformador
+    # Inicializar transformador (con --sqlite los triples se escriben en el store persistente)
     transformer = DataTransformer(
         csv_file_path="/Users/leomos/Downloads/web_semantica/ISOFV163_A8_Anexo.csv",
-        ontology_file_path="/Users/leomos/Downloads/web_semantica/output/university_ontology.ttl"
+        ontology_file_path="/Users/leomos/Downloads/web_semantica/output/university_ontology.ttl",
+        store=("/Users/leomos/Downloads/web_semantica/output/university_linked_data.sqlite"
+               if sqlite else "default")
     )
     
+    # Modo incremental: solo filas cambiadas, con RDF Patch y volcado N-Triples actualizado
+    if incremental:
+        transformer.transform_incremental(
+            "/Users/leomos/Downloads/web_semantica/output/university_linked_data.nt")
+        print("\n=== TRANSFORMACIÓN INCREMENTAL COMPLETADA ===")
+        print("Archivos generados:")
+        print("- output/university_linked_data.nt (N-Triples)")
+        print("- output/university_linked_data.rdfp (RDF Patch)")
+        print("- output/university_linked_data.nt.manifest.json (manifiesto por fila)")
+        return transformer
+    
     # Realizar transformaciones
     transformer.transform_students()
     transformer.transform_universities()
@@ -374,16 +910,30 @@ def main():
     transformer.print_transformation_stats()
     
     # Guardar resultados
-    transformer.save_rdf_data("university_linked_data")
+    paths = transformer.save_rdf_data("university_linked_data", formats, compression)
     
     print("\n=== TRANSFORMACIÓN COMPLETADA ===")
     print("Archivos generados:")
-    print("- output/university_linked_data.rdf (RDF/XML)")
-    print("- output/university_linked_data.ttl (Turtle)")
-    print("- output/university_linked_data.nt (N-Triples)")
-    print("- output/university_linked_data.jsonld (JSON-LD)")
+    for extension, path in zip(formats, paths):
+        print(f"- output/{os.path.basename(path)} ({FORMAT_NAMES[extension]})")
+        if extension == 'ndjson':
+            print(f"- output/{os.path.basename(context_path(path))} (@context compartido del NDJSON)")
+    if sqlite:
+        transformer.g.close()
+        print("- output/university_linked_data.sqlite (store SQLite)")
     
     return transformer
 
 if __name__ == "__main__":
-    data_transformer = main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Transformación de datos CSV a RDF")
+    parser.add_argument("--incremental", action="store_true",
+                        help="retransformar solo las filas cambiadas y emitir un RDF Patch")
+    parser.add_argument("--sqlite", action="store_true",
+                        help="escribir los triples en output/university_linked_data.sqlite")
+    parser.add_argument("--formats", nargs="+", choices=EXPORT_FORMATS, default=list(DEFAULT_FORMATS),
+                        help="formatos de salida (por defecto todos salvo ndjson)")
+    parser.add_argument("--compress", choices=["gz", "bz2", "xz"], default="",
+                        help="comprimir los archivos de salida (excepto el snapshot binario)")
+    args = parser.parse_args()
+    data_transformer = main(incremental=args.incremental, sqlite=args.sqlite, formats=args.formats,
+                            compression=args.compress)
\ No newline at end of file
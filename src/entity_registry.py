@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Registro de Entidades Compartidas - Proyecto Linked Data Universidades
+Emisión única de ciudades, áreas, departamentos y universidades, con detección de conflictos
+"""
+
+from collections import defaultdict
+from itertools import repeat
+
+import numpy as np
+import pandas as pd
+
+
+class EntityRegistry:
+    """Registro de las entidades compartidas ya descritas durante una ejecución"""
+
+    def __init__(self, functional_predicates=()):
+        """Inicializar con los predicados que deberían tener un único valor por entidad"""
+        self.functional = set(functional_predicates)
+        self.triples = set()
+        self.values = defaultdict(set)
+
+    def add(self, triple):
+        """Indicar si el triple es nuevo (y registrarlo); anota valores de predicados funcionales"""
+        if triple in self.triples:
+            return False
+        self.triples.add(triple)
+        subject, predicate, obj = triple
+        if predicate in self.functional:
+            self.values[(subject, predicate)].add(obj)
+        return True
+
+    def filter_columns(self, columns):
+        """Reducir columnas de triples compartidos a los triples aún no registrados"""
+        filtered = []
+        for subjects, predicate, objects in columns:
+            if not isinstance(objects, np.ndarray):
+                objects = np.fromiter(repeat(objects, len(subjects)), dtype=object)
+            mask = pd.notna(subjects) & pd.notna(objects)
+            new = [(s, o) for s, o in zip(subjects[mask], objects[mask])
+                   if self.add((s, predicate, o))]
+            filtered.append((np.fromiter((s for s, _ in new), dtype=object, count=len(new)),
+                             predicate,
+                             np.fromiter((o for _, o in new), dtype=object, count=len(new))))
+        return filtered
+
+    def merge(self, other):
+        """Incorporar lo registrado por otro registro (por ejemplo, de un proceso trabajador)"""
+        for triple in other.triples:
+            self.add(triple)
+
+    def conflicts(self):
+        """Pares (entidad, predicado funcional) que recibieron más de un valor"""
+        return {key: sorted(values, key=str)
+                for key, values in self.values.items() if len(values) > 1}
+
+    def print_conflicts(self):
+        """Mostrar los conflictos detectados en entidades compartidas"""
+        conflicts = self.conflicts()
+        print("\n=== CONFLICTOS EN ENTIDADES COMPARTIDAS ===")
+        if not conflicts:
+            print("✓ Sin conflictos")
+            return
+        for (subject, predicate), values in sorted(conflicts.items(), key=str):
+            print(f"⚠ {subject} {predicate}: {', '.join(str(v) for v in values)}")
@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Almacén de Triples Codificado en Enteros - Proyecto Linked Data Universidades
+Store de rdflib con diccionario de términos y permutaciones SPO/POS/OSP ordenadas en arreglos NumPy
+"""
+
+from array import array
+
+import numpy as np
+from rdflib import plugin
+from rdflib.store import Store
+
+# Nombre con el que se registra el plugin: Graph(store=STORE_NAME)
+STORE_NAME = "IntegerStore"
+
+# Filas de una permutación que se convierten a enteros de Python por paso al recorrerla
+SCAN_ROWS = 1 << 16
+
+# Desplazamiento para unir dos identificadores de 32 bits en una clave de 64
+KEY_SHIFT = np.uint64(32)
+
+# Orden de las posiciones (sujeto=0, predicado=1, objeto=2) en cada permutación
+PERMUTATIONS = {
+    'spo': (0, 1, 2),
+    'pos': (1, 2, 0),
+    'osp': (2, 0, 1),
+}
+
+# Permutación cuyo prefijo cubre cada combinación de posiciones conocidas (s, p, o)
+INDEX_FOR_PATTERN = {
+    (False, False, False): 'spo',
+    (True, False, False): 'spo',
+    (True, True, False): 'spo',
+    (True, True, True): 'spo',
+    (False, True, False): 'pos',
+    (False, True, True): 'pos',
+    (False, False, True): 'osp',
+    (True, False, True): 'osp',
+}
+
+
+class TermDictionary:
+    """Diccionario bidireccional entre términos RDF e identificadores enteros"""
+
+    def __init__(self):
+        """Inicializar el diccionario vacío"""
+        self.ids = {}
+        self.terms = []
+
+    def encode(self, term):
+        """Identificador de un término, asignando uno nuevo si no existe"""
+        term_id = self.ids.get(term)
+        if term_id is None:
+            term_id = self.ids[term] = len(self.terms)
+            self.terms.append(term)
+        return term_id
+
+    def lookup(self, term):
+        """Identificador de un término ya conocido (None si no existe)"""
+        return self.ids.get(term)
+
+    def decode(self, term_id):
+        """Término correspondiente a un identificador"""
+        return self.terms[term_id]
+
+    def __len__(self):
+        """Número de términos distintos"""
+        return len(self.terms)
+
+
+class IntegerStore(Store):
+    """Store sin contextos que guarda los triples como enteros en índices ordenados"""
+
+    context_aware = False
+    formula_aware = False
+    transaction_aware = False
+    graph_aware = False
+
+    def __init__(self, configuration=None, identifier=None):
+        """Inicializar el store vacío"""
+        super().__init__(configuration)
+        self.identifier = identifier
+        self.dictionary = TermDictionary()
+        # Triples agregados desde el último ordenamiento (se incorporan al consultar)
+        self._pending = [array('q'), array('q'), array('q')]
+        self._indexes = {name: self._empty_columns(np.uint32) for name in PERMUTATIONS}
+        self._namespace = {}
+        self._prefix = {}
+
+    @staticmethod
+    def _empty_columns(dtype):
+        """Tres columnas vacías de identificadores"""
+        return tuple(np.empty(0, dtype=dtype) for _ in range(3))
+
+    def _id_dtype(self):
+        """Tipo entero más compacto que admite todos los identificadores del diccionario"""
+        return np.uint32 if len(self.dictionary) < 2 ** 32 else np.int64
+
+    def add(self, triple, context=None, quoted=False):
+        """Agregar un triple"""
+        encode = self.dictionary.encode
+        for column, term in zip(self._pending, triple):
+            column.append(encode(term))
+
+    def addN(self, quads):
+        """Agregar triples en bloque (se ignora el contexto)"""
+        encode = self.dictionary.encode
+        subjects, predicates, objects = self._pending
+        for s, p, o, _ in quads:
+            subjects.append(encode(s))
+            predicates.append(encode(p))
+            objects.append(encode(o))
+
+    def _flush(self):
+        """Incorporar los triples pendientes a los índices sin volver a ordenarlos
+
+        Solo se ordena el bloque pendiente; sus triples nuevos se intercalan en cada permutación
+        ya construida. Sin índice previo (o con identificadores de más de 32 bits) se reconstruye.
+        """
+        if not len(self._pending[0]):
+            return
+        dtype = self._id_dtype()
+        block = [np.frombuffer(new, dtype=np.int64).astype(dtype) for new in self._pending]
+        self._pending = [array('q'), array('q'), array('q')]
+        self._decode_indexes()
+        spo = self._indexes['spo']
+        if dtype != np.uint32 or spo[0].dtype != dtype or not len(spo[0]):
+            self._build(*(np.concatenate([old.astype(dtype, copy=False), new])
+                          for old, new in zip(spo, block)))
+            return
+        block = self._unique(self._permute(block, 'spo'))
+        positions, present = self._positions(spo, block)
+        if present.all():
+            return
+        block = tuple(column[~present] for column in block)
+        indexes = {'spo': self._insert(spo, positions[~present], block)}
+        for name, columns in self._indexes.items():
+            if name != 'spo':
+                permuted = self._permute(block, name)
+                indexes[name] = self._insert(columns, self._positions(columns, permuted)[0], permuted)
+        self._indexes = indexes
+
+    @staticmethod
+    def _permute(spo, name):
+        """Columnas de una permutación, ordenadas, a partir de columnas de sujeto, predicado y objeto"""
+        columns = [spo[position] for position in PERMUTATIONS[name]]
+        # lexsort ordena por la última clave primero
+        sort = np.lexsort(columns[::-1])
+        return tuple(column[sort] for column in columns)
+
+    @staticmethod
+    def _unique(columns):
+        """Columnas ordenadas sin las filas repetidas"""
+        if len(columns[0]) < 2:
+            return columns
+        keep = np.ones(len(columns[0]), dtype=bool)
+        keep[1:] = ((columns[0][1:] != columns[0][:-1]) |
+                    (columns[1][1:] != columns[1][:-1]) |
+                    (columns[2][1:] != columns[2][:-1]))
+        return tuple(column[keep] for column in columns)
+
+    @staticmethod
+    def _positions(columns, block):
+        """Posición de cada fila de un bloque ordenado en una permutación ordenada (identificadores
+        de 32 bits) y si la fila ya está en ella
+
+        Las dos primeras columnas forman una clave de 64 bits; dentro de cada grupo con la misma
+        clave, el número de grupo y la tercera columna forman otra clave creciente.
+        """
+        first, second, third = columns
+        prefix = (first.astype(np.uint64) << KEY_SHIFT) | second
+        key = (block[0].astype(np.uint64) << KEY_SHIFT) | block[1]
+        positions = prefix.searchsorted(key, 'left')
+        found = positions < prefix.searchsorted(key, 'right')
+        if found.any():
+            group = np.zeros(len(prefix), dtype=np.uint64)
+            group[1:] = np.cumsum(prefix[1:] != prefix[:-1], dtype=np.uint64)
+            grouped = (group << KEY_SHIFT) | third
+            positions[found] = grouped.searchsorted((group[positions[found]] << KEY_SHIFT) |
+                                                    block[2][found], 'left')
+        present = np.zeros(len(key), dtype=bool)
+        inside = np.flatnonzero(positions < len(prefix))
+        present[inside] = ((prefix[positions[inside]] == key[inside]) &
+                           (third[positions[inside]] == block[2][inside]))
+        return positions, present
+
+    @staticmethod
+    def _insert(columns, positions, block):
+        """Columnas de una permutación con las filas del bloque insertadas en sus posiciones"""
+        return tuple(np.insert(column, positions, values) for column, values in zip(columns, block))
+
+    def _build(self, s, p, o):
+        """Reconstruir las tres permutaciones a partir de columnas de sujeto, predicado y objeto"""
+        columns = self._unique(self._permute((s, p, o), 'spo'))
+        self._indexes = {'spo': columns}
+        for name in PERMUTATIONS:
+            if name != 'spo':
+                self._indexes[name] = self._permute(columns, name)
+
+    def load_sorted(self, s, p, o, indexes=None):
+        """Usar columnas ya ordenadas por SPO y sin duplicados (p. ej. de un snapshot) sin reordenarlas
+
+        indexes trae otras permutaciones ya ordenadas ({'pos': columnas, ...}); las que falten se
+        ordenan la primera vez que una consulta las necesita. Las columnas pueden ser arreglos NumPy
+        u objetos que solo decodifican las filas que se leen (len, cortes, searchsorted y tolist,
+        como las de rdf_snapshot).
+        """
+        self._pending = [array('q'), array('q'), array('q')]
+        self._indexes = {'spo': (s, p, o), **(indexes or {})}
+
+    def _decode_indexes(self):
+        """Convertir en arreglos NumPy las columnas cargadas sin decodificar, antes de modificarlas"""
+        self._indexes = {name: tuple(np.asarray(column) for column in columns)
+                         for name, columns in self._indexes.items()}
+
+    def _index(self, name):
+        """Columnas de una permutación (se construye la primera vez que se usa)"""
+        columns = self._indexes.get(name)
+        if columns is None:
+            spo = tuple(np.asarray(column) for column in self._indexes['spo'])
+            columns = self._indexes[name] = self._permute(spo, name)
+        return columns
+
+    def _match(self, pattern):
+        """Permutación y rango [inicio, fin) de los triples que cumplen el patrón"""
+        self._flush()
+        ids = []
+        for term in pattern:
+            if term is None:
+                ids.append(None)
+                continue
+            term_id = self.dictionary.lookup(term)
+            if term_id is None:
+                return None, 0, 0
+            ids.append(term_id)
+        name = INDEX_FOR_PATTERN[tuple(term_id is not None for term_id in ids)]
+        columns = self._index(name)
+        start, end = 0, len(columns[0])
+        for column, position in zip(columns, PERMUTATIONS[name]):
+            term_id = ids[position]
+            if term_id is None:
+                break
+            # El valor debe tener el tipo de la columna: si no, NumPy convierte la columna entera
+            key = column.dtype.type(term_id)
+            window = column[start:end]
+            start, end = (start + int(window.searchsorted(key, 'left')),
+                          start + int(window.searchsorted(key, 'right')))
+        return name, start, end
+
+    @staticmethod
+    def _spo_columns(columns, name):
+        """Columnas de una permutación reordenadas a (sujeto, predicado, objeto)"""
+        order = PERMUTATIONS[name]
+        return tuple(columns[order.index(position)] for position in range(3))
+
+    def triples(self, triple_pattern, context=None):
+        """Generador de los triples que cumplen el patrón
+
+        El rango se recorre en tramos de SCAN_ROWS filas: solo un tramo a la vez se convierte en
+        enteros de Python, también al recorrer el grafo entero.
+        """
+        name, start, end = self._match(triple_pattern)
+        if start == end:
+            return
+        decode = self.dictionary.decode
+        columns = self._spo_columns(self._index(name), name)
+        for offset in range(start, end, SCAN_ROWS):
+            stop = min(offset + SCAN_ROWS, end)
+            for s, p, o in zip(*(column[offset:stop].tolist() for column in columns)):
+                yield (decode(s), decode(p), decode(o)), iter(())
+
+    def remove(self, triple_pattern, context=None):
+        """Eliminar los triples que cumplen el patrón
+
+        Quitar filas mantiene ordenada cada permutación: las del resto de índices se localizan con
+        searchsorted en lugar de reordenarlos.
+        """
+        name, start, end = self._match(triple_pattern)
+        if start == end:
+            return
+        self._decode_indexes()
+        matched = self._index(name)
+        if matched[0].dtype != np.uint32:
+            columns = [np.concatenate([column[:start], column[end:]]) for column in matched]
+            self._build(*self._spo_columns(columns, name))
+            return
+        removed = self._spo_columns([column[start:end] for column in matched], name)
+        indexes = {}
+        for other, columns in self._indexes.items():
+            if other == name:
+                rows = np.arange(start, end)
+            else:
+                rows = self._positions(columns, self._permute(removed, other))[0]
+            indexes[other] = tuple(np.delete(column, rows) for column in columns)
+        self._indexes = indexes
+
+    def __len__(self, context=None):
+        """Número de triples distintos"""
+        self._flush()
+        return len(self._indexes['spo'][0])
+
+    def contexts(self, triple=None):
+        """Este store no maneja contextos"""
+        return iter(())
+
+    def nbytes(self):
+        """Bytes ocupados por los índices de identificadores ya construidos (sin el diccionario)"""
+        self._flush()
+        return sum(column.nbytes for columns in self._indexes.values() for column in columns)
+
+    def bind(self, prefix, namespace, override=True):
+        """Asociar un prefijo a un namespace"""
+        bound_namespace = self._namespace.get(prefix)
+        bound_prefix = self._prefix.get(namespace)
+        if bound_prefix is None and bound_namespace is not None:
+            bound_prefix = self._prefix.get(bound_namespace)
+        if override:
+            if bound_prefix is not None:
+                del self._namespace[bound_prefix]
+            if bound_namespace is not None:
+                del self._prefix[bound_namespace]
+            self._prefix[namespace] = prefix
+            self._namespace[prefix] = namespace
+        else:
+            namespace = bound_namespace if bound_namespace is not None else namespace
+            prefix = bound_prefix if bound_prefix is not None else prefix
+            self._prefix[namespace] = prefix
+            self._namespace[prefix] = namespace
+
+    def namespace(self, prefix):
+        """Namespace asociado a un prefijo"""
+        return self._namespace.get(prefix)
+
+    def prefix(self, namespace):
+        """Prefijo asociado a un namespace"""
+        return self._prefix.get(namespace)
+
+    def namespaces(self):
+        """Pares (prefijo, namespace) registrados"""
+        return iter(list(self._namespace.items()))
+
+    def print_stats(self):
+        """Mostrar el tamaño del store"""
+        count = len(self)
+        size = self.nbytes()
+        print("\n=== ALMACÉN DE ENTEROS ===")
+        print(f"Triples: {count}, términos: {len(self.dictionary)}")
+        print(f"Índices SPO/POS/OSP: {size / 1024 / 1024:.1f} MB "
+              f"({size / count if count else 0:.0f} bytes por triple)")
+
+
+plugin.register(STORE_NAME, Store, "int_store", "IntegerStore")
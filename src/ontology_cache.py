@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Caché de Ontología - Proyecto Linked Data Universidades
+Ontología base parseada una sola vez: instancia compartida de solo lectura en el proceso
+y copia serializada con pickle junto al archivo, válida mientras no cambie su contenido
+"""
+
+import os
+import pickle
+import tempfile
+
+from rdflib import Graph
+from rdflib.util import guess_format
+
+from compressed_io import open_compressed, strip_compression, file_digest
+
+# Sufijo de la copia serializada junto al archivo de la ontología
+CACHE_SUFFIX = ".cache.pkl"
+
+# Versión del formato de la copia serializada
+CACHE_VERSION = 1
+
+# Ruta absoluta -> ((tamaño, mtime_ns), ontología): evita recalcular la huella en cada uso
+_shared = {}
+
+
+class CachedOntology:
+    """Triples y prefijos de una ontología, inmutables y compartidos entre grafos"""
+
+    __slots__ = ('digest', 'namespaces', 'triples')
+
+    def __init__(self, digest, namespaces, triples):
+        """Inicializar con la huella del archivo, sus prefijos y sus triples"""
+        self.digest = digest
+        self.namespaces = tuple(namespaces)
+        self.triples = tuple(triples)
+
+    def add_to(self, graph):
+        """Agregar la ontología a un grafo (prefijos y triples)"""
+        for prefix, namespace in self.namespaces:
+            graph.bind(prefix, namespace)
+        graph.addN((s, p, o, graph) for s, p, o in self.triples)
+
+    def __len__(self):
+        """Número de triples"""
+        return len(self.triples)
+
+
+def parse_ontology(path, digest):
+    """Parsear el archivo de la ontología (formato por extensión, Turtle por defecto)"""
+    graph = Graph()
+    with open_compressed(path, "rb") as f:
+        graph.parse(f, format=guess_format(strip_compression(path)) or "turtle")
+    return CachedOntology(digest, graph.namespaces(), graph)
+
+
+def read_cache(cache_path, digest):
+    """Ontología serializada si corresponde a la huella indicada, o None"""
+    try:
+        with open(cache_path, "rb") as f:
+            version, cached = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError, TypeError):
+        return None
+    if version != CACHE_VERSION or cached.digest != digest:
+        return None
+    return cached
+
+
+def write_cache(cache_path, ontology):
+    """Guardar la ontología serializada de forma atómica"""
+    directory = os.path.dirname(os.path.abspath(cache_path))
+    descriptor, temporary = tempfile.mkstemp(prefix=".ontology_", dir=directory)
+    try:
+        with os.fdopen(descriptor, "wb") as f:
+            pickle.dump((CACHE_VERSION, ontology), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, cache_path)
+    finally:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+
+
+def load_ontology(path):
+    """Ontología compartida de un archivo: de memoria, de la copia serializada o parseándolo"""
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    signature = (stat.st_size, stat.st_mtime_ns)
+    shared = _shared.get(path)
+    if shared is not None and shared[0] == signature:
+        return shared[1]
+
+    digest = file_digest(path)
+    cache_path = path + CACHE_SUFFIX
+    ontology = read_cache(cache_path, digest)
+    if ontology is None:
+        ontology = parse_ontology(path, digest)
+        try:
+            write_cache(cache_path, ontology)
+        except OSError as e:
+            # Directorio de solo lectura u otro problema: se sigue sin copia serializada
+            print(f"No se pudo guardar la caché de la ontología: {e}")
+    _shared[path] = (signature, ontology)
+    return ontology
+
+
+def clear_shared():
+    """Vaciar la instancia compartida del proceso (la copia en disco se conserva)"""
+    _shared.clear()
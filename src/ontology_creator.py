@@ -6,13 +6,15 @@ Diseño e implementación de ontología para universidades, estudiantes y patron
 
 from rdflib import Graph, Namespace, RDF, RDFS, OWL, XSD, URIRef, Literal, BNode
 from rdflib.namespace import FOAF, DC, DCTERMS
-import csv
-import pandas as pd
 from datetime import datetime
+from rdf_export import export_graph
 
 class UniversityOntologyCreator:
     """Creador de ontología RDF para el dominio universitario"""
     
+    # Triples del esquema compartidos por todas las instancias del proceso (solo lectura)
+    _schema = None
+    
     def __init__(self):
         """Inicializar namespaces y grafo RDF"""
         self.g = Graph()
@@ -36,7 +38,12 @@ class UniversityOntologyCreator:
         self.g.bind("owl", OWL)
         self.g.bind("rdfs", RDFS)
         
-        self.create_ontology_schema()
+        # El esquema se construye una vez por proceso; las demás instancias lo copian en bloque
+        if UniversityOntologyCreator._schema is None:
+            self.create_ontology_schema()
+            UniversityOntologyCreator._schema = tuple(self.g)
+        else:
+            self.g.addN((s, p, o, self.g) for s, p, o in UniversityOntologyCreator._schema)
     
     def create_ontology_schema(self):
         """Crear el esquema básico de la ontología"""
@@ -258,21 +265,13 @@ class UniversityOntologyCreator:
         
         print(f"Creadas {len(universities_data)} universidades.")
     
-    def save_ontology(self, filename):
-        """Guardar la ontología en diferentes formatos"""
-        # RDF/XML
-        with open(f"/Users/leomos/Downloads/web_semantica/output/{filename}.rdf", "w", encoding="utf-8") as f:
-            f.write(self.g.serialize(format="xml"))
-        
-        # Turtle
-        with open(f"/Users/leomos/Downloads/web_semantica/output/{filename}.ttl", "w", encoding="utf-8") as f:
-            f.write(self.g.serialize(format="turtle"))
-        
-        # N-Triples
-        with open(f"/Users/leomos/Downloads/web_semantica/output/{filename}.nt", "w", encoding="utf-8") as f:
-            f.write(self.g.serialize(format="nt"))
+    def save_ontology(self, filename, formats=("rdf", "ttl", "nt"), compression=""):
+        """Guardar la ontología en los formatos indicados, en paralelo y directamente a archivo"""
+        paths = export_graph(self.g, f"/Users/leomos/Downloads/web_semantica/output/{filename}", formats,
+                             compression=compression)
         
-        print(f"Ontología guardada en formatos RDF/XML, Turtle y N-Triples como {filename}.*")
+        print(f"Ontología guardada en formatos {', '.join(formats)} como {filename}.*")
+        return paths
     
     def print_ontology_stats(self):
         """Mostrar estadísticas de la ontología"""
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Orquestador del Pipeline - Proyecto Linked Data Universidades
+Ejecuta las etapas como un DAG de entradas y salidas declaradas, omitiendo las que no cambiaron
+(huella SHA-256 del contenido) y ejecutando en paralelo las independientes
+"""
+
+import argparse
+import ast
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+from compressed_io import file_digest
+
+# Directorio de datos del proyecto (el mismo que usan los main() de cada etapa)
+BASE_DIR = "/Users/leomos/Downloads/web_semantica"
+
+# Directorio del código fuente: cada etapa depende también de sus módulos
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Estado de la última ejecución: huellas de las entradas de cada etapa
+STATE_FILE = "output/pipeline_state.json"
+
+# Etapa -> módulo cuyo main() ejecuta, entradas y salidas (relativas a BASE_DIR)
+STAGES = {
+    'explorar': {
+        'module': "data_analysis",
+        'inputs': ["ISOFV163_A8_Anexo.csv"],
+        'outputs': ["visualizations/patrones_comportamiento.html",
+                    "visualizations/migracion_academica.html"],
+    },
+    'ontologia': {
+        'module': "ontology_creator",
+        'inputs': [],
+        'outputs': ["output/university_ontology.rdf",
+                    "output/university_ontology.ttl",
+                    "output/university_ontology.nt",
+                    "output/ontology_documentation.md"],
+    },
+    'transformar': {
+        'module': "data_transformer_fixed",
+        'inputs': ["ISOFV163_A8_Anexo.csv",
+                   "output/university_ontology.ttl"],
+        'outputs': ["output/university_linked_data.rdf",
+                    "output/university_linked_data.ttl",
+                    "output/university_linked_data.nt",
+                    "output/university_linked_data.jsonld",
+                    "output/university_linked_data.snap"],
+    },
+    'analizar': {
+        'module': "sparql_analyzer",
+        # El analizador carga el más reciente de los que existan: store SQLite, snapshot o Turtle
+        'inputs': ["output/university_linked_data.sqlite",
+                   "output/university_linked_data.snap",
+                   "output/university_linked_data.ttl"],
+        'outputs': ["output/sparql_analysis_results.json",
+                    "visualizations/sparql_patterns.html",
+                    "visualizations/migracion_sankey.html"],
+    },
+    'visualizar': {
+        'module': "final_visualizations",
+        'inputs': ["output/sparql_analysis_results.json"],
+        'outputs': ["visualizations/network_diagram.png",
+                    "visualizations/comprehensive_dashboard.html",
+                    "visualizations/ontology_diagram.png",
+                    "visualizations/rdf_statistics.png"],
+    },
+}
+
+
+def module_sources(module, seen=None):
+    """Archivos fuente de un módulo y de los módulos locales que importa (recursivamente)"""
+    seen = set() if seen is None else seen
+    path = os.path.join(SRC_DIR, f"{module}.py")
+    if module in seen or not os.path.exists(path):
+        return []
+    seen.add(module)
+    with open(path, "r", encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=path)
+    sources = [path]
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names = [node.module]
+        else:
+            continue
+        for name in names:
+            sources += module_sources(name.split(".")[0], seen)
+    return sources
+
+
+def stage_dependencies(stages):
+    """Etapas de las que depende cada una: las que producen alguna de sus entradas"""
+    producers = {output: name for name, stage in stages.items() for output in stage['outputs']}
+    return {name: sorted({producers[path] for path in stage['inputs'] if path in producers} - {name})
+            for name, stage in stages.items()}
+
+
+def topological_order(dependencies):
+    """Orden de ejecución compatible con las dependencias (error si hay un ciclo)"""
+    order, visiting, done = [], set(), set()
+
+    def visit(name):
+        if name in done:
+            return
+        if name in visiting:
+            raise ValueError(f"Ciclo de dependencias en la etapa '{name}'")
+        visiting.add(name)
+        for dependency in dependencies[name]:
+            visit(dependency)
+        visiting.discard(name)
+        done.add(name)
+        order.append(name)
+
+    for name in dependencies:
+        visit(name)
+    return order
+
+
+class Fingerprints:
+    """Huellas SHA-256 de archivos, recalculadas solo cuando cambian su tamaño o fecha"""
+
+    def __init__(self, cache=None):
+        """Inicializar con la caché {ruta: [tamaño, mtime_ns, sha256]} de la ejecución anterior"""
+        self.cache = dict(cache or {})
+
+    def digest(self, path):
+        """Huella del contenido de un archivo (None si no existe)"""
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            self.cache.pop(path, None)
+            return None
+        cached = self.cache.get(path)
+        if cached and cached[:2] == [stat.st_size, stat.st_mtime_ns]:
+            return cached[2]
+        # La misma huella que usa la caché de consultas para identificar la versión de un archivo
+        digest = file_digest(path)
+        self.cache[path] = [stat.st_size, stat.st_mtime_ns, digest]
+        return digest
+
+
+class Pipeline:
+    """Ejecutor del DAG de etapas con omisión por huella de contenido"""
+
+    def __init__(self, base_dir=BASE_DIR, stages=STAGES, state_file=STATE_FILE):
+        """Inicializar con el directorio de datos, las etapas y el archivo de estado"""
+        self.base_dir = base_dir
+        self.stages = stages
+        self.dependencies = stage_dependencies(stages)
+        self.order = topological_order(self.dependencies)
+        self.state_path = os.path.join(base_dir, state_file)
+        self.state = {'stages': {}, 'files': {}}
+        if os.path.exists(self.state_path):
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                self.state = json.load(f)
+        self.fingerprints = Fingerprints(self.state.get('files'))
+
+    def path(self, relative):
+        """Ruta absoluta de una entrada o salida"""
+        return os.path.join(self.base_dir, relative)
+
+    def input_hashes(self, name):
+        """Huellas actuales de las entradas de una etapa, incluido su código fuente"""
+        stage = self.stages[name]
+        paths = [self.path(p) for p in stage['inputs']] + module_sources(stage['module'])
+        return {path: self.fingerprints.digest(path) for path in paths}
+
+    def reason_to_run(self, name, force=False):
+        """Motivo para ejecutar una etapa, o None si puede omitirse"""
+        if force:
+            return "forzada"
+        missing = [p for p in self.stages[name]['outputs'] if not os.path.exists(self.path(p))]
+        if missing:
+            return f"falta {missing[0]}"
+        previous = self.state['stages'].get(name)
+        if previous is None:
+            return "sin ejecución previa"
+        current = self.input_hashes(name)
+        changed = [path for path, digest in current.items() if previous.get(path) != digest]
+        if changed:
+            return f"cambió {os.path.basename(changed[0])}"
+        return None
+
+    def save_state(self):
+        """Guardar las huellas de forma atómica"""
+        self.state['files'] = self.fingerprints.cache
+        os.makedirs(os.path.dirname(self.state_path), exist_ok=True)
+        temporary = self.state_path + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump(self.state, f, indent=2, ensure_ascii=False)
+        os.replace(temporary, self.state_path)
+
+    def selected(self, only=None):
+        """Etapas a considerar, en orden topológico"""
+        if not only:
+            return list(self.order)
+        unknown = set(only) - set(self.stages)
+        if unknown:
+            raise ValueError(f"Etapas desconocidas: {', '.join(sorted(unknown))}")
+        return [name for name in self.order if name in only]
+
+    def plan(self, only=None, force=False):
+        """Decisión por etapa sin ejecutar nada: una etapa a ejecutar invalida sus dependientes"""
+        decisions = {}
+        for name in self.selected(only):
+            upstream = [d for d in self.dependencies[name] if decisions.get(d)]
+            decisions[name] = (f"depende de '{upstream[0]}'" if upstream
+                               else self.reason_to_run(name, force))
+        return decisions
+
+    def run(self, only=None, force=False, workers=None):
+        """Ejecutar el pipeline; devuelve {etapa: 'ejecutada' | 'omitida' | 'fallida' | 'bloqueada'}"""
+        names = self.selected(only)
+        pending = set(names)
+        status = {}
+        running = {}
+        start = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=workers or len(names) or 1) as pool:
+            while pending or running:
+                # Lanzar (u omitir) las etapas cuyas dependencias ya terminaron
+                for name in [n for n in names if n in pending]:
+                    dependencies = [d for d in self.dependencies[name] if d in names]
+                    if any(d not in status for d in dependencies):
+                        continue
+                    pending.discard(name)
+                    if any(status.get(d) in ("fallida", "bloqueada") for d in dependencies):
+                        status[name] = "bloqueada"
+                        print(f"[pipeline] {name}: bloqueada por un fallo previo")
+                        continue
+                    reason = self.reason_to_run(name, force)
+                    if reason is None:
+                        status[name] = "omitida"
+                        print(f"[pipeline] {name}: sin cambios, se omite")
+                        continue
+                    print(f"[pipeline] {name}: ejecutando ({reason})")
+                    running[pool.submit(_run_stage, SRC_DIR, self.stages[name]['module'])] = (
+                        name, time.perf_counter())
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name, started = running.pop(future)
+                    try:
+                        future.result()
+                    except Exception as error:
+                        status[name] = "fallida"
+                        print(f"[pipeline] {name}: falló ({error!r})")
+                        continue
+                    status[name] = "ejecutada"
+                    # Huellas tomadas al terminar: las salidas de la etapa ya son definitivas
+                    self.state['stages'][name] = self.input_hashes(name)
+                    self.save_state()
+                    print(f"[pipeline] {name}: completada en {time.perf_counter() - started:.1f} s")
+        print(f"[pipeline] Tiempo total: {time.perf_counter() - start:.1f} s")
+        return status
+
+
+def _run_stage(src_dir, module):
+    """Importar el módulo de una etapa y ejecutar su main() (en un proceso trabajador)"""
+    import importlib
+    import sys
+    if src_dir not in sys.path:
+        sys.path.insert(0, src_dir)
+    importlib.import_module(module).main()
+
+
+def main():
+    """Función principal del orquestador"""
+    parser = argparse.ArgumentParser(description="Orquestador del pipeline Linked Data")
+    parser.add_argument("--only", nargs="+", choices=list(STAGES),
+                        help="ejecutar solo estas etapas (por defecto todas)")
+    parser.add_argument("--force", action="store_true",
+                        help="ejecutar las etapas aunque sus entradas no hayan cambiado")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="mostrar qué etapas se ejecutarían sin ejecutarlas")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="etapas independientes ejecutadas a la vez")
+    args = parser.parse_args()
+
+    print("=== PIPELINE LINKED DATA UNIVERSIDADES ===")
+    pipeline = Pipeline()
+    if args.dry_run:
+        for name, reason in pipeline.plan(args.only, args.force).items():
+            print(f"- {name}: {'ejecutar (' + reason + ')' if reason else 'omitir'}")
+        return pipeline
+    status = pipeline.run(args.only, args.force, args.workers)
+    print("\n=== RESUMEN ===")
+    for name, result in status.items():
+        print(f"- {name}: {result}")
+    return pipeline
+
+
+if __name__ == "__main__":
+    pipeline = main()
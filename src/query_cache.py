@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Caché de Resultados SPARQL - Proyecto Linked Data Universidades
+Resultados indexados por texto de consulta normalizado y huella del contenido del grafo,
+con una capa LRU en memoria y otra en disco (un JSON por consulta)
+"""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+from collections import OrderedDict
+
+# Consultas guardadas en la capa en memoria
+MEMORY_ENTRIES = 256
+
+# Versión del formato de las entradas (cambiarla invalida la caché en disco)
+CACHE_VERSION = 1
+
+# Cadenas de SPARQL (su contenido no se normaliza) o espacios fuera de ellas
+QUERY_TOKENS = re.compile(r'("""(?:[^"\\]|\\.|"(?!""))*"""|\'\'\'(?:[^\'\\]|\\.|\'(?!\'\'))*\'\'\''
+                          r'|"(?:[^"\\\n]|\\.)*"|\'(?:[^\'\\\n]|\\.)*\'|\s+)')
+
+# Máscara de la suma de huellas de triples (128 bits)
+FINGERPRINT_MASK = (1 << 128) - 1
+
+
+def normalize_query(query):
+    """Texto de consulta con los espacios colapsados fuera de las cadenas"""
+    parts = QUERY_TOKENS.split(query)
+    return "".join(" " if part.isspace() else part for part in parts if part).strip()
+
+
+def graph_fingerprint(graph):
+    """Huella del contenido de un grafo, independiente del orden de los triples
+
+    Suma (módulo 2^128) de la huella BLAKE2b de cada triple en N-Triples: no necesita
+    ordenar ni guardar el grafo, y cambia al agregar o quitar cualquier triple.
+    """
+    # Importación diferida: solo los grafos recibidos en memoria necesitan recorrerse
+    from rdf_writers import nt_term
+    total = count = 0
+    for s, p, o in graph:
+        line = f"{nt_term(s)} {nt_term(p)} {nt_term(o)}".encode("utf-8")
+        total += int.from_bytes(hashlib.blake2b(line, digest_size=16).digest(), "little")
+        count += 1
+    return f"grafo-{count}-{total & FINGERPRINT_MASK:032x}"
+
+
+class QueryCache:
+    """Caché de resultados SPARQL de dos niveles con contadores de aciertos y fallos"""
+
+    def __init__(self, directory=None, memory_entries=MEMORY_ENTRIES):
+        """Inicializar con el directorio de la capa en disco (None para usar solo memoria)"""
+        self.directory = directory
+        self.memory_entries = memory_entries
+        self.memory = OrderedDict()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(query, fingerprint, bindings=None, limit=None):
+        """Clave de una consulta sobre una versión del grafo (y sus parámetros, si los hay)"""
+        parts = [str(CACHE_VERSION), fingerprint, normalize_query(query)]
+        if bindings:
+            parts.append(json.dumps({str(k): str(v) for k, v in bindings.items()}, sort_keys=True))
+        if limit is not None:
+            parts.append(f"LIMIT {limit}")
+        return hashlib.sha256("\x00".join(parts).encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        """Archivo de una entrada en la capa en disco"""
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def _remember(self, key, value):
+        """Guardar en la capa LRU, descartando la entrada menos usada si está llena"""
+        self.memory[key] = value
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.memory_entries:
+            self.memory.popitem(last=False)
+
+    def get(self, key):
+        """Resultado guardado para la clave, o None (cuenta el acierto o el fallo)"""
+        if key in self.memory:
+            self.memory.move_to_end(key)
+            self.memory_hits += 1
+            return self.memory[key]
+        if self.directory:
+            try:
+                with open(self._path(key), "r", encoding="utf-8") as f:
+                    value = json.load(f)
+            except (OSError, ValueError):
+                value = None
+            if value is not None:
+                self.disk_hits += 1
+                self._remember(key, value)
+                return value
+        self.misses += 1
+        return None
+
+    def put(self, key, value):
+        """Guardar un resultado (serializable a JSON) en ambas capas"""
+        self._remember(key, value)
+        if not self.directory:
+            return
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            descriptor, temporary = tempfile.mkstemp(prefix=".entry_", dir=os.path.dirname(path))
+            with os.fdopen(descriptor, "w", encoding="utf-8") as f:
+                json.dump(value, f, ensure_ascii=False)
+            os.replace(temporary, path)
+        except OSError as e:
+            # Sin capa en disco (directorio de solo lectura, disco lleno): sigue en memoria
+            print(f"No se pudo guardar el resultado en la caché: {e}")
+
+    def clear(self):
+        """Vaciar ambas capas"""
+        self.memory.clear()
+        if self.directory and os.path.isdir(self.directory):
+            for root, _, files in os.walk(self.directory):
+                for name in files:
+                    if name.endswith(".json"):
+                        os.remove(os.path.join(root, name))
+
+    def reset_stats(self):
+        """Poner a cero los contadores (las entradas se conservan)"""
+        self.memory_hits = self.disk_hits = self.misses = 0
+
+    def merge(self, entries, stats):
+        """Incorporar las entradas nuevas y los contadores de otra instancia (p. ej. de un proceso hijo)"""
+        for key, value in entries.items():
+            self._remember(key, value)
+        self.memory_hits += stats['memory_hits']
+        self.disk_hits += stats['disk_hits']
+        self.misses += stats['misses']
+
+    def stats(self):
+        """Contadores de aciertos (por capa) y fallos"""
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            'memory_hits': self.memory_hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'hit_rate': (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+        }
+
+    def print_stats(self):
+        """Mostrar estadísticas de la caché"""
+        stats = self.stats()
+        print("\n=== CACHÉ DE CONSULTAS SPARQL ===")
+        print(f"Aciertos en memoria: {stats['memory_hits']}")
+        print(f"Aciertos en disco: {stats['disk_hits']}")
+        print(f"Fallos: {stats['misses']}")
+        print(f"Tasa de aciertos: {100 * stats['hit_rate']:.1f}%")
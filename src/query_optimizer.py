@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Optimizador de Consultas SPARQL - Proyecto Linked Data Universidades
+Reordena los patrones de cada BGP según estadísticas por predicado del grafo y comprueba cada
+condición de FILTER en cuanto sus variables están enlazadas (gancho CUSTOM_EVALS de rdflib)
+"""
+
+import weakref
+
+import numpy as np
+from rdflib import BNode, Variable
+from rdflib.plugins.sparql import CUSTOM_EVALS
+from rdflib.plugins.sparql.evalutils import _ebv
+from rdflib.plugins.sparql.parserutils import CompValue
+from rdflib.plugins.sparql.sparql import AlreadyBound
+
+from vector_engine import PredicateTables, expression_variables
+
+# Nombre del gancho en CUSTOM_EVALS de rdflib
+CUSTOM_EVAL_NAME = "query_optimizer"
+
+# Fracción de soluciones que se supone que deja pasar cada condición de un FILTER
+FILTER_SELECTIVITY = 1 / 3
+
+# Patrones de un BGP hasta los que se prueban todos los órdenes (más allá, elección voraz)
+EXHAUSTIVE_PATTERNS = 7
+
+# Funciones que evalúan patrones dentro de un FILTER (esas condiciones se dejan para el final)
+PATTERN_FUNCTIONS = ("Builtin_EXISTS", "Builtin_NOTEXISTS")
+
+# Optimizador activo de cada grafo (por id; la entrada desaparece con el optimizador)
+_optimizers = weakref.WeakValueDictionary()
+
+
+def is_variable(term):
+    """Si un término de un patrón es una variable (los nodos en blanco también lo son en SPARQL)"""
+    return isinstance(term, (Variable, BNode))
+
+
+def conjuncts(expr):
+    """Condiciones de un FILTER separadas por && (cada una puede comprobarse por su cuenta)"""
+    if isinstance(expr, CompValue) and expr.name == "ConditionalAndExpression":
+        return [condition for part in [expr.expr] + list(expr.other or [])
+                for condition in conjuncts(part)]
+    return [expr]
+
+
+def uses_patterns(expr):
+    """Si una expresión contiene EXISTS o NOT EXISTS"""
+    if isinstance(expr, CompValue):
+        return expr.name in PATTERN_FUNCTIONS or any(uses_patterns(value) for value in expr.values())
+    if isinstance(expr, (list, tuple)):
+        return any(uses_patterns(value) for value in expr)
+    return False
+
+
+class GraphStatistics:
+    """Triples, sujetos distintos y objetos distintos de cada predicado del grafo"""
+
+    def __init__(self, graph):
+        """Calcular las estadísticas con los arreglos por predicado (los del índice de un IntegerStore)"""
+        tables = PredicateTables(graph)
+        decode = tables.dictionary.decode
+        self.predicates = {
+            decode(predicate): (len(subjects), len(np.unique(subjects)), len(np.unique(objects)))
+            for predicate, (subjects, objects) in tables.tables.items()
+        }
+        if tables.tables:
+            subjects = np.concatenate([s for s, _ in tables.tables.values()])
+            objects = np.concatenate([o for _, o in tables.tables.values()])
+            self.total = (tables.size, len(np.unique(subjects)), len(np.unique(objects)))
+        else:
+            self.total = (0, 1, 1)
+
+    def estimate(self, triple, bound):
+        """Soluciones que produce un patrón por cada solución parcial con las variables de bound"""
+        s, p, o = triple
+        if is_variable(p):
+            count, subjects, objects = self.total
+            if p in bound:
+                count /= max(len(self.predicates), 1)
+        else:
+            count, subjects, objects = self.predicates.get(p, (0, 1, 1))
+        if not is_variable(s) or s in bound:
+            count /= max(subjects, 1)
+        if not is_variable(o) or o in bound:
+            count /= max(objects, 1)
+        return count
+
+
+class QueryOptimizer:
+    """Planes de evaluación de BGP y FILTER según las estadísticas de un grafo"""
+
+    def __init__(self, graph, statistics=None):
+        """Inicializar con el grafo (las estadísticas se calculan ahora: el grafo no debe cambiar)"""
+        self.graph = graph
+        self.statistics = statistics if statistics is not None else GraphStatistics(graph)
+        self.plans = {}
+
+    def enable(self):
+        """Usar el optimizador en las consultas sobre el grafo (registra el gancho de rdflib)"""
+        _optimizers[id(self.graph)] = self
+        CUSTOM_EVALS[CUSTOM_EVAL_NAME] = evaluate_part
+        return self
+
+    def disable(self):
+        """Volver a la evaluación de rdflib para el grafo"""
+        if _optimizers.get(id(self.graph)) is self:
+            del _optimizers[id(self.graph)]
+
+    def order(self, triples, bound, conditions=()):
+        """Pasos de evaluación: cada patrón con las condiciones que se comprueban al enlazarlo
+
+        Coste de un orden: soluciones parciales estimadas que entran y salen de cada paso (cada
+        condición descuenta su selectividad en el primer paso que enlaza todas sus variables).
+        Solo se siguen patrones que comparten variables con las ya enlazadas; con más de
+        EXHAUSTIVE_PATTERNS patrones se toma en cada paso el de menos soluciones.
+        """
+        triples = list(triples)
+        exhaustive = len(triples) <= EXHAUSTIVE_PATTERNS
+        # Condiciones con EXISTS o con variables que el BGP no enlaza: tras el último patrón
+        waiting = [(expr, None if uses_patterns(expr) else expression_variables(expr))
+                   for expr in conditions]
+        best = [None, float("inf")]
+
+        def search(pending, bound, waiting, rows, cost, steps):
+            if cost >= best[1]:
+                return
+            if not pending:
+                best[:] = [steps, cost]
+                return
+            connected = [i for i in pending if bound.intersection(triples[i])] or pending
+            options = []
+            for i in connected:
+                known = bound | {term for term in triples[i] if is_variable(term)}
+                ready = [expr for expr, variables in waiting if variables is not None and variables <= known]
+                solutions = self.statistics.estimate(triples[i], bound) * FILTER_SELECTIVITY ** len(ready)
+                options.append((rows * solutions, i, known, ready))
+            if not exhaustive:
+                options = [min(options, key=lambda option: option[0])]
+            for out, i, known, ready in options:
+                rest = [(expr, variables) for expr, variables in waiting
+                        if variables is None or not variables <= known]
+                search([j for j in pending if j != i], known, rest, out, cost + rows + out,
+                       steps + [(triples[i], ready, rest)])
+
+        search(list(range(len(triples))), set(bound), waiting, 1, 0, [])
+        steps = [(triple, ready) for triple, ready, _ in best[0]]
+        steps[-1][1].extend(expr for expr, _ in best[0][-1][2])
+        return steps
+
+    def plan(self, part, triples, bound, conditions=()):
+        """Pasos de una parte del álgebra para las variables ya enlazadas (se calculan una vez)"""
+        key = (id(part), bound)
+        cached = self.plans.get(key)
+        if cached is None or cached[0] is not part:
+            cached = (part, self.order(triples, bound, conditions))
+            self.plans[key] = cached
+        return cached[1]
+
+
+def evaluate_steps(ctx, steps, scope=None, index=0):
+    """Soluciones de los pasos desde index (como evalBGP de rdflib, con las condiciones de cada paso)"""
+    (s, p, o), conditions = steps[index]
+    _s, _p, _o = ctx[s], ctx[p], ctx[o]
+    last = index + 1 == len(steps)
+    for ss, sp, so in ctx.graph.triples((_s, _p, _o)):
+        c = ctx.push() if None in (_s, _p, _o) else ctx
+        try:
+            if _s is None:
+                c[s] = ss
+            if _p is None:
+                c[p] = sp
+            if _o is None:
+                c[o] = so
+        except AlreadyBound:
+            continue
+        if conditions:
+            # Mismo ámbito que evalFilter: sin las variables enlazadas fuera del grupo
+            solution = c.solution()
+            if scope is not None:
+                solution = solution.forget(*scope)
+            if not all(_ebv(expr, solution) for expr in conditions):
+                continue
+        if last:
+            yield c.solution()
+        else:
+            yield from evaluate_steps(c, steps, scope, index + 1)
+
+
+def evaluate_part(ctx, part):
+    """Gancho de CUSTOM_EVALS: BGP y FILTER sobre un BGP de un grafo con optimizador activo"""
+    optimizer = _optimizers.get(id(ctx.graph))
+    if optimizer is None or optimizer.graph is not ctx.graph:
+        raise NotImplementedError
+    scope = None
+    if part.name == "BGP" and part.triples:
+        triples, conditions = part.triples, []
+    elif part.name == "Filter" and part.p.name == "BGP" and part.p.triples:
+        triples, conditions = part.p.triples, conjuncts(part.expr)
+        if not part.no_isolated_scope:
+            scope = (ctx, part._vars)
+    else:
+        raise NotImplementedError
+    variables = {term for triple in triples for term in triple if is_variable(term)}
+    variables.update(*(expression_variables(expr) for expr in conditions))
+    bound = frozenset(variable for variable in variables if ctx[variable] is not None)
+    return evaluate_steps(ctx, optimizer.plan(part, triples, bound, conditions), scope)
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Exportación RDF Multiformato - Proyecto Linked Data Universidades
+Serialización en streaming a archivo de varios formatos a la vez, cada uno en su propio proceso
+"""
+
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from rdf_snapshot import write_snapshot
+from rdf_writers import TurtleWriter, RDFXMLWriter, NDJSONLDWriter
+from sqlite_store import SQLiteStore
+from int_store import IntegerStore
+from compressed_io import open_compressed, strip_compression, COMPRESSION_EXTENSIONS
+
+# Extensión de archivo -> formato de serialización de rdflib
+RDFLIB_FORMATS = {
+    'nt': "nt",
+    'jsonld': "json-ld",
+}
+
+# Extensión de archivo -> escritor en streaming agrupado por sujeto (rdf_writers)
+STREAMING_WRITERS = {
+    'rdf': RDFXMLWriter,
+    'ttl': TurtleWriter,
+}
+
+# Formatos exportados por defecto
+DEFAULT_FORMATS = ('rdf', 'ttl', 'nt', 'jsonld', 'snap')
+
+# Formatos que se pueden exportar (NDJSON solo si se pide)
+EXPORT_FORMATS = DEFAULT_FORMATS + ('ndjson',)
+
+# Sufijo del @context externo que acompaña a cada exportación NDJSON
+CONTEXT_SUFFIX = ".context.jsonld"
+
+# Nombre legible de cada formato
+FORMAT_NAMES = {
+    'rdf': "RDF/XML",
+    'ttl': "Turtle",
+    'nt': "N-Triples",
+    'jsonld': "JSON-LD",
+    'snap': "snapshot binario",
+    'ndjson': "NDJSON, un objeto JSON-LD por entidad",
+}
+
+# Grafo heredado por los procesos de exportación (se comparte vía fork, sin serializarlo)
+_export_graph = None
+
+
+def subject_grouped_triples(graph):
+    """Triples del grafo con los de cada sujeto contiguos, en una sola pasada"""
+    if isinstance(graph.store, (IntegerStore, SQLiteStore)):
+        # Estos stores ya recorren los triples en orden SPO
+        return iter(graph)
+    # El store Memory recorre en el orden de sus índices, sin agrupar por sujeto: repartir
+    # los triples por sujeto en un diccionario
+    by_subject = {}
+    for triple in graph:
+        by_subject.setdefault(triple[0], []).append(triple)
+    return (triple for triples in by_subject.values() for triple in triples)
+
+
+def context_path(path):
+    """Ruta del @context externo de una exportación NDJSON (sin comprimir)"""
+    return os.path.splitext(strip_compression(path))[0] + CONTEXT_SUFFIX
+
+
+def write_ndjson(graph, path):
+    """Escribir una línea JSON-LD por sujeto y, al lado, el @context que todas comparten"""
+    context = context_path(path)
+    with open_compressed(path, "w") as f:
+        writer = NDJSONLDWriter(f, graph.namespaces(), context_url=os.path.basename(context))
+        writer.write_triples(subject_grouped_triples(graph))
+        writer.close()
+    with open(context, "w", encoding="utf-8") as f:
+        json.dump(writer.context(), f, indent=2, ensure_ascii=False)
+    return path
+
+
+def write_format(graph, extension, path):
+    """Escribir un grafo en el formato de la extensión, directamente sobre el archivo"""
+    if extension == 'snap':
+        write_snapshot(graph, path)
+        return path
+    if extension == 'ndjson':
+        return write_ndjson(graph, path)
+    if extension in STREAMING_WRITERS:
+        with open_compressed(path, "w") as f:
+            writer = STREAMING_WRITERS[extension](f, graph.namespaces())
+            writer.write_triples(subject_grouped_triples(graph))
+            writer.close()
+        return path
+    with open_compressed(path, "wb") as f:
+        graph.serialize(destination=f, format=RDFLIB_FORMATS[extension], encoding="utf-8")
+    return path
+
+
+def _write_shared(extension, path):
+    """Escribir el grafo heredado del proceso padre (ejecutado en un proceso trabajador)"""
+    return write_format(_export_graph, extension, path)
+
+
+def export_graph(graph, base_path, formats=DEFAULT_FORMATS, parallel=True, compression=""):
+    """Exportar un grafo como base_path.<extensión> para cada formato; devuelve las rutas
+
+    compression ("gz", "bz2" o "xz") comprime cada archivo salvo el snapshot, que se abre con mmap.
+    """
+    global _export_graph
+    unknown = set(formats) - set(EXPORT_FORMATS)
+    if unknown:
+        raise ValueError(f"Formatos no soportados: {', '.join(sorted(unknown))}")
+    if compression and not compression.startswith("."):
+        compression = "." + compression
+    if compression and compression not in COMPRESSION_EXTENSIONS:
+        raise ValueError(f"Compresión no soportada: {compression}")
+    targets = [(extension, f"{base_path}.{extension}{'' if extension == 'snap' else compression}")
+               for extension in formats]
+
+    # Los procesos heredan el grafo con fork; una conexión SQLite no puede cruzar un fork
+    can_fork = "fork" in multiprocessing.get_all_start_methods()
+    if not parallel or len(targets) < 2 or not can_fork or isinstance(graph.store, SQLiteStore):
+        return [write_format(graph, extension, path) for extension, path in targets]
+
+    # Consolidar escrituras pendientes del store antes de duplicar el proceso
+    len(graph)
+    _export_graph = graph
+    try:
+        with ProcessPoolExecutor(max_workers=len(targets),
+                                 mp_context=multiprocessing.get_context("fork")) as pool:
+            return list(pool.map(_write_shared, *zip(*targets)))
+    finally:
+        _export_graph = None
@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+"""
+Snapshot Binario RDF - Proyecto Linked Data Universidades
+Formato compacto tipo HDT: diccionario de términos con front coding y permutaciones SPO/POS/OSP con bits
+empaquetados, consultado mediante mmap desde IntegerStore sin decodificar más que las filas que se leen
+"""
+
+import json
+import mmap
+import struct
+from array import array
+from functools import lru_cache
+
+import numpy as np
+from rdflib import URIRef, Literal, BNode
+
+from int_store import PERMUTATIONS, IntegerStore, TermDictionary
+
+# Extensión de los archivos de snapshot
+SNAPSHOT_EXTENSION = ".snap"
+
+MAGIC = b"ULDSNAP1"
+
+# Términos por bloque del diccionario: el primero completo, el resto como prefijo compartido + sufijo
+BLOCK_SIZE = 16
+
+# Valores procesados por vez al empaquetar y desempaquetar bits (múltiplo de 8)
+BIT_CHUNK = 1 << 20
+
+# Separador entre valor, idioma y datatype en la clave de un literal
+SEPARATOR = "\x00"
+
+
+def term_key(term):
+    """Clave binaria de un término; el diccionario se ordena por estas claves"""
+    if isinstance(term, Literal):
+        key = f"L{term}{SEPARATOR}{term.language or ''}{SEPARATOR}{term.datatype or ''}"
+    elif isinstance(term, BNode):
+        key = f"B{term}"
+    else:
+        key = f"U{term}"
+    return key.encode("utf-8")
+
+
+def key_term(key):
+    """Término RDF a partir de su clave (conserva la forma léxica de los literales)"""
+    text = key.decode("utf-8")
+    kind, text = text[0], text[1:]
+    if kind == "L":
+        value, lang, datatype = text.rsplit(SEPARATOR, 2)
+        return Literal(value, lang=lang or None, datatype=URIRef(datatype) if datatype else None,
+                       normalize=False)
+    if kind == "B":
+        return BNode(text)
+    return URIRef(text)
+
+
+def encode_varint(value):
+    """Entero no negativo en formato varint (7 bits por byte)"""
+    out = bytearray()
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def decode_varint(buffer, position):
+    """Leer un varint; devuelve (valor, posición siguiente)"""
+    value = shift = 0
+    while True:
+        byte = buffer[position]
+        position += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, position
+        shift += 7
+
+
+def shared_prefix(a, b):
+    """Longitud del prefijo común de dos claves"""
+    limit = min(len(a), len(b))
+    i = 0
+    while i < limit and a[i] == b[i]:
+        i += 1
+    return i
+
+
+def front_code(keys):
+    """Codificar claves ordenadas en bloques; devuelve (bytes, desplazamiento de cada bloque)"""
+    data = bytearray()
+    offsets = []
+    for i, key in enumerate(keys):
+        if i % BLOCK_SIZE == 0:
+            offsets.append(len(data))
+            data += encode_varint(len(key)) + key
+        else:
+            shared = shared_prefix(previous, key)
+            data += encode_varint(shared) + encode_varint(len(key) - shared) + key[shared:]
+        previous = key
+    return bytes(data), np.array(offsets, dtype=np.uint64)
+
+
+def packed_size(count, width):
+    """Bytes que ocupan `count` enteros de `width` bits empaquetados"""
+    return (count * width + 7) // 8
+
+
+def pack_bits(values, width):
+    """Empaquetar enteros no negativos usando `width` bits cada uno (genera los bytes por tramos)"""
+    shifts = np.arange(width - 1, -1, -1, dtype=np.uint64)
+    for start in range(0, len(values), BIT_CHUNK):
+        chunk = values[start:start + BIT_CHUNK].astype(np.uint64)
+        bits = ((chunk[:, None] >> shifts) & 1).astype(np.uint8)
+        yield np.packbits(bits.ravel()).tobytes()
+
+
+def unpack_bits(buffer, start, stop, width, dtype):
+    """Desempaquetar los enteros [start, stop) de `width` bits, por tramos de BIT_CHUNK"""
+    values = np.empty(stop - start, dtype=dtype)
+    for first in range(start, stop, BIT_CHUNK):
+        last = min(first + BIT_CHUNK, stop)
+        bit, end_bit = first * width, last * width
+        raw = np.frombuffer(buffer, dtype=np.uint8, count=(end_bit + 7) // 8 - bit // 8,
+                            offset=bit // 8)
+        skip = bit % 8
+        bits = np.unpackbits(raw)[skip:skip + end_bit - bit].reshape(-1, width)
+        chunk = np.zeros(last - first, dtype=np.uint64)
+        for j in range(width):
+            chunk = (chunk << np.uint64(1)) | bits[:, j]
+        values[first - start:last - start] = chunk
+    return values
+
+
+class PackedColumn:
+    """Columna de identificadores con bits empaquetados que se lee del mmap solo donde se consulta
+
+    Ofrece lo que IntegerStore usa de sus columnas: len, cortes (otra vista, sin decodificar),
+    searchsorted por búsqueda binaria leyendo valores sueltos, tolist y conversión a arreglo NumPy.
+    """
+
+    def __init__(self, buffer, width, dtype, start, stop):
+        """Inicializar con la sección del snapshot y el rango de filas [start, stop) de la vista"""
+        self.buffer = buffer
+        self.width = width
+        self.dtype = np.dtype(dtype)
+        self.start = start
+        self.stop = stop
+        self.mask = (1 << width) - 1
+
+    @property
+    def nbytes(self):
+        """Bytes empaquetados de las filas de la vista"""
+        return packed_size(len(self), self.width)
+
+    def __len__(self):
+        """Número de filas de la vista"""
+        return self.stop - self.start
+
+    def value(self, row):
+        """Valor de una fila de la sección (posición absoluta)"""
+        bit = row * self.width
+        first, last = bit // 8, (bit + self.width + 7) // 8
+        return (int.from_bytes(self.buffer[first:last], "big") >> (last * 8 - bit - self.width)) & self.mask
+
+    def __getitem__(self, index):
+        """Vista de un rango de filas (sin decodificarlo) o el valor de una fila"""
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                raise ValueError("Solo se admiten cortes contiguos")
+            return PackedColumn(self.buffer, self.width, self.dtype,
+                                self.start + start, self.start + max(start, stop))
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return self.dtype.type(self.value(self.start + index))
+
+    def searchsorted(self, key, side="left"):
+        """Posición (relativa a la vista) donde insertar key manteniendo el orden"""
+        key = int(key)
+        low, high = self.start, self.stop
+        while low < high:
+            middle = (low + high) // 2
+            value = self.value(middle)
+            if value < key or (side == "right" and value == key):
+                low = middle + 1
+            else:
+                high = middle
+        return low - self.start
+
+    def __array__(self, dtype=None, copy=None):
+        """Filas de la vista decodificadas en un arreglo NumPy"""
+        values = unpack_bits(self.buffer, self.start, self.stop, self.width, self.dtype)
+        return values if dtype is None else values.astype(dtype, copy=False)
+
+    def tolist(self):
+        """Filas de la vista como enteros de Python"""
+        return np.asarray(self).tolist()
+
+
+class SnapshotDictionary:
+    """Diccionario de términos de solo lectura sobre los bloques con front coding de un snapshot"""
+
+    def __init__(self, data, offsets, count, cache_size=1 << 16):
+        """Inicializar con los bytes del diccionario, el desplazamiento de cada bloque y el total"""
+        self.data = data
+        self.offsets = offsets
+        self.count = count
+        self.decode = lru_cache(maxsize=cache_size)(self._decode)
+        self.lookup = lru_cache(maxsize=cache_size)(self._lookup)
+
+    def _block(self, block):
+        """Claves de un bloque completo"""
+        data = self.data
+        position = int(self.offsets[block])
+        length, position = decode_varint(data, position)
+        key = bytes(data[position:position + length])
+        position += length
+        keys = [key]
+        last = min(BLOCK_SIZE, self.count - block * BLOCK_SIZE)
+        while len(keys) < last:
+            shared, position = decode_varint(data, position)
+            length, position = decode_varint(data, position)
+            key = key[:shared] + bytes(data[position:position + length])
+            position += length
+            keys.append(key)
+        return keys
+
+    def _first(self, block):
+        """Primera clave de un bloque (almacenada completa)"""
+        length, position = decode_varint(self.data, int(self.offsets[block]))
+        return bytes(self.data[position:position + length])
+
+    def _decode(self, term_id):
+        """Término correspondiente a un identificador"""
+        block, index = divmod(term_id, BLOCK_SIZE)
+        return key_term(self._block(block)[index])
+
+    def _lookup(self, term):
+        """Identificador de un término (None si no existe), por búsqueda binaria entre bloques"""
+        key = term_key(term)
+        low, high = 0, len(self.offsets) - 1
+        while low < high:
+            middle = (low + high + 1) // 2
+            if self._first(middle) <= key:
+                low = middle
+            else:
+                high = middle - 1
+        keys = self._block(low) if len(self.offsets) else []
+        for index, candidate in enumerate(keys):
+            if candidate == key:
+                return low * BLOCK_SIZE + index
+        return None
+
+    def encode(self, term):
+        """Identificador de un término existente (el snapshot es de solo lectura)"""
+        term_id = self.lookup(term)
+        if term_id is None:
+            raise ValueError(f"Snapshot de solo lectura: término desconocido {term!r}")
+        return term_id
+
+    def __len__(self):
+        """Número de términos distintos"""
+        return self.count
+
+
+def encoded_triples(graph):
+    """Términos y columnas (sujeto, predicado, objeto) de identificadores enteros de un grafo
+
+    Un IntegerStore ya tiene los identificadores: se usan sus columnas sin recorrer los triples.
+    Cualquier otro grafo se recorre una vez guardando solo tres enteros por triple.
+    """
+    store = graph.store
+    if isinstance(store, IntegerStore) and isinstance(store.dictionary, TermDictionary):
+        store._flush()
+        return store.dictionary.terms, [np.asarray(column) for column in store._indexes['spo']]
+    dictionary = TermDictionary()
+    encode = dictionary.encode
+    columns = (array('q'), array('q'), array('q'))
+    for triple in graph:
+        for column, term in zip(columns, triple):
+            column.append(encode(term))
+    return dictionary.terms, [np.frombuffer(column, dtype=np.int64) for column in columns]
+
+
+def write_snapshot(graph, path):
+    """Guardar un grafo como snapshot binario; devuelve el número de triples
+
+    Los identificadores del snapshot siguen el orden de las claves del diccionario; cada
+    permutación (SPO, POS y OSP) se ordena y se escribe empaquetada por tramos.
+    """
+    terms, columns = encoded_triples(graph)
+    # Solo los términos que aparecen en algún triple, renumerados por orden de clave
+    used = np.zeros(len(terms), dtype=bool)
+    for column in columns:
+        used[column] = True
+    used = np.flatnonzero(used)
+    keys = [term_key(terms[term_id]) for term_id in used.tolist()]
+    order = sorted(range(len(keys)), key=keys.__getitem__)
+    keys = [keys[index] for index in order]
+    dtype = np.uint32 if len(keys) < 2 ** 32 else np.uint64
+    remap = np.zeros(len(terms), dtype=dtype)
+    remap[used[order]] = np.arange(len(keys), dtype=dtype)
+    spo = [remap[column] for column in columns]
+    del columns, remap
+    count = len(spo[0])
+    width = max(1, int(len(keys) - 1).bit_length())
+
+    dictionary, offsets = front_code(keys)
+    del keys
+    sizes = [len(offsets) * 8, len(dictionary)] + [packed_size(count, width)] * 3 * len(PERMUTATIONS)
+    header = {
+        'terms': len(used),
+        'triples': count,
+        'width': width,
+        'block_size': BLOCK_SIZE,
+        'blocks': len(offsets),
+        'permutations': list(PERMUTATIONS),
+        'sections': sizes,
+        'namespaces': {prefix: str(uri) for prefix, uri in graph.namespaces()},
+    }
+    encoded = json.dumps(header, ensure_ascii=False).encode("utf-8")
+    with open(path, "wb") as f:
+        f.write(MAGIC + struct.pack("<I", len(encoded)) + encoded)
+        position = len(MAGIC) + 4 + len(encoded)
+
+        def section(chunks):
+            # Alinear las secciones a 8 bytes para leerlas con NumPy directamente del mmap
+            nonlocal position
+            padding = -position % 8
+            f.write(b"\0" * padding)
+            position += padding
+            for chunk in chunks:
+                f.write(chunk)
+                position += len(chunk)
+
+        section([offsets.tobytes()])
+        section([dictionary])
+        for name, positions in PERMUTATIONS.items():
+            permutation = [spo[index] for index in positions]
+            sort = np.lexsort(permutation[::-1])
+            for column in permutation:
+                section(pack_bits(column[sort], width))
+            del sort
+    return count
+
+
+def load_snapshot(path):
+    """Abrir un snapshot con mmap como IntegerStore de solo lectura, consultado sobre el mapeo
+
+    Diccionario y permutaciones se leen del mmap: cada consulta decodifica solo los términos y
+    las filas que toca.
+    """
+    with open(path, "rb") as f:
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if data[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"{path} no es un snapshot RDF")
+    header_size = struct.unpack_from("<I", data, len(MAGIC))[0]
+    position = len(MAGIC) + 4
+    header = json.loads(bytes(data[position:position + header_size]).decode("utf-8"))
+    if header['block_size'] != BLOCK_SIZE:
+        raise ValueError(f"Tamaño de bloque no soportado: {header['block_size']}")
+    position += header_size
+    sections = []
+    for size in header['sections']:
+        position += -position % 8
+        sections.append(memoryview(data)[position:position + size])
+        position += size
+    offsets = np.frombuffer(sections[0], dtype=np.uint64)
+
+    store = IntegerStore()
+    store.dictionary = SnapshotDictionary(sections[1], offsets, header['terms'])
+    dtype = np.uint32 if header['terms'] < 2 ** 32 else np.int64
+    count, width = header['triples'], header['width']
+    columns = [PackedColumn(section, width, dtype, 0, count) for section in sections[2:]]
+    # Cada permutación se guarda ordenada y sin duplicados: se consulta tal cual, sin reordenar
+    # (los snapshots con solo SPO construyen POS y OSP al primer uso)
+    indexes = {name: tuple(columns[3 * index:3 * index + 3])
+               for index, name in enumerate(header.get('permutations', ['spo']))}
+    store.load_sorted(*indexes.pop('spo'), indexes=indexes)
+    for prefix, uri in header['namespaces'].items():
+        store.bind(prefix, URIRef(uri))
+    return store
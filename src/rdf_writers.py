@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+Escritores RDF en Streaming - Proyecto Linked Data Universidades
+Serialización incremental de triples a N-Triples, Turtle y RDF/XML sin construir un grafo en memoria
+"""
+
+import json
+import re
+from functools import lru_cache
+from xml.sax.saxutils import escape, quoteattr
+
+import numpy as np
+from rdflib import Literal, BNode, RDF, XSD
+from rdflib.namespace import split_uri
+
+# Nombre local válido para un nombre con prefijo de Turtle (subconjunto ASCII de PN_LOCAL)
+TURTLE_LOCAL = re.compile(r'^[A-Za-z0-9_](?:[A-Za-z0-9_.-]*[A-Za-z0-9_-])?$')
+
+# Prefijo válido en Turtle y como nombre XML (NCName ASCII)
+PREFIX_NAME = re.compile(r'^[A-Za-z][A-Za-z0-9_-]*$')
+
+# Prefijo declarado en línea para predicados cuyo namespace no tiene prefijo en RDF/XML
+INLINE_PREFIX = "j.0"
+
+# Datatypes cuyo valor se escribe como número o booleano nativo de JSON si su forma léxica es canónica
+NATIVE_JSON_TYPES = {str(XSD.integer): int, str(XSD.boolean): bool}
+
+
+def quote_literal(term):
+    """Forma léxica de un literal entre comillas, con el escape de N-Triples (válido en Turtle)"""
+    return '"%s"' % term.replace("\\", "\\\\").replace("\n", "\\n").replace(
+        '"', '\\"').replace("\r", "\\r")
+
+
+def nt_term(term):
+    """Serializar un término RDF en sintaxis N-Triples (mismo escape que rdflib)"""
+    if isinstance(term, Literal):
+        encoded = quote_literal(term)
+        if term.language:
+            return f"{encoded}@{term.language}"
+        if term.datatype:
+            return f"{encoded}^^<{term.datatype}>"
+        return encoded
+    if isinstance(term, BNode):
+        return f"_:{term}"
+    return f"<{term}>"
+
+
+class NTriplesWriter:
+    """Escritor incremental de N-Triples sobre un archivo de texto abierto"""
+
+    def __init__(self, stream, cache_size=65536):
+        """Inicializar con el archivo destino y el tamaño de la caché de términos"""
+        self.stream = stream
+        self.count = 0
+        # Caché acotada: los términos repetidos (clases, predicados, ciudades) se formatean una vez
+        self.term = lru_cache(maxsize=cache_size)(nt_term)
+        # Líneas ya escritas de entidades compartidas (crece con su cardinalidad, no con el CSV)
+        self.seen = set()
+
+    def line(self, triple):
+        """Formatear un triple como línea N-Triples"""
+        s, p, o = triple
+        return f"{self.term(s)} {self.term(p)} {self.term(o)} .\n"
+
+    def write_triples(self, triples):
+        """Escribir una secuencia de triples"""
+        for triple in triples:
+            self.stream.write(self.line(triple))
+            self.count += 1
+
+    def column_lines(self, subjects, predicate, objects):
+        """Líneas de una columna de triples; cadena vacía donde falta el sujeto o el objeto"""
+        # pandas solo se necesita en el modo vectorizado (no al exportar ni al cargar)
+        import pandas as pd
+        
+        lines = np.full(len(subjects), "", dtype=object)
+        if isinstance(objects, np.ndarray):
+            mask = pd.notna(subjects) & pd.notna(objects)
+            pairs = zip(subjects[mask], objects[mask])
+        else:
+            mask = pd.notna(subjects)
+            pairs = ((s, objects) for s in subjects[mask])
+        p = self.term(predicate)
+        lines[mask] = [f"{self.term(s)} {p} {self.term(o)} .\n" for s, o in pairs]
+        return lines
+
+    def write_rows(self, columns):
+        """Escribir columnas alineadas por fila, agrupando los triples de cada fila"""
+        matrix = np.column_stack([self.column_lines(*column) for column in columns])
+        self.stream.write("".join(matrix.ravel()))
+        self.count += int(np.count_nonzero(matrix != ""))
+
+    def write_once(self, lines):
+        """Escribir solo las líneas que no se hayan escrito antes"""
+        for line in lines:
+            if line and line not in self.seen:
+                self.seen.add(line)
+                self.stream.write(line)
+                self.count += 1
+
+    def write_columns_once(self, columns):
+        """Escribir columnas de entidades compartidas sin repetir triples"""
+        for column in columns:
+            self.write_once(self.column_lines(*column))
+
+    def write_triples_once(self, triples):
+        """Escribir triples de entidades compartidas sin repetirlos"""
+        self.write_once(self.line(triple) for triple in triples)
+
+
+def prefix_map(namespaces):
+    """Namespaces utilizables (namespace -> prefijo), del más largo al más corto"""
+    usable = [(str(namespace), prefix) for prefix, namespace in namespaces
+              if PREFIX_NAME.match(prefix)]
+    return dict(sorted(usable, key=lambda item: -len(item[0])))
+
+
+class TurtleWriter:
+    """Escritor Turtle en una sola pasada que agrupa triples consecutivos del mismo sujeto
+
+    Los triples de un mismo sujeto deben llegar contiguos para quedar agrupados; si no,
+    el sujeto se repite en otra sentencia (Turtle válido, mismo grafo). Los @prefix de los
+    namespaces disponibles se escriben como cabecera; las URIs de otros namespaces van completas.
+    """
+
+    def __init__(self, stream, namespaces=(), cache_size=65536):
+        """Inicializar con el archivo destino y los pares (prefijo, namespace) disponibles"""
+        self.stream = stream
+        self.prefixes = prefix_map(namespaces)
+        self.subject = None
+        self.predicate = None
+        self.count = 0
+        self.term = lru_cache(maxsize=cache_size)(self._term)
+        for namespace, prefix in sorted(self.prefixes.items(), key=lambda item: item[1]):
+            stream.write(f"@prefix {prefix}: <{namespace}> .\n")
+
+    def _qname(self, uri):
+        """Nombre con prefijo de una URI, o None"""
+        for namespace, prefix in self.prefixes.items():
+            if uri.startswith(namespace) and TURTLE_LOCAL.match(uri[len(namespace):]):
+                return f"{prefix}:{uri[len(namespace):]}"
+        return None
+
+    def _term(self, term):
+        """Texto Turtle de un término"""
+        if isinstance(term, Literal):
+            encoded = quote_literal(term)
+            if term.language:
+                return f"{encoded}@{term.language}"
+            if term.datatype:
+                qname = self._qname(str(term.datatype))
+                return f"{encoded}^^{qname or f'<{term.datatype}>'}"
+            return encoded
+        if isinstance(term, BNode):
+            return f"_:{term}"
+        return self._qname(str(term)) or f"<{term}>"
+
+    def write(self, triple):
+        """Escribir un triple, continuando la sentencia del sujeto y predicado anteriores"""
+        s, p, o = triple
+        predicate = "a" if p == RDF.type else self.term(p)
+        obj = self.term(o)
+        if s == self.subject:
+            if p == self.predicate:
+                self.stream.write(f" ,\n        {obj}")
+            else:
+                self.stream.write(f" ;\n    {predicate} {obj}")
+        else:
+            if self.subject is not None:
+                self.stream.write(" .\n")
+            self.stream.write(f"\n{self.term(s)} {predicate} {obj}")
+        self.subject, self.predicate = s, p
+        self.count += 1
+
+    def write_triples(self, triples):
+        """Escribir una secuencia de triples"""
+        for triple in triples:
+            self.write(triple)
+
+    def close(self):
+        """Cerrar la última sentencia"""
+        if self.subject is not None:
+            self.stream.write(" .\n")
+            self.subject = self.predicate = None
+
+
+class RDFXMLWriter:
+    """Escritor RDF/XML en una sola pasada con un rdf:Description por grupo de triples del mismo sujeto"""
+
+    def __init__(self, stream, namespaces=(), cache_size=65536):
+        """Inicializar con el archivo destino y los pares (prefijo, namespace) disponibles"""
+        self.stream = stream
+        self.prefixes = prefix_map(namespaces)
+        self.prefixes[str(RDF)] = "rdf"
+        self.subject = None
+        self.count = 0
+        self.element = lru_cache(maxsize=cache_size)(self._element)
+        declarations = "".join(f"\n   xmlns:{prefix}={quoteattr(namespace)}"
+                               for namespace, prefix in sorted(self.prefixes.items(),
+                                                               key=lambda item: item[1]))
+        stream.write(f'<?xml version="1.0" encoding="utf-8"?>\n<rdf:RDF{declarations}\n>\n')
+
+    def _element(self, predicate):
+        """Nombre del elemento de un predicado y la declaración xmlns en línea que necesite"""
+        namespace, local = split_uri(predicate)
+        prefix = self.prefixes.get(namespace)
+        if prefix is not None:
+            return f"{prefix}:{local}", ""
+        return f"{INLINE_PREFIX}:{local}", f" xmlns:{INLINE_PREFIX}={quoteattr(namespace)}"
+
+    @staticmethod
+    def _node(term, attribute):
+        """Atributo que identifica un recurso (URI o nodo en blanco)"""
+        if isinstance(term, BNode):
+            return f"rdf:nodeID={quoteattr(str(term))}"
+        return f"rdf:{attribute}={quoteattr(str(term))}"
+
+    def write(self, triple):
+        """Escribir un triple dentro del rdf:Description de su sujeto"""
+        s, p, o = triple
+        if s != self.subject:
+            if self.subject is not None:
+                self.stream.write("  </rdf:Description>\n")
+            self.stream.write(f"  <rdf:Description {self._node(s, 'about')}>\n")
+            self.subject = s
+        name, xmlns = self.element(p)
+        if isinstance(o, Literal):
+            attributes = xmlns
+            if o.language:
+                attributes += f" xml:lang={quoteattr(o.language)}"
+            elif o.datatype:
+                attributes += f" rdf:datatype={quoteattr(str(o.datatype))}"
+            # El retorno de carro se escapa para que el parser XML no lo normalice
+            text = escape(str(o), {"\r": "&#13;"})
+            self.stream.write(f"    <{name}{attributes}>{text}</{name}>\n")
+        else:
+            self.stream.write(f"    <{name}{xmlns} {self._node(o, 'resource')}/>\n")
+        self.count += 1
+
+    def write_triples(self, triples):
+        """Escribir una secuencia de triples"""
+        for triple in triples:
+            self.write(triple)
+
+    def close(self):
+        """Cerrar el último rdf:Description y el documento"""
+        if self.subject is not None:
+            self.stream.write("  </rdf:Description>\n")
+            self.subject = None
+        self.stream.write("</rdf:RDF>\n")
+
+
+class NDJSONLDWriter:
+    """Escritor NDJSON: un objeto JSON-LD compacto por sujeto y por línea, con @context externo
+
+    Como en TurtleWriter, los triples de cada sujeto deben llegar contiguos; cada línea es un
+    documento JSON-LD independiente que referencia el mismo contexto (ver context()).
+    """
+
+    def __init__(self, stream, namespaces=(), context_url=None, cache_size=65536):
+        """Inicializar con el archivo destino, los pares (prefijo, namespace) y la URL del contexto"""
+        self.stream = stream
+        self.prefixes = prefix_map(namespaces)
+        self.context_url = context_url
+        self.used = set()
+        self.subject = None
+        self.entity = None
+        self.count = 0
+        self.entities = 0
+        self.compact = lru_cache(maxsize=cache_size)(self._compact)
+
+    def context(self):
+        """Documento @context compartido: los prefijos de la ontología usados en las líneas escritas"""
+        return {'@context': {prefix: namespace for namespace, prefix in
+                             sorted(self.prefixes.items(), key=lambda item: item[1])
+                             if prefix in self.used}}
+
+    def _compact(self, uri):
+        """IRI compacta (prefijo:local) o la IRI completa si ningún prefijo aplica"""
+        for namespace, prefix in self.prefixes.items():
+            local = uri[len(namespace):]
+            if uri.startswith(namespace) and local and not local.startswith("//"):
+                self.used.add(prefix)
+                return f"{prefix}:{local}"
+        return uri
+
+    def _node(self, term):
+        """Identificador JSON-LD de un recurso (IRI compacta o nodo en blanco)"""
+        if isinstance(term, BNode):
+            return f"_:{term}"
+        return self.compact(str(term))
+
+    def _value(self, term):
+        """Valor JSON-LD de un objeto, conservando la forma léxica de los literales"""
+        if not isinstance(term, Literal):
+            return {'@id': self._node(term)}
+        if term.language:
+            return {'@value': str(term), '@language': term.language}
+        if term.datatype is None or term.datatype == XSD.string:
+            return str(term)
+        native = NATIVE_JSON_TYPES.get(str(term.datatype))
+        lexical = str(term)
+        if native is int and lexical == str(term.value):
+            return term.value
+        if native is bool and lexical in ("true", "false"):
+            return lexical == "true"
+        return {'@value': lexical, '@type': self.compact(str(term.datatype))}
+
+    def write(self, triple):
+        """Agregar un triple al objeto de su sujeto, escribiendo el anterior al cambiar de sujeto"""
+        s, p, o = triple
+        if s != self.subject:
+            self.flush()
+            self.subject = s
+            self.entity = {'@id': self._node(s)}
+            if self.context_url:
+                self.entity = {'@context': self.context_url, **self.entity}
+        if p == RDF.type and not isinstance(o, (Literal, BNode)):
+            key, value = '@type', self.compact(str(o))
+        else:
+            key, value = self.compact(str(p)), self._value(o)
+        previous = self.entity.get(key)
+        if previous is None:
+            self.entity[key] = value
+        elif isinstance(previous, list):
+            previous.append(value)
+        else:
+            self.entity[key] = [previous, value]
+        self.count += 1
+
+    def flush(self):
+        """Escribir el objeto del sujeto en curso como una línea"""
+        if self.entity is not None:
+            self.stream.write(json.dumps(self.entity, ensure_ascii=False, separators=(",", ":")) + "\n")
+            self.entities += 1
+            self.subject = self.entity = None
+
+    def write_triples(self, triples):
+        """Escribir una secuencia de triples"""
+        for triple in triples:
+            self.write(triple)
+
+    def close(self):
+        """Escribir el último objeto"""
+        self.flush()
@@ -4,22 +4,234 @@ Análisis de Patrones con SPARQL - Proyecto Linked Data Universidades
 Consultas SPARQL para identificar patrones de comportamiento estudiantil
 """
 
-from rdflib import Graph, Namespace
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
+# Solo rdflib y la biblioteca estándar al importar: las consultas programadas arrancan rápido.
+# plotly, NumPy (snapshot y carga por fragmentos) y el transformador se importan al usarse.
+from rdflib import Graph, ConjunctiveGraph, Namespace, Literal, Variable
+from rdflib.term import Node
+from rdflib.store import Store
 import json
+import os
+import re
+import sys
+import io
+import textwrap
+import argparse
+import multiprocessing
+from contextlib import redirect_stdout
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from datetime import datetime
+from sqlite_store import SQLiteStore, is_sqlite_path
+from compressed_io import open_compressed, file_digest, file_stamp
+from query_cache import QueryCache, QUERY_TOKENS, graph_fingerprint
+
+# Capa en disco de la caché de resultados de main() y transform_and_analyze()
+QUERY_CACHE_DIR = "/Users/leomos/Downloads/web_semantica/output/query_cache"
+
+# Motores de evaluación: rdflib, rdflib con el orden de patrones de query_optimizer, el
+# vectorizado de vector_engine (con rdflib para las formas que no admite) o este y rdflib
+# comparando sus resultados en cada consulta
+ENGINES = ("rdflib", "optimized", "vector", "crosscheck")
+
+# Prefijos compartidos por las consultas de análisis (initNs al compilarlas)
+ANALYSIS_NAMESPACES = {
+    'univ': "http://example.org/university/",
+    'edu': "http://example.org/education/",
+    'geo': "http://example.org/geography/",
+    'behavior': "http://example.org/behavior/",
+    'dc': "http://purl.org/dc/elements/1.1/",
+    'rdfs': "http://www.w3.org/2000/01/rdf-schema#",
+}
+
+# Consultas de análisis en el orden de la suite. Los umbrales son variables (?min_flujo,
+# ?umbral_puntaje) enlazadas al ejecutar; LIMIT no admite variables y se aplica al leer.
+ANALYSIS_QUERIES = {
+    'popularidad_universidades': """
+        SELECT ?universidad ?nombre (COUNT(?estudiante) AS ?aplicaciones)
+        WHERE {
+            ?estudiante univ:appliesTo ?universidad .
+            ?universidad dc:title ?nombre .
+        }
+        GROUP BY ?universidad ?nombre
+        ORDER BY DESC(?aplicaciones)
+        """,
+    'preferencias_area': """
+        SELECT ?area ?nombre (COUNT(?estudiante) AS ?estudiantes)
+        WHERE {
+            ?estudiante edu:prefersArea ?area .
+            ?area dc:identifier ?nombre .
+        }
+        GROUP BY ?area ?nombre
+        ORDER BY DESC(?estudiantes)
+        """,
+    'migracion_geografica': """
+        SELECT ?ciudad_origen ?dept_destino (COUNT(?estudiante) AS ?flujo)
+        WHERE {
+            ?estudiante geo:originFrom ?ciudad .
+            ?ciudad dc:identifier ?ciudad_origen .
+            ?estudiante univ:appliesTo ?universidad .
+            ?universidad geo:locatedIn ?departamento .
+            ?departamento dc:identifier ?dept_destino .
+        }
+        GROUP BY ?ciudad_origen ?dept_destino
+        HAVING (COUNT(?estudiante) > ?min_flujo)
+        ORDER BY DESC(?flujo)
+        """,
+    'decisiones_por_estrato': """
+        SELECT ?estrato ?tipo_universidad 
+               (COUNT(?decision) AS ?decisiones)
+               (SUM(IF(?final_decision, 1, 0)) AS ?decisiones_positivas)
+        WHERE {
+            ?estudiante univ:socioeconomicStratum ?estrato .
+            ?estudiante behavior:makes ?decision .
+            ?decision behavior:finalDecision ?final_decision .
+            ?estudiante univ:appliesTo ?universidad .
+            ?universidad univ:hasType ?tipo_universidad .
+        }
+        GROUP BY ?estrato ?tipo_universidad
+        ORDER BY ?estrato ?tipo_universidad
+        """,
+    'preferencias_modalidad': """
+        SELECT ?modalidad (COUNT(?decision) AS ?decisiones)
+               (AVG(IF(?final_decision, 1.0, 0.0)) AS ?tasa_aceptacion)
+        WHERE {
+            ?decision edu:programModality ?modalidad .
+            ?decision behavior:finalDecision ?final_decision .
+        }
+        GROUP BY ?modalidad
+        ORDER BY DESC(?decisiones)
+        """,
+    'alto_rendimiento': """
+        SELECT ?puntaje ?area_pref ?universidad ?ranking
+        WHERE {
+            ?estudiante edu:saber11Score ?puntaje .
+            ?estudiante edu:prefersArea ?area .
+            ?area dc:identifier ?area_pref .
+            ?estudiante univ:appliesTo ?universidad .
+            ?universidad univ:nationalRanking ?ranking .
+            FILTER(?puntaje > ?umbral_puntaje)
+        }
+        ORDER BY DESC(?puntaje)
+        """,
+    'impacto_becas': """
+        SELECT ?tiene_beca ?universidad_nombre
+               (COUNT(?decision) AS ?aplicaciones)
+               (AVG(IF(?final_decision, 1.0, 0.0)) AS ?tasa_eleccion)
+        WHERE {
+            ?estudiante univ:appliesTo ?universidad .
+            ?universidad univ:hasScholarship ?tiene_beca .
+            ?universidad dc:title ?universidad_nombre .
+            ?estudiante behavior:makes ?decision .
+            ?decision behavior:finalDecision ?final_decision .
+        }
+        GROUP BY ?tiene_beca ?universidad_nombre
+        ORDER BY ?tiene_beca DESC(?tasa_eleccion)
+        """,
+    'patrones_genero': """
+        SELECT ?genero ?area_pref (COUNT(?estudiante) AS ?estudiantes)
+        WHERE {
+            ?estudiante univ:gender ?genero .
+            ?estudiante edu:prefersArea ?area .
+            ?area dc:identifier ?area_pref .
+        }
+        GROUP BY ?genero ?area_pref
+        ORDER BY ?genero DESC(?estudiantes)
+        """,
+    'preferencia_acreditacion': """
+        SELECT ?acreditada 
+               (COUNT(?aplicacion) AS ?aplicaciones)
+               (AVG(IF(?final_decision, 1.0, 0.0)) AS ?tasa_eleccion)
+        WHERE {
+            ?estudiante univ:appliesTo ?universidad .
+            ?universidad univ:isAccredited ?acreditada .
+            ?estudiante behavior:makes ?decision .
+            ?decision behavior:finalDecision ?final_decision .
+        }
+        GROUP BY ?acreditada
+        """,
+}
+
+# Métodos de la suite de análisis, en el orden en que se muestran y guardan sus resultados
+ANALYSIS_SUITE = (
+    "analyze_university_popularity",
+    "analyze_area_preferences",
+    "analyze_geographic_migration",
+    "analyze_decision_patterns_by_stratum",
+    "analyze_modality_preferences",
+    "analyze_high_performers",
+    "analyze_scholarship_impact",
+    "analyze_gender_patterns",
+    "analyze_accreditation_preference",
+)
+
+# Analizador que heredan por fork los procesos de run_suite() (None fuera de una ejecución)
+_suite_analyzer = None
+
+# Nombre de consulta -> consulta compilada (parseada y traducida a álgebra una vez por proceso)
+_prepared = {}
+
+
+def prepared_query(name):
+    """Consulta de análisis compilada, reutilizable con distintos parámetros"""
+    if name not in _prepared:
+        # Importación diferida: el parser SPARQL se carga solo al ejecutar consultas
+        from rdflib.plugins.sparql import prepareQuery
+        _prepared[name] = prepareQuery(ANALYSIS_QUERIES[name], initNs=ANALYSIS_NAMESPACES)
+    return _prepared[name]
+
+
+def query_bindings(parameters):
+    """Parámetros de una consulta como initBindings (valores de Python a literales RDF)"""
+    return {Variable(name): value if isinstance(value, Node) else Literal(value)
+            for name, value in parameters.items()}
+
+
+def effective_query(query, namespaces, parameters=None, limit=None):
+    """Texto ejecutable por sí solo de una consulta: prefijos, parámetros sustituidos y LIMIT
+
+    Declara los prefijos de namespaces que usa la consulta, reemplaza cada variable enlazada
+    por su valor en N3 (fuera de las cadenas) y agrega el límite que se aplica al leer.
+    """
+    values = {str(variable): term.n3() for variable, term in query_bindings(parameters or {}).items()}
+    parts = QUERY_TOKENS.split(textwrap.dedent(query))
+    for i, part in enumerate(parts):
+        if part and not part.isspace() and part[0] not in "'\"":
+            parts[i] = re.sub(r"[?$](\w+)", lambda m: values.get(m.group(1), m.group(0)), part)
+    text = "".join(part for part in parts if part).strip()
+    header = [f"PREFIX {name}: <{uri}>" for name, uri in namespaces.items()
+              if re.search(rf"(?<![\w<]){re.escape(name)}:", text)
+              and not re.search(rf"PREFIX\s+{re.escape(name)}:", text, re.IGNORECASE)]
+    if limit is not None:
+        text += f"\nLIMIT {limit}"
+    return "\n".join(header + [text])
+
 
 class SPARQLPatternAnalyzer:
     """Analizador de patrones de comportamiento usando consultas SPARQL"""
     
-    def __init__(self, rdf_file_path):
-        """Inicializar con archivo RDF"""
-        self.rdf_path = rdf_file_path
-        self.g = Graph()
+    def __init__(self, rdf_source, store="default", load_workers=None, cache_dir=None, use_cache=True,
+                 engine="rdflib"):
+        """Inicializar con un archivo RDF, un Graph o un Store ya poblados (estos dos sin copiarlos)
+
+        store ("default" o int_store.STORE_NAME para el almacén de enteros) solo se usa al cargar
+        un archivo. cache_dir activa la capa en disco de la caché de resultados (si no, solo memoria).
+        engine es uno de ENGINES; "crosscheck" no toma resultados de la caché.
+        """
+        if engine not in ENGINES:
+            raise ValueError(f"Motor desconocido: {engine} (opciones: {', '.join(ENGINES)})")
+        self.rdf_path = None
+        if isinstance(rdf_source, Graph):
+            self.g = rdf_source
+        elif isinstance(rdf_source, Store):
+            # En un store con contextos los triples pueden estar bajo otro grafo: usar la unión
+            graph_class = ConjunctiveGraph if rdf_source.context_aware else Graph
+            self.g = graph_class(store=rdf_source)
+        else:
+            self.rdf_path = rdf_source
+            self.g = Graph(store=store)
+        
+        # Procesos para parsear N-Triples/Turtle por fragmentos (por defecto, uno por CPU)
+        self.load_workers = load_workers
         
         # Definir namespaces
         self.UNIV = Namespace("http://example.org/university/")
@@ -28,279 +240,295 @@ class SPARQLPatternAnalyzer:
         self.GEO = Namespace("http://example.org/geography/")
         self.BEHAVIOR = Namespace("http://example.org/behavior/")
         
+        # Caché de resultados por consulta y versión del grafo (huella del archivo o del contenido)
+        self.cache = QueryCache(cache_dir) if use_cache else None
+        self.source_digest = None
+        # Huella fijada mientras se ejecuta la suite (None: se calcula en cada consulta)
+        self.fingerprint = None
+        
         # Cargar datos RDF
         self.load_rdf_data()
         
+        # Motor vectorizado: arreglos por predicado construidos al cargar (compartidos tras fork)
+        self.engine = engine
+        self.vector_engine = None
+        if engine in ("vector", "crosscheck"):
+            from vector_engine import VectorEngine
+            self.vector_engine = VectorEngine(self.g)
+            tables = self.vector_engine.load(self.graph_version())
+            print(f"Motor vectorizado: {len(tables.tables)} predicados indexados")
+        # Optimizador: estadísticas por predicado al cargar y gancho de rdflib para este grafo
+        self.optimizer = None
+        if engine == "optimized":
+            from query_optimizer import QueryOptimizer
+            self.optimizer = QueryOptimizer(self.g).enable()
+            print(f"Optimizador de consultas: estadísticas de "
+                  f"{len(self.optimizer.statistics.predicates)} predicados")
+        
         # Almacenar resultados de consultas
         self.query_results = {}
     
     def load_rdf_data(self):
-        """Cargar datos RDF"""
+        """Cargar datos RDF (store .sqlite en solo lectura y snapshot .snap con mmap, sin parsear)"""
+        if self.rdf_path is None:
+            # Grafo recibido en memoria (p. ej. del transformador): sin serializar ni parsear
+            print(f"Grafo en memoria recibido: {len(self.g)} triples")
+            return
+        # Versión del grafo sin recorrerlo: tamaño, fecha e inodo para el store SQLite y el
+        # snapshot (se abren sin leerlos enteros); huella del contenido para el RDF en texto
+        track_version = self.cache is not None and os.path.exists(self.rdf_path)
+        if is_sqlite_path(self.rdf_path):
+            if track_version:
+                self.source_digest = file_stamp(self.rdf_path)
+            self.g = Graph(store=SQLiteStore(self.rdf_path, read_only=True))
+            print(f"Store SQLite abierto en solo lectura: {len(self.g)} triples")
+            return
+        from rdf_snapshot import load_snapshot, SNAPSHOT_EXTENSION
+        from rdf_loader import load_rdf
+        if track_version:
+            self.source_digest = (file_stamp(self.rdf_path) if self.rdf_path.endswith(SNAPSHOT_EXTENSION)
+                                  else file_digest(self.rdf_path))
+        if self.rdf_path.endswith(SNAPSHOT_EXTENSION):
+            self.g = Graph(store=load_snapshot(self.rdf_path))
+            print(f"Snapshot binario cargado con mmap: {len(self.g)} triples")
+            return
         try:
-            self.g.parse(self.rdf_path, format="turtle")
-            print(f"Datos RDF cargados exitosamente: {len(self.g)} triples")
+            # Formato detectado por extensión o contenido; N-Triples y Turtle se parsean en paralelo
+            loaded, seconds = load_rdf(self.g, self.rdf_path, workers=self.load_workers)
+            print(f"Datos RDF cargados exitosamente: {len(self.g)} triples "
+                  f"({loaded / seconds if seconds else 0:.0f} triples/s)")
         except Exception as e:
             print(f"Error al cargar datos RDF: {e}")
     
-    def execute_sparql_query(self, query_name, query, description):
+    def graph_version(self):
+        """Huella de la versión del grafo: la del archivo cargado o la de su contenido
+
+        Un grafo en memoria puede cambiar entre consultas sin cambiar de tamaño: su huella se
+        recalcula en cada llamada, salvo durante run_suite, que la calcula una vez al empezar.
+        """
+        if self.source_digest is not None:
+            return f"{os.path.splitext(self.rdf_path)[1]}-{self.source_digest}"
+        if self.fingerprint is not None:
+            return self.fingerprint
+        return graph_fingerprint(self.g)
+    
+    def run_query(self, query, parameters=None, limit=None, prepared=None):
+        """Ejecutar una consulta (o tomarla de la caché): variables, filas y líneas a mostrar
+
+        parameters enlaza variables de la consulta ({nombre: valor}) y limit recorta los resultados
+        como LIMIT; prepared es la versión compilada de query, que evita volver a parsearla.
+        """
+        # Una huella por consulta: la usan la clave de la caché y los arreglos del motor vectorizado
+        version = (self.graph_version() if self.cache is not None or self.vector_engine is not None
+                   else None)
+        key = None
+        if self.cache is not None:
+            key = self.cache.key(query, version, parameters, limit)
+            cached = self.cache.get(key) if self.engine != "crosscheck" else None
+            if cached is not None:
+                return cached, True
+        results = self.evaluate(query, query_bindings(parameters or {}), prepared, version)
+        variables = [str(var) for var in results.vars]
+        rows, lines = [], []
+        for row in islice(results, limit):
+            rows.append({var: str(row[i]) if row[i] else None for i, var in enumerate(variables)})
+            lines.append(" | ".join([f"{var}: {row[i]}" for i, var in enumerate(variables)]))
+        computed = {'vars': variables, 'results': rows, 'lines': lines}
+        if key is not None:
+            self.cache.put(key, computed)
+        return computed, False
+    
+    def evaluate(self, query, bindings, prepared=None, version=None):
+        """Resultado de una consulta con el motor configurado (variables y filas indexables)
+
+        version es la huella del grafo (graph_version()): el motor vectorizado reconstruye sus
+        arreglos cuando cambia.
+        """
+        if self.engine in ("rdflib", "optimized"):
+            return self.g.query(prepared if prepared is not None else query, initBindings=bindings)
+        from vector_engine import UnsupportedQuery, check_results, without_slice
+        if prepared is None:
+            from rdflib.plugins.sparql import prepareQuery
+            prepared = prepareQuery(query, initNs=dict(self.g.namespaces()))
+        try:
+            results = self.vector_engine.query(prepared, bindings, version)
+        except UnsupportedQuery as reason:
+            print(f"Motor vectorizado no aplicable ({reason}): se usa rdflib")
+            return self.g.query(prepared, initBindings=bindings)
+        if self.engine == "crosscheck":
+            # CrossCheckError (AssertionError) si las filas difieren más allá del orden entre empates
+            complete = None
+            if results.truncated:
+                # Con LIMIT, ambos motores también sin él: las filas que el orden no fija deben
+                # salir del resultado completo, y este debe coincidir entre motores
+                unsliced = without_slice(prepared)
+                complete = self.g.query(unsliced, initBindings=bindings)
+                check_results(self.vector_engine.query(unsliced, bindings, version), complete)
+            check_results(results, self.g.query(prepared, initBindings=bindings), complete=complete)
+        return results
+    
+    def execute_sparql_query(self, query_name, query, description, parameters=None, limit=None,
+                             prepared=None):
         """Ejecutar consulta SPARQL y almacenar resultados"""
         print(f"\n=== {query_name.upper()} ===")
         print(f"Descripción: {description}")
         print(f"Consulta SPARQL:")
         print(query)
+        # Parámetros enlazados y límite, para mostrarlos y guardarlos con los resultados
+        settings = dict(parameters or {})
+        if limit is not None:
+            settings['limit'] = limit
+        if settings:
+            print("Parámetros: " + ", ".join(f"{name} = {value}" for name, value in settings.items()))
         print("\nResultados:")
         
         try:
-            results = self.g.query(query)
-            result_list = []
+            computed, cached = self.run_query(query, parameters, limit, prepared)
+            # Copias: las filas guardadas en la caché no deben modificarse desde fuera
+            result_list = [dict(row) for row in computed['results']]
             
-            for row in results:
-                result_dict = {}
-                for i, var in enumerate(results.vars):
-                    result_dict[str(var)] = str(row[i]) if row[i] else None
-                result_list.append(result_dict)
-                
+            for formatted_row in computed['lines']:
                 # Mostrar resultado
-                formatted_row = " | ".join([f"{var}: {row[i]}" for i, var in enumerate(results.vars)])
                 print(f"  {formatted_row}")
+            if cached:
+                print("(resultados tomados de la caché)")
             
             # Almacenar resultados
+            # Consulta tal como se evaluó: con sus prefijos, sus parámetros y su límite
+            namespaces = ANALYSIS_NAMESPACES if prepared is not None else dict(self.g.namespaces())
             self.query_results[query_name] = {
                 'description': description,
-                'query': query,
+                'query': effective_query(query, namespaces, parameters, limit),
                 'results': result_list,
                 'count': len(result_list)
             }
+            if settings:
+                self.query_results[query_name]['parameters'] = settings
             
             print(f"Total de resultados: {len(result_list)}")
             return result_list
             
+        except AssertionError:
+            # Una diferencia entre motores (modo crosscheck) no debe quedar como un error más
+            raise
         except Exception as e:
             print(f"Error ejecutando consulta: {e}")
             return []
     
+    def execute_analysis(self, query_name, description, parameters=None, limit=None):
+        """Ejecutar una consulta de ANALYSIS_QUERIES con su versión compilada y sus parámetros"""
+        return self.execute_sparql_query(query_name, ANALYSIS_QUERIES[query_name], description,
+                                         parameters, limit, prepared_query(query_name))
+    
     def analyze_university_popularity(self):
         """Analizar popularidad de universidades"""
-        query = """
-        PREFIX univ: <http://example.org/university/>
-        PREFIX dc: <http://purl.org/dc/elements/1.1/>
-        PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
-        
-        SELECT ?universidad ?nombre (COUNT(?estudiante) AS ?aplicaciones)
-        WHERE {
-            ?estudiante univ:appliesTo ?universidad .
-            ?universidad dc:title ?nombre .
-        }
-        GROUP BY ?universidad ?nombre
-        ORDER BY DESC(?aplicaciones)
-        """
-        
-        return self.execute_sparql_query(
+        return self.execute_analysis(
             "popularidad_universidades",
-            query,
             "Número de aplicaciones por universidad (popularidad)"
         )
     
     def analyze_area_preferences(self):
         """Analizar preferencias por área de conocimiento"""
-        query = """
-        PREFIX edu: <http://example.org/education/>
-        PREFIX dc: <http://purl.org/dc/elements/1.1/>
-        PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
-        
-        SELECT ?area ?nombre (COUNT(?estudiante) AS ?estudiantes)
-        WHERE {
-            ?estudiante edu:prefersArea ?area .
-            ?area dc:identifier ?nombre .
-        }
-        GROUP BY ?area ?nombre
-        ORDER BY DESC(?estudiantes)
-        """
-        
-        return self.execute_sparql_query(
+        return self.execute_analysis(
             "preferencias_area",
-            query,
             "Distribución de estudiantes por área de preferencia"
         )
     
-    def analyze_geographic_migration(self):
-        """Analizar migración académica geográfica"""
-        query = """
-        PREFIX geo: <http://example.org/geography/>
-        PREFIX univ: <http://example.org/university/>
-        PREFIX dc: <http://purl.org/dc/elements/1.1/>
-        PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
-        
-        SELECT ?ciudad_origen ?dept_destino (COUNT(?estudiante) AS ?flujo)
-        WHERE {
-            ?estudiante geo:originFrom ?ciudad .
-            ?ciudad dc:identifier ?ciudad_origen .
-            ?estudiante univ:appliesTo ?universidad .
-            ?universidad geo:locatedIn ?departamento .
-            ?departamento dc:identifier ?dept_destino .
-        }
-        GROUP BY ?ciudad_origen ?dept_destino
-        HAVING (COUNT(?estudiante) > 50)
-        ORDER BY DESC(?flujo)
-        """
-        
-        return self.execute_sparql_query(
+    def analyze_geographic_migration(self, min_flow=50):
+        """Analizar migración académica geográfica (flujos con más de min_flow estudiantes)"""
+        return self.execute_analysis(
             "migracion_geografica",
-            query,
-            "Flujos de migración académica (ciudad origen → departamento destino)"
+            "Flujos de migración académica (ciudad origen → departamento destino)",
+            parameters={'min_flujo': min_flow}
         )
     
     def analyze_decision_patterns_by_stratum(self):
         """Analizar patrones de decisión por estrato socioeconómico"""
-        query = """
-        PREFIX univ: <http://example.org/university/>
-        PREFIX behavior: <http://example.org/behavior/>
-        
-        SELECT ?estrato ?tipo_universidad 
-               (COUNT(?decision) AS ?decisiones)
-               (SUM(IF(?final_decision, 1, 0)) AS ?decisiones_positivas)
-        WHERE {
-            ?estudiante univ:socioeconomicStratum ?estrato .
-            ?estudiante behavior:makes ?decision .
-            ?decision behavior:finalDecision ?final_decision .
-            ?estudiante univ:appliesTo ?universidad .
-            ?universidad univ:hasType ?tipo_universidad .
-        }
-        GROUP BY ?estrato ?tipo_universidad
-        ORDER BY ?estrato ?tipo_universidad
-        """
-        
-        return self.execute_sparql_query(
+        return self.execute_analysis(
             "decisiones_por_estrato",
-            query,
             "Patrones de decisión por estrato socioeconómico y tipo de universidad"
         )
     
     def analyze_modality_preferences(self):
         """Analizar preferencias por modalidad de programa"""
-        query = """
-        PREFIX edu: <http://example.org/education/>
-        PREFIX behavior: <http://example.org/behavior/>
-        
-        SELECT ?modalidad (COUNT(?decision) AS ?decisiones)
-               (AVG(IF(?final_decision, 1.0, 0.0)) AS ?tasa_aceptacion)
-        WHERE {
-            ?decision edu:programModality ?modalidad .
-            ?decision behavior:finalDecision ?final_decision .
-        }
-        GROUP BY ?modalidad
-        ORDER BY DESC(?decisiones)
-        """
-        
-        return self.execute_sparql_query(
+        return self.execute_analysis(
             "preferencias_modalidad",
-            query,
             "Preferencias por modalidad de programa y tasa de aceptación"
         )
     
-    def analyze_high_performers(self):
-        """Analizar estudiantes de alto rendimiento"""
-        query = """
-        PREFIX edu: <http://example.org/education/>
-        PREFIX univ: <http://example.org/university/>
-        PREFIX geo: <http://example.org/geography/>
-        PREFIX dc: <http://purl.org/dc/elements/1.1/>
-        
-        SELECT ?puntaje ?area_pref ?universidad ?ranking
-        WHERE {
-            ?estudiante edu:saber11Score ?puntaje .
-            ?estudiante edu:prefersArea ?area .
-            ?area dc:identifier ?area_pref .
-            ?estudiante univ:appliesTo ?universidad .
-            ?universidad univ:nationalRanking ?ranking .
-            FILTER(?puntaje > 350)
-        }
-        ORDER BY DESC(?puntaje)
-        LIMIT 20
-        """
-        
-        return self.execute_sparql_query(
+    def analyze_high_performers(self, min_score=350, limit=20):
+        """Analizar estudiantes de alto rendimiento (puntaje > min_score, limit resultados)"""
+        return self.execute_analysis(
             "alto_rendimiento",
-            query,
-            "Estudiantes de alto rendimiento (puntaje > 350) y sus elecciones"
+            f"Estudiantes de alto rendimiento (puntaje > {min_score}) y sus elecciones",
+            parameters={'umbral_puntaje': min_score},
+            limit=limit
         )
     
     def analyze_scholarship_impact(self):
         """Analizar impacto de becas en decisiones"""
-        query = """
-        PREFIX univ: <http://example.org/university/>
-        PREFIX behavior: <http://example.org/behavior/>
-        PREFIX dc: <http://purl.org/dc/elements/1.1/>
-        
-        SELECT ?tiene_beca ?universidad_nombre
-               (COUNT(?decision) AS ?aplicaciones)
-               (AVG(IF(?final_decision, 1.0, 0.0)) AS ?tasa_eleccion)
-        WHERE {
-            ?estudiante univ:appliesTo ?universidad .
-            ?universidad univ:hasScholarship ?tiene_beca .
-            ?universidad dc:title ?universidad_nombre .
-            ?estudiante behavior:makes ?decision .
-            ?decision behavior:finalDecision ?final_decision .
-        }
-        GROUP BY ?tiene_beca ?universidad_nombre
-        ORDER BY ?tiene_beca DESC(?tasa_eleccion)
-        """
-        
-        return self.execute_sparql_query(
+        return self.execute_analysis(
             "impacto_becas",
-            query,
             "Impacto de disponibilidad de becas en las decisiones estudiantiles"
         )
     
     def analyze_gender_patterns(self):
         """Analizar patrones por género"""
-        query = """
-        PREFIX univ: <http://example.org/university/>
-        PREFIX edu: <http://example.org/education/>
-        PREFIX dc: <http://purl.org/dc/elements/1.1/>
-        
-        SELECT ?genero ?area_pref (COUNT(?estudiante) AS ?estudiantes)
-        WHERE {
-            ?estudiante univ:gender ?genero .
-            ?estudiante edu:prefersArea ?area .
-            ?area dc:identifier ?area_pref .
-        }
-        GROUP BY ?genero ?area_pref
-        ORDER BY ?genero DESC(?estudiantes)
-        """
-        
-        return self.execute_sparql_query(
+        return self.execute_analysis(
             "patrones_genero",
-            query,
             "Distribución de preferencias académicas por género"
         )
     
     def analyze_accreditation_preference(self):
         """Analizar preferencia por universidades acreditadas"""
-        query = """
-        PREFIX univ: <http://example.org/university/>
-        PREFIX behavior: <http://example.org/behavior/>
-        
-        SELECT ?acreditada 
-               (COUNT(?aplicacion) AS ?aplicaciones)
-               (AVG(IF(?final_decision, 1.0, 0.0)) AS ?tasa_eleccion)
-        WHERE {
-            ?estudiante univ:appliesTo ?universidad .
-            ?universidad univ:isAccredited ?acreditada .
-            ?estudiante behavior:makes ?decision .
-            ?decision behavior:finalDecision ?final_decision .
-        }
-        GROUP BY ?acreditada
-        """
-        
-        return self.execute_sparql_query(
+        return self.execute_analysis(
             "preferencia_acreditacion",
-            query,
             "Preferencia por universidades acreditadas vs no acreditadas"
         )
     
+    def run_suite(self, workers=None):
+        """Ejecutar las consultas de ANALYSIS_SUITE, en paralelo si hay más de un proceso
+
+        Los procesos se crean con fork y comparten el grafo cargado (copia en escritura); su salida
+        y sus resultados se incorporan en el orden de la suite, igual que en la ejecución secuencial.
+        Sin fork (Windows) o con un solo proceso, las consultas se ejecutan una tras otra.
+        """
+        workers = min(workers or os.cpu_count() or 1, len(ANALYSIS_SUITE))
+        # Huella del grafo una vez por ejecución (antes del fork: los procesos la heredan)
+        self.fingerprint = (self.graph_version() if self.cache is not None or self.vector_engine is not None
+                            else None)
+        try:
+            if workers <= 1 or "fork" not in multiprocessing.get_all_start_methods():
+                for method in ANALYSIS_SUITE:
+                    getattr(self, method)()
+                return self.query_results
+            return self._run_suite_forked(workers)
+        finally:
+            self.fingerprint = None
+    
+    def _run_suite_forked(self, workers):
+        """Repartir las consultas de ANALYSIS_SUITE entre procesos creados con fork"""
+        global _suite_analyzer
+        _suite_analyzer = self
+        try:
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("fork"),
+                                     initializer=_init_suite_worker) as pool:
+                futures = [pool.submit(_run_suite_method, method) for method in ANALYSIS_SUITE]
+                for future in futures:
+                    output, results, cache_usage = future.result()
+                    sys.stdout.write(output)
+                    self.query_results.update(results)
+                    if self.cache is not None:
+                        self.cache.merge(*cache_usage)
+        finally:
+            _suite_analyzer = None
+        return self.query_results
+    
     def create_pattern_visualizations(self):
         """Crear visualizaciones de los patrones encontrados"""
+        import plotly.graph_objects as go
+        from plotly.subplots import make_subplots
+        
         print("\n=== CREANDO VISUALIZACIONES DE PATRONES ===")
         
         # Configurar subplot principal
@@ -377,6 +605,8 @@ class SPARQLPatternAnalyzer:
     
     def create_migration_visualization(self):
         """Crear visualización específica de migración académica"""
+        import plotly.graph_objects as go
+        
         data = self.query_results['migracion_geografica']['results']
         
         # Preparar datos para sankey diagram
@@ -416,10 +646,10 @@ class SPARQLPatternAnalyzer:
         fig_sankey.write_html("/Users/leomos/Downloads/web_semantica/visualizations/migracion_sankey.html")
         print("Diagrama Sankey de migración guardado en: visualizations/migracion_sankey.html")
     
-    def save_results_summary(self):
-        """Guardar resumen de resultados en JSON"""
+    def save_results_summary(self, output_path="/Users/leomos/Downloads/web_semantica/output/sparql_analysis_results.json"):
+        """Guardar resumen de resultados en JSON (comprimido si la ruta termina en .gz, .bz2 o .xz)"""
         summary = {
-            'timestamp': pd.Timestamp.now().isoformat(),
+            'timestamp': datetime.now().isoformat(),
             'total_queries': len(self.query_results),
             'total_triples': len(self.g),
             'insights': {},
@@ -440,34 +670,41 @@ class SPARQLPatternAnalyzer:
             summary['insights']['mejor_puntaje'] = float(perf_data[0]['puntaje']) if perf_data else None
         
         # Guardar en archivo JSON
-        with open("/Users/leomos/Downloads/web_semantica/output/sparql_analysis_results.json", "w", encoding="utf-8") as f:
+        with open_compressed(output_path, "w") as f:
             json.dump(summary, f, indent=2, ensure_ascii=False)
         
-        print("Resumen de resultados guardado en: output/sparql_analysis_results.json")
+        print(f"Resumen de resultados guardado en: output/{os.path.basename(output_path)}")
         return summary
 
-def main():
-    """Función principal para análisis SPARQL"""
-    print("=== ANÁLISIS DE PATRONES CON SPARQL ===")
-    print("Identificando patrones de comportamiento estudiantil mediante consultas semánticas\n")
-    
-    # Inicializar analizador
-    analyzer = SPARQLPatternAnalyzer(
-        "/Users/leomos/Downloads/web_semantica/output/university_linked_data.ttl"
-    )
-    
-    # Ejecutar consultas de análisis
+def _init_suite_worker():
+    """Preparar un proceso de run_suite(): conexión SQLite propia si el grafo está en SQLite"""
+    store = _suite_analyzer.g.store
+    if isinstance(store, SQLiteStore):
+        store.reopen_after_fork()
+
+def _run_suite_method(method):
+    """Ejecutar un análisis en un proceso hijo: salida impresa, resultados y uso de la caché"""
+    analyzer = _suite_analyzer
+    analyzer.query_results = {}
+    cache = analyzer.cache
+    known = set(cache.memory) if cache is not None else set()
+    if cache is not None:
+        cache.reset_stats()
+    output = io.StringIO()
+    with redirect_stdout(output):
+        getattr(analyzer, method)()
+    cache_usage = None
+    if cache is not None:
+        # Entradas nuevas y contadores, para que el proceso padre los incorpore a su caché
+        cache_usage = ({key: value for key, value in cache.memory.items() if key not in known},
+                       cache.stats())
+    return output.getvalue(), analyzer.query_results, cache_usage
+
+def run_analysis(analyzer, workers=None):
+    """Ejecutar todas las consultas, crear las visualizaciones y guardar el resumen"""
     print("Ejecutando consultas SPARQL para identificar patrones...")
     
-    analyzer.analyze_university_popularity()
-    analyzer.analyze_area_preferences()
-    analyzer.analyze_geographic_migration()
-    analyzer.analyze_decision_patterns_by_stratum()
-    analyzer.analyze_modality_preferences()
-    analyzer.analyze_high_performers()
-    analyzer.analyze_scholarship_impact()
-    analyzer.analyze_gender_patterns()
-    analyzer.analyze_accreditation_preference()
+    analyzer.run_suite(workers)
     
     # Crear visualizaciones
     analyzer.create_pattern_visualizations()
@@ -482,8 +719,70 @@ def main():
     print("- visualizations/sparql_patterns.html")
     print("- visualizations/migracion_sankey.html")
     print("- output/sparql_analysis_results.json")
+    if analyzer.cache is not None:
+        analyzer.cache.print_stats()
+    
+    return summary
+
+def main(workers=None, engine="rdflib", source=None):
+    """Función principal para análisis SPARQL (workers: procesos para las consultas; source: archivo RDF)"""
+    print("=== ANÁLISIS DE PATRONES CON SPARQL ===")
+    print("Identificando patrones de comportamiento estudiantil mediante consultas semánticas\n")
     
+    from rdf_snapshot import SNAPSHOT_EXTENSION
+    
+    # Inicializar analizador con el archivo indicado o, si no, con el más reciente de los que
+    # existan (store SQLite, snapshot binario o Turtle; ante la misma fecha, el más rápido de cargar):
+    # un store de una ejecución antigua no debe ocultar las exportaciones nuevas
+    rdf_path = source
+    if rdf_path is None:
+        candidates = [f"/Users/leomos/Downloads/web_semantica/output/university_linked_data{extension}"
+                      for extension in (".sqlite", SNAPSHOT_EXTENSION, ".ttl")]
+        existing = [path for path in candidates if os.path.exists(path)]
+        rdf_path = max(existing, key=os.path.getmtime) if existing else candidates[-1]
+    print(f"Fuente de datos: {rdf_path}")
+    analyzer = SPARQLPatternAnalyzer(rdf_path, cache_dir=QUERY_CACHE_DIR, engine=engine)
+    summary = run_analysis(analyzer, workers)
+    return analyzer, summary
+
+def transform_and_analyze(formats=None, compression="", workers=None, engine="rdflib"):
+    """Transformar el CSV y analizar el grafo resultante en el mismo proceso
+
+    El analizador recibe el grafo del transformador, sin serializarlo ni volver a parsearlo;
+    formats indica qué archivos RDF se guardan además (por defecto DEFAULT_FORMATS; vacío para ninguno).
+    """
+    # Importación diferida: el análisis desde archivo no necesita el transformador
+    import data_transformer_fixed
+    from rdf_export import DEFAULT_FORMATS
+    
+    transformer = data_transformer_fixed.main(
+        formats=DEFAULT_FORMATS if formats is None else formats, compression=compression)
+    
+    print("\n=== ANÁLISIS DE PATRONES CON SPARQL ===")
+    analyzer = SPARQLPatternAnalyzer(transformer.g, cache_dir=QUERY_CACHE_DIR, engine=engine)
+    summary = run_analysis(analyzer, workers)
     return analyzer, summary
 
 if __name__ == "__main__":
-    analyzer, summary = main()
\ No newline at end of file
+    from rdf_export import EXPORT_FORMATS, DEFAULT_FORMATS
+    
+    parser = argparse.ArgumentParser(description="Análisis de patrones con SPARQL")
+    parser.add_argument("--transform", action="store_true",
+                        help="transformar el CSV y analizar el grafo en memoria, sin releer archivos RDF")
+    parser.add_argument("--formats", nargs="*", choices=EXPORT_FORMATS, default=list(DEFAULT_FORMATS),
+                        help="con --transform, formatos RDF que se guardan (ninguno para omitir la escritura)")
+    parser.add_argument("--compress", choices=["gz", "bz2", "xz"], default="",
+                        help="con --transform, comprimir los archivos RDF guardados")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="procesos que ejecutan las consultas a la vez (por defecto, uno por CPU)")
+    parser.add_argument("--engine", choices=ENGINES, default="rdflib",
+                        help="motor de consultas: rdflib, rdflib con patrones reordenados por estadísticas, "
+                             "vectorizado con NumPy, o rdflib y vectorizado comparados")
+    parser.add_argument("--source", default=None,
+                        help="archivo RDF a analizar (.sqlite, .snap o RDF en texto; por defecto, "
+                             "la exportación más reciente en output/)")
+    args = parser.parse_args()
+    if args.transform:
+        analyzer, summary = transform_and_analyze(args.formats, args.compress, args.workers, args.engine)
+    else:
+        analyzer, summary = main(args.workers, args.engine, args.source)
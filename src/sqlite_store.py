@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Almacén de Triples en SQLite - Proyecto Linked Data Universidades
+Store persistente de rdflib sobre sqlite3 con diccionario de términos e índices SPO/POS/OSP
+"""
+
+import os
+import sqlite3
+from pathlib import Path
+
+from rdflib import plugin, URIRef, Literal, BNode
+from rdflib.store import Store, VALID_STORE, NO_STORE
+
+# Nombre con el que se registra el plugin: Graph(store=STORE_NAME)
+STORE_NAME = "SQLiteStore"
+
+# Extensiones de archivo que se abren como store SQLite en lugar de parsearse
+SQLITE_EXTENSIONS = ('.sqlite', '.db')
+
+# Triples acumulados en memoria antes de insertarlos en la base de datos
+BATCH_SIZE = 100000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS terms (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    value TEXT NOT NULL,
+    datatype TEXT NOT NULL DEFAULT '',
+    lang TEXT NOT NULL DEFAULT '',
+    UNIQUE (kind, value, datatype, lang)
+);
+CREATE TABLE IF NOT EXISTS triples (
+    s INTEGER NOT NULL,
+    p INTEGER NOT NULL,
+    o INTEGER NOT NULL,
+    PRIMARY KEY (s, p, o)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS triples_pos ON triples (p, o, s);
+CREATE INDEX IF NOT EXISTS triples_osp ON triples (o, s, p);
+CREATE TABLE IF NOT EXISTS namespaces (
+    prefix TEXT PRIMARY KEY,
+    uri TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def is_sqlite_path(path):
+    """Indicar si una ruta corresponde a un store SQLite"""
+    return isinstance(path, (str, os.PathLike)) and str(path).endswith(SQLITE_EXTENSIONS)
+
+
+def open_store(store, read_only=False, overwrite=False):
+    """Store para Graph(store=...): abre un SQLiteStore si se recibe la ruta de uno
+
+    overwrite vacía un store existente (para escribirlo desde cero en lugar de acumular triples).
+    """
+    if is_sqlite_path(store):
+        sqlite_store = SQLiteStore(str(store), read_only=read_only)
+        if overwrite:
+            sqlite_store.clear()
+        return sqlite_store
+    return store
+
+
+def term_columns(term):
+    """Columnas (tipo, valor, datatype, idioma) de un término RDF"""
+    if isinstance(term, Literal):
+        return ('L', str(term), str(term.datatype or ''), term.language or '')
+    if isinstance(term, BNode):
+        return ('B', str(term), '', '')
+    return ('U', str(term), '', '')
+
+
+def column_term(kind, value, datatype, lang):
+    """Término RDF a partir de sus columnas (conserva la forma léxica de los literales)"""
+    if kind == 'L':
+        return Literal(value, lang=lang or None, datatype=URIRef(datatype) if datatype else None,
+                       normalize=False)
+    if kind == 'B':
+        return BNode(value)
+    return URIRef(value)
+
+
+class SQLiteStore(Store):
+    """Store sin contextos persistido en un archivo SQLite"""
+
+    context_aware = False
+    formula_aware = False
+    transaction_aware = False
+    graph_aware = False
+
+    def __init__(self, configuration=None, identifier=None, read_only=False):
+        """Inicializar, abriendo el archivo si se indica su ruta"""
+        self.identifier = identifier
+        self.read_only = read_only
+        self.path = None
+        self.conn = None
+        # Cachés del diccionario de términos en ambos sentidos
+        self._ids = {}
+        self._terms = {}
+        self._new_terms = []
+        self._pending = []
+        self._count = 0
+        self._next_id = 1
+        self._namespace = {}
+        self._prefix = {}
+        super().__init__(configuration)
+
+    def open(self, configuration, create=True):
+        """Abrir (o crear) la base de datos en la ruta indicada"""
+        if not os.path.exists(configuration) and (self.read_only or not create):
+            return NO_STORE
+        self.path = configuration
+        if self.read_only:
+            self.conn = sqlite3.connect(f"{Path(configuration).resolve().as_uri()}?mode=ro",
+                                        uri=True)
+        else:
+            self.conn = sqlite3.connect(configuration)
+            self.conn.executescript(SCHEMA)
+        for prefix, uri in self.conn.execute("SELECT prefix, uri FROM namespaces"):
+            self._namespace[prefix] = URIRef(uri)
+            self._prefix[URIRef(uri)] = prefix
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'triple_count'").fetchone()
+        if row is None:
+            row = self.conn.execute("SELECT COUNT(*) FROM triples").fetchone()
+        self._count = int(row[0])
+        self._next_id = self.conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM terms").fetchone()[0]
+        return VALID_STORE
+
+    def commit(self):
+        """Escribir los triples pendientes, el conteo y los namespaces, y confirmar"""
+        self._flush()
+        self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('triple_count', ?)",
+                          (str(self._count),))
+        self.conn.execute("DELETE FROM namespaces")
+        self.conn.executemany("INSERT INTO namespaces VALUES (?, ?)",
+                              [(prefix, str(uri)) for prefix, uri in self._namespace.items()])
+        self.conn.commit()
+
+    def close(self, commit_pending_transaction=True):
+        """Cerrar la base de datos (los cambios de un store escribible siempre se confirman)"""
+        if self.conn is None:
+            return
+        if not self.read_only:
+            self.commit()
+        self.conn.close()
+        self.conn = None
+
+    def clear(self):
+        """Eliminar todos los triples, términos, namespaces y metadatos del archivo"""
+        self.conn.executescript("DELETE FROM triples; DELETE FROM terms; "
+                                "DELETE FROM namespaces; DELETE FROM meta;")
+        self.conn.commit()
+        self._ids, self._terms = {}, {}
+        self._new_terms, self._pending = [], []
+        self._count = 0
+        self._next_id = 1
+        self._namespace, self._prefix = {}, {}
+
+    def reopen_after_fork(self):
+        """Abrir una conexión propia en un proceso hijo (una conexión SQLite no sobrevive a fork)"""
+        if self.conn is None:
+            return
+        # La conexión heredada se conserva sin usarla ni cerrarla: pertenece al proceso padre
+        self._inherited_conn = self.conn
+        self.conn = None
+        self.open(self.path, create=False)
+
+    def _lookup(self, term):
+        """Identificador de un término ya almacenado (None si no existe)"""
+        term_id = self._ids.get(term)
+        if term_id is None:
+            row = self.conn.execute(
+                "SELECT id FROM terms WHERE kind = ? AND value = ? AND datatype = ? AND lang = ?",
+                term_columns(term)).fetchone()
+            if row is None:
+                return None
+            term_id = self._ids[term] = row[0]
+            self._terms[term_id] = term
+        return term_id
+
+    def _encode(self, term):
+        """Identificador de un término, asignando uno nuevo si no existe"""
+        term_id = self._lookup(term)
+        if term_id is None:
+            term_id = self._ids[term] = self._next_id
+            self._terms[term_id] = term
+            self._next_id += 1
+            self._new_terms.append((term_id,) + term_columns(term))
+        return term_id
+
+    def _decode(self, term_id):
+        """Término correspondiente a un identificador"""
+        term = self._terms.get(term_id)
+        if term is None:
+            row = self.conn.execute("SELECT kind, value, datatype, lang FROM terms WHERE id = ?",
+                                    (term_id,)).fetchone()
+            term = self._terms[term_id] = column_term(*row)
+            self._ids[term] = term_id
+        return term
+
+    def add(self, triple, context=None, quoted=False):
+        """Agregar un triple"""
+        s, p, o = triple
+        self._pending.append((self._encode(s), self._encode(p), self._encode(o)))
+        if len(self._pending) >= BATCH_SIZE:
+            self._flush()
+
+    def addN(self, quads):
+        """Agregar triples en bloque (se ignora el contexto)"""
+        for s, p, o, _ in quads:
+            self.add((s, p, o))
+
+    def _flush(self):
+        """Insertar los términos y triples pendientes"""
+        if self._new_terms:
+            self.conn.executemany("INSERT INTO terms VALUES (?, ?, ?, ?, ?)", self._new_terms)
+            self._new_terms = []
+        if self._pending:
+            before = self.conn.total_changes
+            self.conn.executemany("INSERT OR IGNORE INTO triples VALUES (?, ?, ?)", self._pending)
+            self._count += self.conn.total_changes - before
+            self._pending = []
+
+    def _where(self, pattern):
+        """Cláusula WHERE y parámetros de un patrón (None si algún término no existe)"""
+        conditions, params = [], []
+        for column, term in zip("spo", pattern):
+            if term is None:
+                continue
+            term_id = self._lookup(term)
+            if term_id is None:
+                return None
+            conditions.append(f"{column} = ?")
+            params.append(term_id)
+        return (" WHERE " + " AND ".join(conditions) if conditions else ""), params
+
+    def triples(self, triple_pattern, context=None):
+        """Generador de los triples que cumplen el patrón"""
+        self._flush()
+        where = self._where(triple_pattern)
+        if where is None:
+            return
+        decode = self._decode
+        for s, p, o in self.conn.execute(f"SELECT s, p, o FROM triples{where[0]}", where[1]):
+            yield (decode(s), decode(p), decode(o)), iter(())
+
+    def remove(self, triple_pattern, context=None):
+        """Eliminar los triples que cumplen el patrón"""
+        self._flush()
+        where = self._where(triple_pattern)
+        if where is None:
+            return
+        self._count -= self.conn.execute(f"DELETE FROM triples{where[0]}", where[1]).rowcount
+
+    def __len__(self, context=None):
+        """Número de triples distintos"""
+        self._flush()
+        return self._count
+
+    def contexts(self, triple=None):
+        """Este store no maneja contextos"""
+        return iter(())
+
+    def bind(self, prefix, namespace, override=True):
+        """Asociar un prefijo a un namespace (se persiste al confirmar)"""
+        bound_namespace = self._namespace.get(prefix)
+        bound_prefix = self._prefix.get(namespace)
+        if bound_prefix is None and bound_namespace is not None:
+            bound_prefix = self._prefix.get(bound_namespace)
+        if override:
+            if bound_prefix is not None:
+                del self._namespace[bound_prefix]
+            if bound_namespace is not None:
+                del self._prefix[bound_namespace]
+            self._prefix[namespace] = prefix
+            self._namespace[prefix] = namespace
+        else:
+            namespace = bound_namespace if bound_namespace is not None else namespace
+            prefix = bound_prefix if bound_prefix is not None else prefix
+            self._prefix[namespace] = prefix
+            self._namespace[prefix] = namespace
+
+    def namespace(self, prefix):
+        """Namespace asociado a un prefijo"""
+        return self._namespace.get(prefix)
+
+    def prefix(self, namespace):
+        """Prefijo asociado a un namespace"""
+        return self._prefix.get(namespace)
+
+    def namespaces(self):
+        """Pares (prefijo, namespace) registrados"""
+        return iter(list(self._namespace.items()))
+
+
+plugin.register(STORE_NAME, Store, "sqlite_store", "SQLiteStore")
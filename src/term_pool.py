@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Pool de Términos RDF - Proyecto Linked Data Universidades
+Internado de URIRef y Literal para que cada término distinto exista una sola vez en memoria
+"""
+
+
+class TermPool:
+    """Pool que devuelve siempre el mismo objeto para términos RDF iguales
+
+    Solo se internan los términos que se repiten entre filas (predicados, clases, entidades
+    compartidas y literales de pocos valores); los propios de cada fila no se guardan.
+    """
+
+    def __init__(self, enabled=True):
+        """Inicializar el pool (deshabilitado, devuelve los términos tal cual)"""
+        self.enabled = enabled
+        self._terms = {}
+        self.hits = 0
+        self.misses = 0
+
+    def intern(self, term):
+        """Obtener el objeto canónico de un término"""
+        if not self.enabled:
+            return term
+        canonical = self._terms.get(term)
+        if canonical is None:
+            # Literal y URIRef con el mismo texto no son iguales entre sí: no colisionan
+            self._terms[term] = canonical = term
+            self.misses += 1
+        else:
+            self.hits += 1
+        return canonical
+
+    def triple(self, triple):
+        """Triple con sus tres términos internados"""
+        s, p, o = triple
+        return (self.intern(s), self.intern(p), self.intern(o))
+
+    def intern_column(self, terms):
+        """Internar en su lugar un arreglo de términos (None se conserva)"""
+        if self.enabled:
+            for i, term in enumerate(terms):
+                if term is not None:
+                    terms[i] = self.intern(term)
+        return terms
+
+    def __contains__(self, term):
+        """Si el término está en el pool"""
+        return term in self._terms
+
+    def __len__(self):
+        """Número de términos distintos en el pool"""
+        return len(self._terms)
+
+    def print_stats(self):
+        """Mostrar estadísticas del pool de términos"""
+        print("\n=== POOL DE TÉRMINOS ===")
+        if not self.enabled:
+            print("Pool deshabilitado")
+            return
+        total = self.hits + self.misses
+        rate = 100 * self.hits / total if total else 0
+        print(f"Términos distintos: {len(self)}")
+        print(f"Reutilizaciones: {self.hits} de {total} ({rate:.1f}%)")
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Acuñación de URIs - Proyecto Linked Data Universidades
+Generación de URIs con patrones precompilados y caché acotada por tipo de entidad
+"""
+
+import hashlib
+import re
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# Patrones precompilados de limpieza
+INVALID_CHARS = re.compile(r'[^\w\s-]')
+WHITESPACE = re.compile(r'\s+')
+
+# Tamaño de caché por tipo de entidad: las columnas de baja cardinalidad aciertan casi siempre,
+# estudiantes y decisiones son únicos por fila y no se cachean
+DEFAULT_CACHE_SIZES = {
+    'student': 0,
+    'university': 1024,
+    'area': 1024,
+    'city': 1024,
+    'department': 1024,
+    'decision': 0,
+}
+
+
+def clean_uri_component(text):
+    """Limpiar texto para usar en URIs"""
+    if pd.isna(text):
+        return "unknown"
+    text = str(text).strip()
+    text = INVALID_CHARS.sub('', text)
+    text = WHITESPACE.sub('_', text)
+    return text.lower()
+
+
+def decision_component(pair):
+    """Hash corto que identifica la decisión de un estudiante sobre una universidad"""
+    student_id, university_code = pair
+    return hashlib.md5(f"{student_id}_{university_code}".encode()).hexdigest()[:8]
+
+
+class URIMinter:
+    """Acuñador de URIs con una caché acotada por tipo de entidad"""
+
+    def __init__(self, kinds, cache_sizes=None, intern=None):
+        """Inicializar con {tipo: (namespace, prefijo[, función de componente])}"""
+        sizes = dict(DEFAULT_CACHE_SIZES, **(cache_sizes or {}))
+        # Función opcional para internar cada URI acuñada (ver term_pool.TermPool); los tipos
+        # únicos por fila (sin caché) no se repiten y no se internan
+        self.intern = intern or (lambda term: term)
+        self._mint = {}
+        for kind, spec in kinds.items():
+            namespace, prefix = spec[0], spec[1]
+            component = spec[2] if len(spec) > 2 else clean_uri_component
+            size = sizes.get(kind, 1024)
+            self._mint[kind] = lru_cache(maxsize=size)(
+                self._builder(namespace, prefix, component, interned=bool(size)))
+
+    def _builder(self, namespace, prefix, component, interned=True):
+        """Función que construye la URI de un valor para un tipo de entidad"""
+        intern = self.intern if interned else (lambda term: term)
+
+        def build(value):
+            return intern(namespace[f"{prefix}{component(value)}"])
+        return build
+
+    def mint(self, kind, value):
+        """Obtener la URI de un valor para un tipo de entidad"""
+        return self._mint[kind](value)
+
+    def mint_column(self, kind, series, skip_na=False):
+        """URIs de una columna completa, acuñando cada valor distinto una sola vez"""
+        codes, uniques = pd.factorize(series, use_na_sentinel=skip_na)
+        mint = self._mint[kind]
+        # El código -1 (nulo, si se omite) apunta a la última posición, que queda en None
+        return np.array([mint(value) for value in uniques] + [None], dtype=object)[codes]
+
+    def cache_stats(self):
+        """Aciertos, fallos y tamaño de la caché de cada tipo de entidad"""
+        stats = {}
+        for kind, mint in self._mint.items():
+            info = mint.cache_info()
+            stats[kind] = {'hits': info.hits, 'misses': info.misses, 'size': info.currsize}
+        return stats
+
+    def print_cache_stats(self):
+        """Mostrar estadísticas de la caché de URIs"""
+        print("\n=== CACHÉ DE URIs ===")
+        for kind, info in self.cache_stats().items():
+            total = info['hits'] + info['misses']
+            rate = 100 * info['hits'] / total if total else 0
+            print(f"{kind}: {info['hits']} aciertos, {info['misses']} fallos "
+                  f"({rate:.1f}% de aciertos, {info['size']} en caché)")
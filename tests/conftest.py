@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Configuración de Pruebas - Proyecto Linked Data Universidades
+Rutas de src/, muestra reducida del CSV, ontología base y transformaciones completas sin salida por pantalla
+"""
+
+import contextlib
+import io
+import os
+import sys
+
+import pytest
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BASE_DIR, "src"))
+
+from rdflib import Graph
+from rdflib.namespace import DCTERMS
+
+# Dataset original y filas que se copian a la muestra de las pruebas
+CSV_PATH = os.path.join(BASE_DIR, "ISOFV163_A8_Anexo.csv")
+SAMPLE_ROWS = 200
+
+
+@pytest.fixture
+def sample_csv(tmp_path):
+    """CSV con las primeras SAMPLE_ROWS filas del dataset original"""
+    with open(CSV_PATH, "r", encoding="utf-8") as f:
+        lines = [next(f) for _ in range(SAMPLE_ROWS + 1)]
+    path = tmp_path / "muestra.csv"
+    path.write_text("".join(lines), encoding="utf-8")
+    return str(path)
+
+
+@pytest.fixture
+def ontology_path(tmp_path):
+    """Ruta de una ontología base que no existe (el transformador continúa sin ella)"""
+    return str(tmp_path / "sin_ontologia.ttl")
+
+
+@pytest.fixture
+def project_ontology(tmp_path):
+    """Ontología del proyecto guardada en Turtle, como la que genera ontology_creator"""
+    from ontology_creator import UniversityOntologyCreator
+
+    path = str(tmp_path / "ontologia.ttl")
+    quietly(UniversityOntologyCreator).g.serialize(destination=path, format="turtle", encoding="utf-8")
+    return path
+
+
+@pytest.fixture(params=[False, True], ids=["sin_ontologia", "con_ontologia"])
+def base_ontology(request, ontology_path):
+    """Ontología base ausente o la del proyecto (sus triples también deben coincidir)"""
+    return request.getfixturevalue("project_ontology") if request.param else ontology_path
+
+
+def quietly(function, *args, **kwargs):
+    """Ejecutar una función sin mostrar lo que imprime"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return function(*args, **kwargs)
+
+
+def run_transformer(csv_path, ontology_path, **options):
+    """Transformador con estudiantes, universidades, decisiones y metadatos ya generados"""
+    from data_transformer_fixed import DataTransformer
+
+    def transform():
+        transformer = DataTransformer(csv_path, ontology_path, **options)
+        transformer.transform_students()
+        transformer.transform_universities()
+        transformer.transform_academic_decisions()
+        transformer.add_metadata()
+        return transformer
+    return quietly(transform)
+
+
+def without_timestamps(graph):
+    """Copia en memoria del grafo sin dcterms:created (cambia en cada ejecución)"""
+    copy = Graph()
+    for triple in graph:
+        if triple[1] != DCTERMS.created:
+            copy.add(triple)
+    return copy
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Pruebas de la E/S Comprimida - Proyecto Linked Data Universidades
+Ida y vuelta por extensión y las mismas salidas del transformador y el exportador comprimidas
+"""
+
+import gzip
+import os
+import shutil
+
+import pytest
+from rdflib import Graph
+from rdflib.compare import isomorphic
+
+from compressed_io import COMPRESSION_EXTENSIONS, open_compressed, split_compression
+from rdf_export import export_graph
+from rdf_loader import detect_format, load_rdf
+from conftest import run_transformer, without_timestamps
+
+# Primeros bytes de cada formato de compresión
+MAGIC = {'.gz': b"\x1f\x8b", '.bz2': b"BZh", '.xz': b"\xfd7zXZ"}
+
+
+@pytest.mark.parametrize("extension", COMPRESSION_EXTENSIONS)
+def test_ida_y_vuelta_por_extension(tmp_path, extension):
+    path = str(tmp_path / f"datos.nt{extension}")
+    with open_compressed(path, "w") as f:
+        f.write("línea con acentos: ñandú\n")
+    with open(path, "rb") as f:
+        assert f.read().startswith(MAGIC[extension])
+    with open_compressed(path, "r") as f:
+        assert f.read() == "línea con acentos: ñandú\n"
+    assert split_compression(path) == (str(tmp_path / "datos.nt"), extension)
+    assert detect_format(path) == "nt"
+
+
+def test_transformador_y_exportacion_comprimidos(tmp_path, sample_csv, ontology_path):
+    graph = run_transformer(sample_csv, ontology_path, vectorized=True).g
+    compressed_csv = str(tmp_path / "muestra.csv.gz")
+    with open(sample_csv, "rb") as source, gzip.open(compressed_csv, "wb") as target:
+        shutil.copyfileobj(source, target)
+    from_gzip = run_transformer(compressed_csv, ontology_path, vectorized=True).g
+    assert isomorphic(without_timestamps(from_gzip), without_timestamps(graph))
+
+    paths = export_graph(graph, str(tmp_path / "grafo"), formats=('ttl', 'nt', 'snap'),
+                         compression="xz")
+    assert [os.path.basename(path) for path in paths] == ["grafo.ttl.xz", "grafo.nt.xz", "grafo.snap"]
+    for path in paths[:2]:
+        loaded = Graph()
+        load_rdf(loaded, path, workers=1)
+        assert isomorphic(loaded, graph), path
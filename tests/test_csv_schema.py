@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Pruebas de la Ingesta Tipada del CSV - Proyecto Linked Data Universidades
+Tipos del esquema y caché binaria, leída con mmap sin copiar las columnas, que se reutiliza
+mientras el CSV no cambie
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+import csv_schema
+from csv_schema import CSV_SCHEMA, load_csv, sidecar_path
+
+
+def test_tipos_del_esquema(sample_csv):
+    df = load_csv(sample_csv, cache=False)
+    assert list(df.columns) == list(CSV_SCHEMA)
+    assert df['edad'].dtype == "int8" and df['ranking_nacional'].dtype == "int16"
+    assert isinstance(df['ciudad_origen'].dtype, pd.CategoricalDtype)
+    assert df['puntaje_saber11'].dtype == "float64"
+    # Los valores coinciden con los de una lectura sin tipos
+    plain = pd.read_csv(sample_csv)
+    assert df['id_estudiante'].tolist() == plain['id_estudiante'].tolist()
+    assert df['ciudad_origen'].astype(str).tolist() == plain['ciudad_origen'].tolist()
+
+
+def test_cache_binaria_se_reutiliza_y_se_invalida(sample_csv, monkeypatch):
+    first = load_csv(sample_csv)
+    assert os.path.isfile(os.path.join(sidecar_path(sample_csv), "meta.json"))
+
+    def no_parse(path, **kwargs):
+        raise AssertionError(f"CSV parseado de nuevo: {path}")
+
+    monkeypatch.setattr(csv_schema, "read_typed_csv", no_parse)
+    cached = load_csv(sample_csv)
+    assert_frame_equal(cached, first, check_categorical=True)
+    monkeypatch.undo()
+
+    # Otro contenido: la caché queda obsoleta y se regenera
+    with open(sample_csv, "r", encoding="utf-8") as f:
+        lines = f.readlines()
+    with open(sample_csv, "w", encoding="utf-8") as f:
+        f.writelines(lines[:-10])
+    shorter = load_csv(sample_csv)
+    assert len(shorter) == len(first) - 10
+    assert_frame_equal(load_csv(sample_csv), shorter)
+
+
+def mapped(values):
+    """Si un arreglo es (o es una vista de) un archivo mapeado en memoria"""
+    while values is not None:
+        if isinstance(values, np.memmap):
+            return True
+        values = values.base
+    return False
+
+
+def test_columnas_de_la_cache_quedan_mapeadas(sample_csv):
+    assert not mapped(load_csv(sample_csv)['edad'].to_numpy())
+    df = load_csv(sample_csv)
+    assert mapped(df['edad'].to_numpy()) and mapped(df['puntaje_saber11'].to_numpy())
+    assert mapped(df['ciudad_origen'].cat.codes.to_numpy())
+    assert df['edad'].dtype == "int8" and isinstance(df['ciudad_origen'].dtype, pd.CategoricalDtype)
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Pruebas del Transformador - Proyecto Linked Data Universidades
+Mismos triples en los modos fila a fila, vectorizado, en streaming, por fragmentos e
+incremental (el RDF Patch lleva del volcado anterior al nuevo), con y sin la ontología base, y
+los mismos tipos de columna en los lectores por lotes que en la lectura completa
+"""
+
+import json
+import os
+from datetime import datetime
+
+from rdflib import Graph, Literal, URIRef
+from rdflib.compare import isomorphic
+from rdflib.namespace import DCTERMS
+
+from compressed_io import open_compressed
+from data_transformer_fixed import DataTransformer
+from conftest import SAMPLE_ROWS, quietly, run_transformer, without_timestamps
+
+
+def test_modo_vectorizado_produce_los_mismos_triples(sample_csv, base_ontology):
+    rows = run_transformer(sample_csv, base_ontology)
+    vectorized = run_transformer(sample_csv, base_ontology, vectorized=True)
+
+    assert len(vectorized.g) == len(rows.g)
+    assert isomorphic(without_timestamps(vectorized.g), without_timestamps(rows.g))
+    assert vectorized.stats['students'] == vectorized.stats['decisions'] == SAMPLE_ROWS
+
+
+def test_timestamp_de_ejecucion_es_uno_para_todo_el_grafo(sample_csv, ontology_path):
+    rows = run_transformer(sample_csv, ontology_path, run_timestamp=True)
+    vectorized = run_transformer(sample_csv, ontology_path, vectorized=True, run_timestamp=True)
+
+    created = set(rows.g.objects(None, DCTERMS.created))
+    assert created == {rows.run_created}
+    assert isinstance(rows.run_created, Literal)
+    # Con el mismo instante, ambos modos coinciden también en dcterms:created
+    for subject in list(vectorized.g.subjects(DCTERMS.created, None)):
+        vectorized.g.set((subject, DCTERMS.created, rows.run_created))
+    assert isomorphic(vectorized.g, rows.g)
+
+
+def test_streaming_escribe_el_mismo_grafo_sin_repetir_triples(tmp_path, sample_csv, base_ontology):
+    graph = run_transformer(sample_csv, base_ontology).g
+    path = str(tmp_path / "grafo.nt")
+    transformer = quietly(DataTransformer, sample_csv, base_ontology, streaming=True)
+    # Lotes pequeños: las entidades compartidas aparecen en varios y se escriben una vez
+    count = quietly(transformer.stream_ntriples, path, chunksize=64)
+
+    with open(path, "r", encoding="utf-8") as f:
+        lines = f.readlines()
+    assert count == len(lines) == len(set(lines)) == len(graph)
+    streamed = Graph().parse(path, format="nt")
+    assert isomorphic(without_timestamps(streamed), without_timestamps(graph))
+
+
+def test_fragmentos_en_paralelo_dan_el_mismo_archivo_con_cualquier_numero_de_procesos(
+        tmp_path, sample_csv, base_ontology):
+    graph = run_transformer(sample_csv, base_ontology).g
+    timestamp = datetime(2024, 1, 1)
+    outputs = []
+    for workers in (1, 2):
+        path = str(tmp_path / f"grafo_{workers}.nt")
+        transformer = quietly(DataTransformer, sample_csv, base_ontology, streaming=True)
+        assert quietly(transformer.transform_sharded, path, workers=workers, shard_rows=64,
+                       timestamp=timestamp) == SAMPLE_ROWS
+        with open(path, "rb") as f:
+            outputs.append(f.read())
+
+    assert outputs[0] == outputs[1]
+    merged = Graph().parse(data=outputs[0].decode("utf-8"), format="nt")
+    assert len(merged) == len(graph)
+    assert isomorphic(without_timestamps(merged), without_timestamps(graph))
+
+
+def read_lines(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return f.readlines()
+
+
+def test_patch_incremental_lleva_del_volcado_anterior_al_nuevo(tmp_path, sample_csv, base_ontology):
+    path = str(tmp_path / "grafo.nt")
+    patch_path = str(tmp_path / "cambios.rdfp")
+
+    def run():
+        transformer = quietly(DataTransformer, sample_csv, base_ontology)
+        return quietly(transformer.transform_incremental, path, patch_path=patch_path)
+
+    additions, deletions = run()
+    first = read_lines(path)
+    assert additions == set(first) and not deletions
+
+    # Sin cambios en el CSV el patch queda vacío
+    assert run() == (set(), set())
+
+    # Cambiar un puntaje y quitar la última fila
+    lines = read_lines(sample_csv)
+    fields = lines[2].split(",")
+    fields[6] = "301.5"
+    lines[2] = ",".join(fields)
+    with open(sample_csv, "w", encoding="utf-8") as f:
+        f.writelines(lines[:-1])
+    additions, deletions = run()
+    second = read_lines(path)
+    assert additions and deletions
+    assert (set(first) - deletions) | additions == set(second)
+    with open(patch_path, "r", encoding="utf-8") as f:
+        patch = f.read().splitlines()
+    assert patch[0].startswith("H id <uuid:") and patch[1].startswith("H prev <uuid:")
+    assert sum(line.startswith("A ") for line in patch) == len(additions)
+
+    dumped = Graph().parse(path, format="nt")
+    graph = run_transformer(sample_csv, base_ontology).g
+    assert isomorphic(without_timestamps(dumped), without_timestamps(graph))
+
+
+def test_manifiesto_sin_lineas_y_filas_copiadas_del_volcado_anterior(tmp_path, sample_csv, ontology_path):
+    path = str(tmp_path / "grafo.nt.gz")
+    manifest_path = path + ".manifest.json"
+
+    def run():
+        transformer = quietly(DataTransformer, sample_csv, ontology_path)
+        return quietly(transformer.transform_incremental, path)
+
+    run()
+    with open_compressed(path, "r") as f:
+        first = f.readlines()
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    # Solo hash y número de líneas por fila; las líneas están en el volcado
+    assert all(len(row) == 3 and isinstance(row[2], int) for row in manifest['rows'])
+    assert manifest['shared'] + sum(row[2] for row in manifest['rows']) + manifest['metadata'] == len(first)
+    assert os.path.getsize(manifest_path) < sum(map(len, first)) / 4
+
+    # Intercambiar dos filas: se regeneran las desplazadas sin cambiar el contenido del grafo
+    lines = read_lines(sample_csv)
+    lines[1], lines[5] = lines[5], lines[1]
+    with open(sample_csv, "w", encoding="utf-8") as f:
+        f.writelines(lines)
+    additions, deletions = run()
+    with open_compressed(path, "r") as f:
+        second = f.readlines()
+    assert (set(first) - deletions) | additions == set(second)
+    dumped = Graph().parse(data="".join(second), format="nt")
+    graph = run_transformer(sample_csv, ontology_path).g
+    assert isomorphic(without_timestamps(dumped), without_timestamps(graph))
+
+
+def test_lectores_por_lotes_usan_los_tipos_del_esquema(tmp_path, sample_csv, ontology_path):
+    # Códigos con ceros a la izquierda: sin el esquema, read_csv los leería como enteros
+    lines = read_lines(sample_csv)
+    for index in range(1, len(lines)):
+        fields = lines[index].split(",")
+        fields[8] = fields[8].lstrip("U")
+        lines[index] = ",".join(fields)
+    with open(sample_csv, "w", encoding="utf-8") as f:
+        f.writelines(lines)
+    graph = without_timestamps(run_transformer(sample_csv, ontology_path).g)
+    assert (URIRef("http://example.org/university/university_004"), None, None) in graph
+
+    streamed_path = str(tmp_path / "grafo.nt")
+    transformer = quietly(DataTransformer, sample_csv, ontology_path, streaming=True)
+    quietly(transformer.stream_ntriples, streamed_path, chunksize=64)
+    sharded_path = str(tmp_path / "fragmentos.nt")
+    transformer = quietly(DataTransformer, sample_csv, ontology_path, streaming=True)
+    quietly(transformer.transform_sharded, sharded_path, workers=1, shard_rows=64,
+            timestamp=datetime(2024, 1, 1))
+    for path in (streamed_path, sharded_path):
+        assert isomorphic(without_timestamps(Graph().parse(path, format="nt")), graph), path
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Pruebas del Registro de Entidades - Proyecto Linked Data Universidades
+Emisión única de entidades compartidas y conflictos iguales en los modos fila a fila y vectorizado
+"""
+
+from rdflib import Literal, URIRef
+from rdflib.compare import isomorphic
+from rdflib.namespace import DC, RDFS
+
+from entity_registry import EntityRegistry
+from conftest import run_transformer, without_timestamps
+
+CITY = URIRef("http://example.org/geography/city_bucaramanga")
+
+
+def with_city_variant(csv_path):
+    """Cambiar la ciudad de la primera fila por otra escritura que se acuña en la misma URI"""
+    with open(csv_path, "r", encoding="utf-8") as f:
+        lines = f.readlines()
+    fields = lines[1].split(",")
+    fields[3] = "BUCARAMANGA"
+    lines[1] = ",".join(fields)
+    with open(csv_path, "w", encoding="utf-8") as f:
+        f.writelines(lines)
+    return csv_path
+
+
+def test_registro_emite_una_vez_y_anota_conflictos():
+    registry = EntityRegistry(functional_predicates=[DC.identifier])
+    assert registry.add((CITY, DC.identifier, Literal("Bucaramanga")))
+    assert not registry.add((CITY, DC.identifier, Literal("Bucaramanga")))
+    assert registry.add((CITY, DC.identifier, Literal("BUCARAMANGA")))
+    assert registry.conflicts() == {
+        (CITY, DC.identifier): [Literal("BUCARAMANGA"), Literal("Bucaramanga")]}
+
+
+def test_modos_fila_a_fila_y_vectorizado_coinciden_con_conflictos(sample_csv, ontology_path):
+    csv_path = with_city_variant(sample_csv)
+    rows = run_transformer(csv_path, ontology_path)
+    vectorized = run_transformer(csv_path, ontology_path, vectorized=True)
+
+    assert isomorphic(without_timestamps(rows.g), without_timestamps(vectorized.g))
+    conflicts = rows.registry.conflicts()
+    assert conflicts == vectorized.registry.conflicts()
+    # Ambas escrituras de la ciudad quedan en el grafo y en el informe de conflictos
+    assert (CITY, RDFS.label) in conflicts and (CITY, DC.identifier) in conflicts
+    assert set(rows.g.objects(CITY, DC.identifier)) == {Literal("BUCARAMANGA"), Literal("Bucaramanga")}
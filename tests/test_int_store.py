@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Pruebas del Almacén de Enteros - Proyecto Linked Data Universidades
+Mismas respuestas que el store en memoria de rdflib para cada forma de patrón, también con
+escrituras entre lecturas y recorridos por tramos
+"""
+
+from itertools import product
+from random import Random
+
+from rdflib import Graph, Literal, Namespace
+from rdflib.compare import isomorphic
+
+import int_store
+from int_store import STORE_NAME, IntegerStore
+from sparql_analyzer import ANALYSIS_QUERIES, prepared_query, query_bindings
+from conftest import run_transformer
+
+EX = Namespace("http://example.org/prueba/")
+
+# Umbrales bajos: la muestra tiene pocas filas
+PARAMETERS = {
+    'migracion_geografica': {'min_flujo': 1},
+    'alto_rendimiento': {'umbral_puntaje': 300},
+}
+
+
+def test_patrones_como_el_store_de_rdflib():
+    triples = [(EX.a, EX.p, EX.b), (EX.a, EX.p, Literal(1)), (EX.b, EX.q, EX.a),
+               (EX.b, EX.p, EX.b), (EX.c, EX.q, Literal("1"))]
+    reference, graph = Graph(), Graph(store=STORE_NAME)
+    for triple in triples + triples[:2]:
+        reference.add(triple)
+        graph.add(triple)
+    assert len(graph) == len(triples)
+
+    # Las ocho formas de patrón, con términos conocidos y con uno que el store no tiene
+    for s, p, o in product([None, EX.a, EX.b, EX.z], [None, EX.p, EX.q], [None, EX.b, Literal(1)]):
+        assert set(graph.triples((s, p, o))) == set(reference.triples((s, p, o))), (s, p, o)
+
+    graph.remove((EX.a, EX.p, None))
+    reference.remove((EX.a, EX.p, None))
+    graph.add((EX.d, EX.p, EX.a))
+    reference.add((EX.d, EX.p, EX.a))
+    assert set(graph) == set(reference)
+    assert set(graph.subjects(EX.p, EX.a)) == {EX.d}
+
+
+def test_escrituras_entre_lecturas_sin_reordenar_los_indices(monkeypatch):
+    random = Random(8)
+    terms = [EX[f"t{i}"] for i in range(25)] + [Literal(i) for i in range(10)]
+    reference, graph = Graph(), Graph(store=STORE_NAME)
+    for _ in range(600):
+        triple = (random.choice(terms[:25]), random.choice(terms[:5]), random.choice(terms))
+        reference.add(triple)
+        graph.add(triple)
+    # Construir las tres permutaciones
+    assert len(graph) == len(reference)
+    assert set(graph.triples((None, EX.t1, None))) == set(reference.triples((None, EX.t1, None)))
+    assert set(graph.triples((None, None, EX.t2))) == set(reference.triples((None, None, EX.t2)))
+
+    sorted_rows = []
+    permute = IntegerStore._permute
+    monkeypatch.setattr(IntegerStore, "_permute",
+                        staticmethod(lambda spo, name: sorted_rows.append(len(spo[0])) or permute(spo, name)))
+    monkeypatch.setattr(int_store, "SCAN_ROWS", 7)
+    for step in range(30):
+        for _ in range(random.randint(1, 6)):
+            # También triples ya presentes y repetidos dentro del bloque
+            triple = (random.choice(terms[:25]), random.choice(terms[:5]), random.choice(terms))
+            reference.add(triple)
+            graph.add(triple)
+            graph.add(triple)
+        if step % 3 == 0:
+            pattern = (random.choice(terms[:25]), random.choice([None, *terms[:5]]), None)
+            reference.remove(pattern)
+            graph.remove(pattern)
+        s, p, o = random.choice(terms[:25]), random.choice(terms[:5]), random.choice(terms)
+        for pattern in [(None, None, None), (s, None, None), (None, p, None), (None, None, o), (s, None, o)]:
+            assert sorted(graph.triples(pattern)) == sorted(reference.triples(pattern)), pattern
+    assert len(graph) == len(reference)
+    # Solo se ordenaron bloques pendientes y triples quitados, nunca un índice completo
+    assert sorted_rows and max(sorted_rows) < 40
+
+
+def test_grafo_del_transformador_y_consultas(sample_csv, ontology_path):
+    default = run_transformer(sample_csv, ontology_path, vectorized=True, run_timestamp=True)
+    integer = run_transformer(sample_csv, ontology_path, vectorized=True, run_timestamp=True,
+                              store=STORE_NAME)
+    integer.g.remove((None, None, integer.run_created))
+    default.g.remove((None, None, default.run_created))
+    assert isomorphic(integer.g, default.g)
+    assert dict(integer.g.namespaces())["univ"] == dict(default.g.namespaces())["univ"]
+
+    for name in ANALYSIS_QUERIES:
+        bindings = query_bindings(PARAMETERS.get(name, {}))
+        expected = sorted(map(tuple, default.g.query(prepared_query(name), initBindings=bindings)))
+        actual = sorted(map(tuple, integer.g.query(prepared_query(name), initBindings=bindings)))
+        assert actual == expected, name
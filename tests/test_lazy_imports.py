@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Pruebas de Importación Diferida - Proyecto Linked Data Universidades
+Bibliotecas pesadas que cada comando carga al importarse (en un proceso nuevo)
+"""
+
+import json
+import subprocess
+import sys
+
+import pytest
+
+from conftest import BASE_DIR
+
+HEAVY_MODULES = ("pandas", "numpy", "plotly", "matplotlib", "seaborn", "networkx")
+
+
+def loaded_after_import(module):
+    """Bibliotecas pesadas presentes tras importar un módulo en un proceso nuevo"""
+    probe = (f"import json, sys; sys.path.insert(0, {BASE_DIR + '/src'!r}); import {module}; "
+             f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))")
+    output = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, check=True)
+    return set(json.loads(output.stdout.strip().splitlines()[-1]))
+
+
+def test_consultas_sparql_no_cargan_bibliotecas_de_graficos_ni_pandas():
+    assert loaded_after_import("sparql_analyzer") == set()
+
+
+@pytest.mark.parametrize("module", ["ontology_creator", "pipeline"])
+def test_comandos_sin_graficos_no_cargan_plotly(module):
+    assert not loaded_after_import(module) & {"plotly", "matplotlib", "seaborn"}
+
+
+def test_analisis_exploratorio_difiere_plotly_y_conserva_su_estilo():
+    loaded = loaded_after_import("data_analysis")
+    assert "plotly" not in loaded
+    assert {"matplotlib", "seaborn"} <= loaded
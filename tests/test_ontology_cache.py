@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Pruebas de la Caché de Ontología - Proyecto Linked Data Universidades
+Ontología parseada una vez, copia serializada válida mientras no cambie el archivo
+"""
+
+import os
+
+import pytest
+from rdflib import Graph
+from rdflib.compare import isomorphic
+
+import ontology_cache
+from ontology_cache import CACHE_SUFFIX, clear_shared, load_ontology
+from conftest import run_transformer
+
+
+@pytest.fixture
+def ontology_file(project_ontology):
+    """Ontología del proyecto sin instancias compartidas de otras pruebas"""
+    clear_shared()
+    yield project_ontology
+    clear_shared()
+
+
+def test_parseada_una_vez_y_reutilizada(ontology_file, monkeypatch):
+    parsed = Graph().parse(ontology_file, format="turtle")
+    ontology = load_ontology(ontology_file)
+    assert os.path.isfile(ontology_file + CACHE_SUFFIX)
+    assert load_ontology(ontology_file) is ontology
+
+    def no_parse(path, digest):
+        raise AssertionError(f"Ontología parseada de nuevo: {path}")
+
+    # Nuevo proceso (sin instancia compartida): se lee la copia serializada
+    monkeypatch.setattr(ontology_cache, "parse_ontology", no_parse)
+    clear_shared()
+    cached = load_ontology(ontology_file)
+    assert cached is not ontology and len(cached) == len(parsed)
+    graph = Graph()
+    cached.add_to(graph)
+    assert isomorphic(graph, parsed)
+    assert dict(graph.namespaces())["univ"] == dict(parsed.namespaces())["univ"]
+
+    # Otro contenido: la copia serializada deja de valer
+    with open(ontology_file, "a", encoding="utf-8") as f:
+        f.write("<http://example.org/a> <http://example.org/p> <http://example.org/b> .\n")
+    with pytest.raises(AssertionError):
+        load_ontology(ontology_file)
+    monkeypatch.undo()
+    assert len(load_ontology(ontology_file)) == len(parsed) + 1
+
+
+def test_transformador_incluye_la_ontologia(ontology_file, sample_csv):
+    graph = run_transformer(sample_csv, ontology_file, vectorized=True).g
+    parsed = Graph().parse(ontology_file, format="turtle")
+    assert all(triple in graph for triple in parsed)
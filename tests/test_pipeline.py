@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Pruebas del Orquestador - Proyecto Linked Data Universidades
+Huellas de contenido, orden de las etapas y omisión de las que no cambiaron
+"""
+
+import os
+
+from compressed_io import file_digest
+from pipeline import Fingerprints, Pipeline
+
+# Dos etapas encadenadas (módulos inexistentes: solo cuentan los archivos declarados)
+STAGES = {
+    'preparar': {'module': "etapa_de_prueba", 'inputs': ["datos.csv"], 'outputs': ["limpio.csv"]},
+    'resumir': {'module': "etapa_de_prueba", 'inputs': ["limpio.csv"], 'outputs': ["resumen.json"]},
+}
+
+
+def write(path, text):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def test_huella_igual_a_la_de_la_cache_de_consultas(tmp_path):
+    path = str(tmp_path / "datos.csv")
+    write(path, "a,b\n1,2\n")
+    fingerprints = Fingerprints()
+    assert fingerprints.digest(path) == file_digest(path)
+    stat = os.stat(path)
+    assert fingerprints.cache[path] == [stat.st_size, stat.st_mtime_ns, file_digest(path)]
+    assert fingerprints.digest(str(tmp_path / "no_existe")) is None
+
+
+def test_omite_etapas_sin_cambios_e_invalida_dependientes(tmp_path):
+    for name in ("datos.csv", "limpio.csv", "resumen.json"):
+        write(str(tmp_path / name), name)
+    pipeline = Pipeline(base_dir=str(tmp_path), stages=STAGES, state_file="estado.json")
+    assert pipeline.order == ["preparar", "resumir"]
+    assert pipeline.plan() == {'preparar': "sin ejecución previa", 'resumir': "depende de 'preparar'"}
+
+    # Estado tras una ejecución completa
+    for name in STAGES:
+        pipeline.state['stages'][name] = pipeline.input_hashes(name)
+    pipeline.save_state()
+    reloaded = Pipeline(base_dir=str(tmp_path), stages=STAGES, state_file="estado.json")
+    assert reloaded.plan() == {'preparar': None, 'resumir': None}
+
+    write(str(tmp_path / "datos.csv"), "otro contenido")
+    assert reloaded.plan() == {'preparar': "cambió datos.csv", 'resumir': "depende de 'preparar'"}
+    os.remove(str(tmp_path / "resumen.json"))
+    assert reloaded.plan(only=["resumir"]) == {'resumir': "falta resumen.json"}
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Pruebas de la Caché de Consultas - Proyecto Linked Data Universidades
+Claves normalizadas, aciertos por capa, versión del grafo sin leer los archivos binarios y
+ediciones del grafo en memoria que no cambian su tamaño
+"""
+
+import os
+
+import pytest
+from rdflib import Graph, Literal, Namespace
+from rdflib.namespace import DC
+
+import sparql_analyzer
+from compressed_io import file_stamp
+from query_cache import QueryCache, graph_fingerprint
+from rdf_snapshot import write_snapshot
+from sparql_analyzer import ANALYSIS_SUITE, SPARQLPatternAnalyzer
+from conftest import quietly, run_transformer
+
+EX = Namespace("http://example.org/prueba/")
+
+
+def test_clave_normaliza_espacios_y_distingue_parametros_y_limite():
+    key = QueryCache.key("SELECT ?s\n  WHERE { ?s ?p 'a  b' }", "v1")
+    assert key == QueryCache.key("SELECT ?s WHERE {  ?s ?p 'a  b' }", "v1")
+    assert key != QueryCache.key("SELECT ?s WHERE { ?s ?p 'a b' }", "v1")
+    assert key != QueryCache.key("SELECT ?s WHERE { ?s ?p 'a  b' }", "v2")
+    assert key != QueryCache.key("SELECT ?s WHERE { ?s ?p 'a  b' }", "v1", {'min_flujo': 50})
+    assert key != QueryCache.key("SELECT ?s WHERE { ?s ?p 'a  b' }", "v1", limit=10)
+
+
+def test_aciertos_en_memoria_y_en_disco(tmp_path):
+    cache = QueryCache(str(tmp_path))
+    key = QueryCache.key("SELECT * WHERE { ?s ?p ?o }", "v1")
+    assert cache.get(key) is None
+    cache.put(key, {'vars': ['s'], 'results': [], 'lines': []})
+    assert cache.get(key) == {'vars': ['s'], 'results': [], 'lines': []}
+
+    fresh = QueryCache(str(tmp_path))
+    assert fresh.get(key) == {'vars': ['s'], 'results': [], 'lines': []}
+    assert fresh.get(key) is not None
+    stats = fresh.stats()
+    assert (stats['memory_hits'], stats['disk_hits'], stats['misses']) == (1, 1, 0)
+
+
+def test_huella_del_grafo_no_depende_del_orden():
+    triples = [(EX.a, EX.p, Literal(1)), (EX.b, EX.p, Literal("x")), (EX.a, EX.q, EX.b)]
+    forward, backward = Graph(), Graph()
+    for triple in triples:
+        forward.add(triple)
+    for triple in reversed(triples):
+        backward.add(triple)
+    assert graph_fingerprint(forward) == graph_fingerprint(backward)
+    backward.remove(triples[0])
+    assert graph_fingerprint(forward) != graph_fingerprint(backward)
+
+
+def test_snapshot_se_versiona_sin_leer_su_contenido(tmp_path, monkeypatch):
+    graph = Graph()
+    graph.add((EX.a, EX.p, Literal(1)))
+    path = str(tmp_path / "grafo.snap")
+    write_snapshot(graph, path)
+
+    def no_digest(path):
+        raise AssertionError(f"Huella completa de {path}")
+
+    monkeypatch.setattr(sparql_analyzer, "file_digest", no_digest)
+    analyzer = quietly(SPARQLPatternAnalyzer, path)
+    assert analyzer.graph_version() == f".snap-{file_stamp(path)}"
+
+    # Reescribir el snapshot cambia la versión (y con ella las claves de la caché)
+    graph.add((EX.b, EX.p, Literal(2)))
+    write_snapshot(graph, path)
+    assert quietly(SPARQLPatternAnalyzer, path).graph_version() != analyzer.graph_version()
+
+
+@pytest.mark.parametrize("binary", [False, True])
+def test_huella_completa_solo_para_rdf_en_texto(tmp_path, binary):
+    path = str(tmp_path / ("grafo.snap" if binary else "grafo.nt"))
+    graph = Graph()
+    graph.add((EX.a, EX.p, Literal(1)))
+    if binary:
+        write_snapshot(graph, path)
+    else:
+        graph.serialize(destination=path, format="nt")
+    analyzer = quietly(SPARQLPatternAnalyzer, path)
+    stat = os.stat(path)
+    stamped = analyzer.source_digest == f"{stat.st_size}-{stat.st_mtime_ns}-{stat.st_ino}"
+    assert stamped == binary
+
+
+def test_edicion_del_mismo_tamano_invalida_la_cache(sample_csv, ontology_path):
+    graph = run_transformer(sample_csv, ontology_path, vectorized=True).g
+    analyzer = quietly(SPARQLPatternAnalyzer, graph)
+    quietly(analyzer.run_suite, 1)
+    name = analyzer.query_results['popularidad_universidades']['results'][0]['nombre']
+    university = next(s for s, title in graph.subject_objects(DC.title) if str(title) == name)
+
+    # Cambiar el nombre en su sitio: mismo número de triples, otra huella
+    size, version = len(graph), analyzer.graph_version()
+    graph.set((university, DC.title, Literal("Universidad renombrada")))
+    assert len(graph) == size and analyzer.graph_version() != version
+    quietly(analyzer.run_suite, 1)
+    names = [row['nombre'] for row in analyzer.query_results['popularidad_universidades']['results']]
+    assert "Universidad renombrada" in names and name not in names
+    assert analyzer.cache.stats()['memory_hits'] == 0
+
+    # Sin más cambios, la siguiente ejecución sale entera de la caché
+    quietly(analyzer.run_suite, 1)
+    assert analyzer.cache.stats()['memory_hits'] == len(ANALYSIS_SUITE)
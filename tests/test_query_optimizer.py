@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Pruebas del Optimizador de Consultas - Proyecto Linked Data Universidades
+Mismas filas que rdflib con los patrones reordenados y los FILTER adelantados
+"""
+
+from collections import Counter
+
+import pytest
+from rdflib import Graph, Variable
+from rdflib.plugins.sparql import prepareQuery
+
+from query_optimizer import QueryOptimizer, is_variable
+from sparql_analyzer import ANALYSIS_NAMESPACES, ANALYSIS_QUERIES, prepared_query, query_bindings
+from conftest import run_transformer
+
+PARAMETERS = {
+    'migracion_geografica': {'min_flujo': 1},
+    'alto_rendimiento': {'umbral_puntaje': 300},
+}
+
+# Formas que el gancho no reescribe o que dependen del ámbito del FILTER
+EXTRA_QUERIES = [
+    """SELECT ?estudiante ?ciudad WHERE {
+           ?estudiante univ:appliesTo ?universidad .
+           OPTIONAL { ?estudiante geo:originFrom ?ciudad . ?ciudad dc:identifier "Cali" }
+       }""",
+    """SELECT ?estudiante WHERE {
+           ?estudiante edu:saber11Score ?puntaje .
+           FILTER NOT EXISTS { ?estudiante edu:prefersArea ?area . ?area dc:identifier "Salud" }
+       }""",
+    """SELECT ?universidad (COUNT(?estudiante) AS ?n) WHERE {
+           ?estudiante univ:appliesTo ?universidad .
+           { ?estudiante univ:age ?edad FILTER(?edad < 18) }
+           UNION
+           { ?estudiante univ:socioeconomicStratum ?estrato FILTER(?estrato > 4 && ?universidad != ?estudiante) }
+       } GROUP BY ?universidad""",
+]
+
+
+@pytest.fixture
+def graph(sample_csv, ontology_path):
+    return run_transformer(sample_csv, ontology_path, vectorized=True).g
+
+
+def rows(graph, prepared, bindings=None):
+    return Counter(tuple(row) for row in graph.query(prepared, initBindings=bindings or {}))
+
+
+def test_mismas_filas_que_rdflib(graph):
+    optimizer = QueryOptimizer(graph)
+    queries = [(prepared_query(name), query_bindings(PARAMETERS.get(name, {})))
+               for name in ANALYSIS_QUERIES]
+    queries += [(prepareQuery(text, initNs=ANALYSIS_NAMESPACES), {}) for text in EXTRA_QUERIES]
+    expected = [rows(graph, prepared, bindings) for prepared, bindings in queries]
+    optimizer.enable()
+    try:
+        actual = [rows(graph, prepared, bindings) for prepared, bindings in queries]
+        assert optimizer.plans
+    finally:
+        optimizer.disable()
+    assert actual == expected
+    assert all(expected[:len(ANALYSIS_QUERIES)])
+
+
+def test_orden_conectado_y_filtro_al_enlazar_sus_variables(graph):
+    optimizer = QueryOptimizer(graph)
+    node = prepared_query('alto_rendimiento').algebra
+    while node.name != "Filter":
+        node = node.p
+    # ?umbral_puntaje llega enlazado como parámetro
+    threshold = Variable("umbral_puntaje")
+    steps = optimizer.order(node.p.triples, frozenset([threshold]), [node.expr])
+
+    bound = {threshold}
+    for position, (triple, conditions) in enumerate(steps):
+        variables = {term for term in triple if is_variable(term)}
+        # Cada patrón tras el primero comparte alguna variable con los anteriores
+        assert position == 0 or bound & variables
+        # El FILTER se comprueba en el paso que enlaza ?puntaje, no al final
+        assert bool(conditions) == (Variable("puntaje") in variables - bound)
+        bound |= variables
+    assert sum(len(conditions) for _, conditions in steps) == 1
+
+
+def test_solo_afecta_a_su_grafo(graph):
+    other = Graph()
+    for triple in graph:
+        other.add(triple)
+    optimizer = QueryOptimizer(graph).enable()
+    try:
+        prepared = prepared_query('preferencias_area')
+        expected = rows(other, prepared)
+        assert not optimizer.plans
+        assert rows(graph, prepared) == expected and optimizer.plans
+    finally:
+        optimizer.disable()
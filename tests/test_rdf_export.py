@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Pruebas de la Exportación Multiformato - Proyecto Linked Data Universidades
+Cada formato se relee como el mismo grafo, los triples se agrupan por sujeto en una pasada, la
+exportación en paralelo escribe lo mismo que la secuencial y cada línea NDJSON es un documento
+JSON-LD independiente
+"""
+
+import json
+
+import pytest
+from rdflib import Graph, Literal, URIRef
+from rdflib.compare import isomorphic
+
+from compressed_io import open_compressed
+from int_store import STORE_NAME
+from rdf_export import DEFAULT_FORMATS, context_path, export_graph, subject_grouped_triples
+from rdf_snapshot import load_snapshot
+from conftest import run_transformer
+
+# Extensión -> formato de rdflib para releer la exportación
+PARSE_FORMATS = {'rdf': "xml", 'ttl': "turtle", 'nt': "nt", 'jsonld': "json-ld"}
+
+
+def read_graph(extension, path):
+    if extension == 'snap':
+        return Graph(store=load_snapshot(path))
+    return Graph().parse(path, format=PARSE_FORMATS[extension])
+
+
+def test_exportacion_paralela_igual_a_la_secuencial(tmp_path, sample_csv, ontology_path):
+    graph = run_transformer(sample_csv, ontology_path, vectorized=True).g
+    parallel = export_graph(graph, str(tmp_path / "paralelo"))
+    sequential = export_graph(graph, str(tmp_path / "secuencial"), parallel=False)
+    assert [path.rsplit(".", 1)[1] for path in parallel] == list(DEFAULT_FORMATS)
+
+    for extension, first, second in zip(DEFAULT_FORMATS, parallel, sequential):
+        with open(first, "rb") as a, open(second, "rb") as b:
+            assert a.read() == b.read(), extension
+        assert isomorphic(read_graph(extension, first), graph), extension
+
+
+class CountingGraph(Graph):
+    """Grafo que cuenta las consultas de patrones al store"""
+
+    calls = 0
+
+    def triples(self, triple):
+        CountingGraph.calls += 1
+        return super().triples(triple)
+
+
+@pytest.mark.parametrize("store", ["default", STORE_NAME])
+def test_triples_agrupados_por_sujeto_en_una_pasada(store):
+    graph = CountingGraph(store=store)
+    subjects = [URIRef(f"http://example.org/s{index}") for index in range(20)]
+    # Sujetos intercalados al insertar
+    for value in range(5):
+        for subject in subjects:
+            graph.add((subject, URIRef("http://example.org/p"), Literal(value)))
+    CountingGraph.calls = 0
+    triples = list(subject_grouped_triples(graph))
+    assert CountingGraph.calls <= 1
+    assert sorted(triples) == sorted(graph)
+    runs = [subject for index, (subject, _, _) in enumerate(triples)
+            if index == 0 or triples[index - 1][0] != subject]
+    assert len(runs) == len(subjects)
+
+
+def test_formato_desconocido(tmp_path):
+    with pytest.raises(ValueError):
+        export_graph(Graph(), str(tmp_path / "grafo"), formats=('ttl', 'n3'))
+
+
+def test_ndjson_una_entidad_por_linea_con_contexto_externo(tmp_path, sample_csv, ontology_path):
+    graph = run_transformer(sample_csv, ontology_path, vectorized=True).g
+    path, = export_graph(graph, str(tmp_path / "grafo"), formats=('ndjson',), compression="gz")
+    assert path.endswith(".ndjson.gz")
+    with open(context_path(path), "r", encoding="utf-8") as f:
+        context = json.load(f)['@context']
+    assert context['univ'] == "http://example.org/university/"
+
+    with open_compressed(path, "r") as f:
+        lines = f.read().splitlines()
+    assert len(lines) == len(set(graph.subjects()))
+    merged = Graph()
+    for line in lines:
+        entity = json.loads(line)
+        assert entity['@context'] == "grafo.context.jsonld"
+        # Cada línea se interpreta por sí sola con el contexto compartido
+        entity['@context'] = context
+        merged.parse(data=json.dumps(entity), format="json-ld")
+    assert isomorphic(merged, graph)
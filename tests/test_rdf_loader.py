@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Pruebas de la Carga Paralela de RDF - Proyecto Linked Data Universidades
+Fragmentos pequeños parseados en varios procesos dan el mismo grafo que rdflib, reutilizando
+cada término ya construido aunque sea un literal falso
+"""
+
+import pytest
+from rdflib import BNode, Graph, Literal, Namespace
+from rdflib.compare import isomorphic
+
+import rdf_loader
+from rdf_loader import _parse_chunk, detect_format, load_rdf, merge_chunk, turtle_chunks
+from conftest import run_transformer
+
+EX = Namespace("http://example.org/prueba/")
+
+
+@pytest.mark.parametrize("extension, rdf_format", [("nt", "nt"), ("ttl", "turtle")])
+def test_carga_por_fragmentos_igual_al_parseo_completo(tmp_path, sample_csv, ontology_path,
+                                                       extension, rdf_format):
+    graph = run_transformer(sample_csv, ontology_path, vectorized=True).g
+    path = str(tmp_path / f"grafo.{extension}")
+    graph.serialize(destination=path, format=rdf_format, encoding="utf-8")
+
+    loaded = Graph()
+    count, seconds = load_rdf(loaded, path, workers=2, chunk_bytes=4096)
+    assert count == len(graph) and seconds >= 0
+    assert isomorphic(loaded, graph)
+
+
+def test_nodos_en_blanco_y_cadenas_largas(tmp_path):
+    text = ('@prefix ex: <http://example.org/prueba/> .\n'
+            'ex:a ex:p """primera línea\n'
+            'ex:b ex:p ex:c .\n'
+            'última""" .\n'
+            'ex:a ex:q ex:b .\n'
+            'ex:d ex:r _:nodo .\n'
+            '_:nodo ex:s "x" .\n')
+    path = tmp_path / "grafo.ttl"
+    path.write_text(text, encoding="utf-8")
+
+    # Ningún corte cae dentro de la cadena larga y las directivas se repiten en cada fragmento
+    chunks = list(turtle_chunks(text.splitlines(keepends=True), 1))
+    assert all(header.startswith("@prefix") for header, _ in chunks[1:])
+    assert any('"""primera' in chunk and 'última"""' in chunk for _, chunk in chunks)
+
+    loaded = Graph()
+    load_rdf(loaded, str(path), workers=2, chunk_bytes=1)
+    assert isomorphic(loaded, Graph().parse(str(path), format="turtle"))
+    # El nodo en blanco conserva su identidad entre las dos sentencias
+    node = loaded.value(EX.d, EX.r)
+    assert isinstance(node, BNode) and loaded.value(node, EX.s) == Literal("x")
+
+
+def test_formato_por_contenido_sin_extension(tmp_path):
+    path = tmp_path / "datos"
+    path.write_text("@prefix ex: <http://example.org/prueba/> .\nex:a ex:p ex:b .\n", encoding="utf-8")
+    assert detect_format(str(path)) == "turtle"
+    path.write_text("<http://example.org/a> <http://example.org/p> <http://example.org/b> .\n",
+                    encoding="utf-8")
+    assert detect_format(str(path)) == "nt"
+
+
+def test_literales_falsos_se_construyen_una_vez(monkeypatch):
+    header = ("@prefix ex: <http://example.org/prueba/> .\n"
+              "@prefix xsd: <http://www.w3.org/2001/XMLSchema#> .\n")
+    text = 'ex:a ex:p "" .\nex:a ex:q "0"^^xsd:integer .\nex:a ex:r "false"^^xsd:boolean .\n'
+    built = []
+    key_term = rdf_loader.key_term
+
+    def counting_key_term(key):
+        built.append(key)
+        return key_term(key)
+
+    monkeypatch.setattr(rdf_loader, "key_term", counting_key_term)
+    graph = Graph()
+    terms = {}
+    for _ in range(2):
+        merge_chunk(graph, _parse_chunk(header, text, "turtle"), terms)
+    # Cuatro URIs y tres literales, cada uno construido una sola vez en los dos fragmentos
+    assert len(built) == len(set(built)) == len(terms) == 7
+    assert not Literal("") and not Literal(0) and not Literal(False)
+    assert set(graph.objects()) == {Literal(""), Literal(0), Literal(False)}
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Pruebas del Snapshot Binario - Proyecto Linked Data Universidades
+Ida y vuelta del snapshot, consultas sobre el mapeo sin decodificar las columnas enteras y
+escritura desde los identificadores de un IntegerStore
+"""
+
+import numpy as np
+from rdflib import RDF, Graph, Literal, Namespace, URIRef
+from rdflib.compare import isomorphic
+
+import int_store
+import rdf_snapshot
+from int_store import STORE_NAME, IntegerStore
+from rdf_snapshot import PackedColumn, load_snapshot, write_snapshot
+from conftest import run_transformer
+
+EX = Namespace("http://example.org/prueba/")
+
+
+def test_snapshot_ida_y_vuelta(tmp_path, sample_csv, ontology_path):
+    graph = run_transformer(sample_csv, ontology_path).g
+    path = str(tmp_path / "grafo.snap")
+    assert write_snapshot(graph, path) == len(graph)
+
+    loaded = Graph(store=load_snapshot(path))
+    assert len(loaded) == len(graph)
+    assert isomorphic(loaded, graph)
+    assert dict(loaded.namespaces())["univ"] == URIRef("http://example.org/university/")
+    # Consultas por predicado y por objeto (índices POS y OSP)
+    predicate = URIRef("http://example.org/education/prefersArea")
+    assert set(loaded.triples((None, predicate, None))) == set(graph.triples((None, predicate, None)))
+    area = next(graph.objects(None, predicate))
+    assert set(loaded.subjects(predicate, area)) == set(graph.subjects(predicate, area))
+
+
+def test_consultas_sobre_el_mapeo_decodifican_solo_las_filas_que_tocan(tmp_path, monkeypatch):
+    graph = Graph()
+    graph.add((EX.b, EX.p, Literal("1.50", datatype=URIRef("http://www.w3.org/2001/XMLSchema#decimal"))))
+    graph.add((EX.a, EX.q, Literal("hola", lang="es")))
+    graph.add((EX.a, EX.p, EX.b))
+    for i in range(200):
+        graph.add((EX[f"s{i}"], EX.r, Literal(i)))
+    path = str(tmp_path / "grafo.snap")
+    write_snapshot(graph, path)
+
+    store = load_snapshot(path)
+    assert list(store._indexes) == ["spo", "pos", "osp"]
+    assert all(isinstance(column, PackedColumn) for columns in store._indexes.values() for column in columns)
+    decoded = []
+    unpack = rdf_snapshot.unpack_bits
+    monkeypatch.setattr(rdf_snapshot, "unpack_bits",
+                        lambda buffer, start, stop, *args: decoded.append(stop - start) or
+                        unpack(buffer, start, stop, *args))
+
+    loaded = Graph(store=store)
+    assert str(loaded.value(EX.b, EX.p)) == "1.50"
+    assert set(loaded.subjects(EX.p, None)) == {EX.a, EX.b}
+    assert set(loaded.subjects(EX.q, Literal("hola", lang="es"))) == {EX.a}
+    assert set(loaded.subjects(None, Literal(7))) == {EX.s7}
+    # Cada consulta decodifica solo las filas de su rango, no las 203 de cada columna
+    assert decoded and max(decoded) <= 2
+    assert all(isinstance(column, PackedColumn) for columns in store._indexes.values() for column in columns)
+
+    # El recorrido completo va por tramos de SCAN_ROWS filas
+    monkeypatch.setattr(int_store, "SCAN_ROWS", 64)
+    decoded.clear()
+    assert set(loaded) == set(graph)
+    assert max(decoded) == 64
+
+
+def test_escritura_desde_integer_store_sin_recorrer_los_triples(tmp_path, sample_csv, ontology_path, monkeypatch):
+    graph = run_transformer(sample_csv, ontology_path, vectorized=True, store=STORE_NAME).g
+    graph.remove((None, RDF.type, None))
+    memory = Graph()
+    for triple in graph:
+        memory.add(triple)
+
+    def no_scan(self, pattern, context=None):
+        raise AssertionError("Triples recorridos uno a uno")
+
+    monkeypatch.setattr(IntegerStore, "triples", no_scan)
+    path = str(tmp_path / "grafo.snap")
+    assert write_snapshot(graph, path) == len(memory)
+    monkeypatch.undo()
+    # Los términos que solo aparecían en los triples quitados no entran en el diccionario
+    store = load_snapshot(path)
+    assert len(store.dictionary) < len(graph.store.dictionary)
+    assert set(Graph(store=store)) == set(memory)
+    # Mismo diccionario e identificadores que al escribir recorriendo el grafo
+    copy = str(tmp_path / "copia.snap")
+    write_snapshot(memory, copy)
+    copied = load_snapshot(copy)
+    assert len(copied.dictionary) == len(store.dictionary)
+    for name, columns in store._indexes.items():
+        assert all(np.array_equal(a, b) for a, b in zip(columns, copied._indexes[name])), name
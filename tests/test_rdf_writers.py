@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Pruebas de los Escritores en Streaming - Proyecto Linked Data Universidades
+Ida y vuelta de N-Triples, Turtle y RDF/XML, y agrupación por sujeto en Turtle
+"""
+
+import io
+
+import pytest
+from rdflib import Graph, Literal, Namespace
+from rdflib.compare import isomorphic
+
+from rdf_writers import NTriplesWriter, TurtleWriter, RDFXMLWriter
+from conftest import run_transformer
+
+EX = Namespace("http://example.org/prueba/")
+OTHER = Namespace("http://example.net/sin_prefijo/")
+
+
+def serialize(writer_class, graph):
+    """Texto escrito por un escritor con los triples del grafo agrupados por sujeto"""
+    stream = io.StringIO()
+    if writer_class is NTriplesWriter:
+        writer = writer_class(stream)
+    else:
+        writer = writer_class(stream, graph.namespaces())
+    writer.write_triples(sorted(graph))
+    if hasattr(writer, "close"):
+        writer.close()
+    return stream.getvalue()
+
+
+@pytest.mark.parametrize("writer_class, rdf_format", [
+    (NTriplesWriter, "nt"), (TurtleWriter, "turtle"), (RDFXMLWriter, "xml")])
+def test_escritores_ida_y_vuelta(writer_class, rdf_format, sample_csv, ontology_path):
+    graph = run_transformer(sample_csv, ontology_path).g
+    parsed = Graph().parse(data=serialize(writer_class, graph), format=rdf_format)
+    assert isomorphic(parsed, graph)
+
+
+def test_turtle_declara_prefijos_al_inicio_y_agrupa_cada_sujeto():
+    graph = Graph()
+    graph.bind("ex", EX)
+    graph.add((EX.a, EX.p, Literal(1)))
+    graph.add((EX.a, OTHER.q, Literal("x")))
+    graph.add((EX.a, EX.r, OTHER.c))
+    graph.add((EX.b, EX.p, Literal(2)))
+    text = serialize(TurtleWriter, graph)
+
+    header, body = text.split("\n\n", 1)
+    assert all(line.startswith("@prefix ") for line in header.splitlines())
+    assert "@prefix ex: <http://example.org/prueba/> ." in header
+    assert "@prefix" not in body
+    # Un namespace sin prefijo no interrumpe el grupo del sujeto: URIs completas
+    assert body.count(" .\n") == 2
+    assert f"<{OTHER.q}>" in body and f"<{OTHER.c}>" in body
+    assert isomorphic(Graph().parse(data=text, format="turtle"), graph)
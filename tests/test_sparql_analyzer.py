@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Pruebas del Analizador SPARQL - Proyecto Linked Data Universidades
+Grafo recibido del transformador sin copiarlo y consultas guardadas con los resultados,
+ejecutables por sí solas y con las mismas filas, también al ejecutar la suite en paralelo
+"""
+
+import contextlib
+import io
+from collections import Counter
+
+from rdflib import Graph
+
+from int_store import STORE_NAME
+from sparql_analyzer import (ANALYSIS_NAMESPACES, ANALYSIS_QUERIES, ANALYSIS_SUITE, SPARQLPatternAnalyzer,
+                             effective_query)
+from conftest import quietly, run_transformer
+
+
+def test_consulta_efectiva_declara_prefijos_y_sustituye_parametros():
+    text = effective_query(ANALYSIS_QUERIES['alto_rendimiento'], ANALYSIS_NAMESPACES,
+                           {'umbral_puntaje': 350}, 20)
+    assert text.startswith("PREFIX univ: <http://example.org/university/>\n")
+    assert "PREFIX geo:" not in text
+    assert "?umbral_puntaje" not in text
+    assert 'FILTER(?puntaje > "350"^^<http://www.w3.org/2001/XMLSchema#integer>)' in text
+    assert text.endswith("\nLIMIT 20")
+    # Las variables dentro de cadenas y los prefijos ya declarados no se tocan
+    text = effective_query("PREFIX dc: <http://purl.org/dc/elements/1.1/>\n"
+                           "SELECT ?x WHERE { ?x dc:title \"?min_flujo\" }",
+                           ANALYSIS_NAMESPACES, {'min_flujo': 3})
+    assert text.count("PREFIX dc:") == 1
+    assert '"?min_flujo"' in text
+
+
+def test_consulta_guardada_reproduce_los_resultados(sample_csv, ontology_path):
+    graph = run_transformer(sample_csv, ontology_path).g
+    analyzer = quietly(SPARQLPatternAnalyzer, graph, use_cache=False)
+    quietly(analyzer.analyze_geographic_migration, min_flow=1)
+    quietly(analyzer.analyze_high_performers, min_score=300, limit=5)
+
+    # Grafo sin los prefijos del proyecto: la consulta guardada debe declararlos
+    bare = Graph(bind_namespaces="none")
+    for triple in graph:
+        bare.add(triple)
+    for name in ('migracion_geografica', 'alto_rendimiento'):
+        stored = analyzer.query_results[name]
+        result = bare.query(stored['query'])
+        rows = [{str(var): str(row[var]) for var in result.vars} for row in result]
+        assert stored['results'] and len(rows) == stored['count']
+        # Con LIMIT las filas pueden cambiar entre empates del ORDER BY: solo se compara sin él
+        if name == 'migracion_geografica':
+            assert Counter(map(repr, rows)) == Counter(map(repr, stored['results']))
+    assert analyzer.query_results['alto_rendimiento']['parameters'] == {'umbral_puntaje': 300, 'limit': 5}
+
+
+def test_grafo_o_store_recibidos_sin_copiar(tmp_path, sample_csv, ontology_path):
+    transformer = run_transformer(sample_csv, ontology_path, vectorized=True, store=STORE_NAME)
+    path = str(tmp_path / "grafo.nt")
+    transformer.g.serialize(destination=path, format="nt", encoding="utf-8")
+
+    from_graph = quietly(SPARQLPatternAnalyzer, transformer.g)
+    from_store = quietly(SPARQLPatternAnalyzer, transformer.g.store)
+    from_file = quietly(SPARQLPatternAnalyzer, path, load_workers=1)
+    assert from_graph.g is transformer.g
+    assert from_store.g.store is transformer.g.store
+
+    for analyzer in (from_graph, from_store, from_file):
+        quietly(analyzer.analyze_area_preferences)
+        quietly(analyzer.analyze_university_popularity)
+    for name in ('preferencias_area', 'popularidad_universidades'):
+        expected = Counter(map(repr, from_file.query_results[name]['results']))
+        assert Counter(map(repr, from_graph.query_results[name]['results'])) == expected
+        assert Counter(map(repr, from_store.query_results[name]['results'])) == expected
+
+
+def test_suite_en_paralelo_igual_a_la_secuencial(sample_csv, ontology_path):
+    graph = run_transformer(sample_csv, ontology_path, vectorized=True).g
+    runs = []
+    for workers in (1, 3):
+        analyzer = quietly(SPARQLPatternAnalyzer, graph)
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            results = analyzer.run_suite(workers)
+        runs.append((output.getvalue(), results, analyzer.cache))
+
+    (sequential_output, sequential, _), (parallel_output, parallel, cache) = runs
+    assert list(parallel) == list(sequential) and len(parallel) == len(ANALYSIS_SUITE)
+    assert parallel == sequential
+    assert parallel_output == sequential_output
+    # Las entradas de caché de los procesos hijos se incorporan a la del proceso padre
+    assert len(cache.memory) == len(ANALYSIS_SUITE)
+    assert cache.stats()['misses'] == len(ANALYSIS_SUITE)
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Pruebas del Store SQLite - Proyecto Linked Data Universidades
+Ida y vuelta de triples y namespaces, y reescritura del store por el transformador
+"""
+
+from rdflib import Graph, Literal, Namespace, URIRef
+from rdflib.compare import isomorphic
+
+from sqlite_store import SQLiteStore, open_store
+from conftest import run_transformer, without_timestamps
+
+EX = Namespace("http://example.org/prueba/")
+
+
+def test_round_trip_conserva_triples_y_namespaces(tmp_path):
+    path = str(tmp_path / "grafo.sqlite")
+    graph = Graph(store=open_store(path))
+    graph.bind("ex", EX)
+    triples = [(EX.a, EX.p, Literal("1.50", datatype=URIRef("http://www.w3.org/2001/XMLSchema#decimal"))),
+               (EX.a, EX.q, Literal("hola", lang="es")),
+               (EX.b, EX.q, EX.a)]
+    for triple in triples:
+        graph.add(triple)
+    graph.close()
+
+    reopened = Graph(store=SQLiteStore(path, read_only=True))
+    assert set(reopened) == set(triples)
+    assert len(reopened) == len(triples)
+    assert dict(reopened.namespaces())["ex"] == URIRef(EX)
+    # La forma léxica de los literales no se normaliza
+    assert str(reopened.value(EX.a, EX.p)) == "1.50"
+
+
+def test_transformador_reescribe_un_store_existente(tmp_path, sample_csv, ontology_path):
+    path = str(tmp_path / "datos.sqlite")
+    sizes = []
+    for _ in range(2):
+        transformer = run_transformer(sample_csv, ontology_path, store=path)
+        expected = len(transformer.g)
+        transformer.g.close()
+        # Sin triples de la ejecución anterior (p. ej. timestamps dcterms:created antiguos)
+        sizes.append((expected, len(set(Graph(store=SQLiteStore(path, read_only=True))))))
+    assert sizes[0] == sizes[1]
+    assert sizes[1][0] == sizes[1][1]
+
+
+def test_store_sqlite_equivale_al_grafo_en_memoria(tmp_path, sample_csv, ontology_path):
+    path = str(tmp_path / "datos.sqlite")
+    stored = run_transformer(sample_csv, ontology_path, store=path)
+    stored.g.close()
+    memory = run_transformer(sample_csv, ontology_path)
+    reopened = Graph(store=SQLiteStore(path, read_only=True))
+    assert isomorphic(without_timestamps(reopened), without_timestamps(memory.g))
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Pruebas del Pool de Términos - Proyecto Linked Data Universidades
+Un objeto por término distinto, sin cambiar los triples del grafo y sin guardar los términos
+propios de cada fila
+"""
+
+import numpy as np
+import pytest
+from rdflib import Literal, URIRef
+from rdflib.compare import isomorphic
+from rdflib.namespace import DC, RDFS, XSD
+
+from term_pool import TermPool
+from conftest import SAMPLE_ROWS, run_transformer, without_timestamps
+
+APPLIES_TO = URIRef("http://example.org/university/appliesTo")
+MAKES = URIRef("http://example.org/behavior/makes")
+SABER11_SCORE = URIRef("http://example.org/education/saber11Score")
+
+
+def test_devuelve_el_objeto_canonico_de_cada_termino():
+    pool = TermPool()
+    first = pool.intern(URIRef("http://example.org/a"))
+    assert pool.intern(URIRef("http://example.org/a")) is first
+    # Mismo texto con otro tipo de término o de dato: términos distintos
+    assert pool.intern(Literal("http://example.org/a")) is not first
+    assert pool.intern(Literal("1", datatype=XSD.integer)) is not pool.intern(Literal("1"))
+    assert (len(pool), pool.hits, pool.misses) == (4, 1, 4)
+
+    column = np.array([Literal("x"), None, Literal("x")], dtype=object)
+    pool.intern_column(column)
+    assert column[0] is column[2] and column[1] is None
+
+
+def test_pool_deshabilitado_devuelve_los_terminos_tal_cual():
+    pool = TermPool(enabled=False)
+    term = Literal("x")
+    assert pool.intern(term) is term and len(pool) == 0
+
+
+def test_grafo_con_terminos_internados(sample_csv, ontology_path):
+    interned = run_transformer(sample_csv, ontology_path, vectorized=True)
+    plain = run_transformer(sample_csv, ontology_path, vectorized=True, intern_terms=False)
+    assert isomorphic(without_timestamps(interned.g), without_timestamps(plain.g))
+
+    # Cada universidad referenciada es el mismo objeto en todos los triples
+    objects = {}
+    for university in interned.g.objects(None, APPLIES_TO):
+        assert objects.setdefault(university, university) is university
+
+
+@pytest.mark.parametrize("vectorized", [False, True])
+def test_pool_sin_terminos_propios_de_cada_fila(sample_csv, ontology_path, vectorized):
+    transformer = run_transformer(sample_csv, ontology_path, vectorized=vectorized)
+    pool = transformer.terms
+    for student, decision in transformer.g.subject_objects(MAKES):
+        assert student not in pool and decision not in pool
+        for predicate in (DC.identifier, RDFS.label, SABER11_SCORE):
+            assert transformer.g.value(student, predicate) not in pool
+        assert transformer.g.value(decision, RDFS.label) not in pool
+    # Los términos repetidos sí se internan: universidades, predicados y clases
+    assert all(university in pool for university in transformer.g.objects(None, APPLIES_TO))
+    assert MAKES in pool and len(pool) < SAMPLE_ROWS
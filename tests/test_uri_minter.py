@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Pruebas del Acuñador de URIs - Proyecto Linked Data Universidades
+URIs iguales a las de la limpieza original, por valor y por columna, y caché por tipo
+"""
+
+import hashlib
+
+import numpy as np
+import pandas as pd
+from rdflib import Namespace
+
+from uri_minter import URIMinter, clean_uri_component, decision_component
+
+GEO = Namespace("http://example.org/geography/")
+BEHAVIOR = Namespace("http://example.org/behavior/")
+
+
+def minter():
+    return URIMinter({
+        'city': (GEO, "city_"),
+        'decision': (BEHAVIOR, "decision_", decision_component),
+    })
+
+
+def test_limpieza_de_componentes():
+    assert clean_uri_component("  San José de Cúcuta ") == "san_josé_de_cúcuta"
+    assert clean_uri_component("Bogotá, D.C.") == "bogotá_dc"
+    assert clean_uri_component("Norte-de   Santander") == "norte-de_santander"
+    assert clean_uri_component(1234) == "1234"
+    assert clean_uri_component(None) == clean_uri_component(np.nan) == "unknown"
+
+
+def test_uris_por_valor_y_por_columna():
+    uris = minter()
+    assert uris.mint('city', "Santa Marta") == GEO["city_santa_marta"]
+    expected = hashlib.md5("EST001_U01".encode()).hexdigest()[:8]
+    assert uris.mint('decision', ("EST001", "U01")) == BEHAVIOR[f"decision_{expected}"]
+
+    column = uris.mint_column('city', pd.Series(["Cali", None, "Cali", "Neiva"]), skip_na=True)
+    assert list(column) == [GEO["city_cali"], None, GEO["city_cali"], GEO["city_neiva"]]
+    # Sin omitir nulos, un valor ausente se acuña como "unknown" (como la limpieza original)
+    column = uris.mint_column('city', pd.Series(["Cali", None]))
+    assert list(column) == [GEO["city_cali"], GEO["city_unknown"]]
+
+
+def test_cache_por_tipo_de_entidad():
+    uris = minter()
+    for name in ["Cali", "Neiva", "Cali", "Cali"]:
+        uris.mint('city', name)
+    for pair in [("E1", "U1"), ("E1", "U1")]:
+        uris.mint('decision', pair)
+    stats = uris.cache_stats()
+    assert stats['city'] == {'hits': 2, 'misses': 2, 'size': 2}
+    # Las decisiones son únicas por fila: sin caché
+    assert stats['decision']['size'] == 0
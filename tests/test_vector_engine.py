@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Pruebas del Motor Vectorizado - Proyecto Linked Data Universidades
+Mismas filas que rdflib en las consultas de análisis, comprobación de resultados cortados por LIMIT
+y arreglos reconstruidos cuando el grafo cambia sin cambiar de tamaño
+"""
+
+import pytest
+from rdflib import Literal, URIRef
+from rdflib.namespace import DC
+from rdflib.plugins.sparql import prepareQuery
+
+from int_store import STORE_NAME
+from sparql_analyzer import (ANALYSIS_NAMESPACES, ANALYSIS_QUERIES, SPARQLPatternAnalyzer,
+                             prepared_query, query_bindings)
+from vector_engine import (CrossCheckError, VectorEngine, VectorResult, check_results,
+                           same_results, without_slice)
+from conftest import quietly, run_transformer
+
+PARAMETERS = {
+    'migracion_geografica': {'min_flujo': 1},
+    'alto_rendimiento': {'umbral_puntaje': 300},
+}
+
+# Orden por una variable que no se proyecta: el LIMIT corta en un punto que las filas no muestran
+LIMITED_QUERY = """
+    SELECT ?universidad WHERE {
+        ?estudiante univ:appliesTo ?universidad .
+        ?estudiante edu:saber11Score ?puntaje .
+    }
+    ORDER BY DESC(?puntaje)
+    LIMIT 7
+"""
+
+
+@pytest.fixture
+def graph(sample_csv, ontology_path):
+    return run_transformer(sample_csv, ontology_path).g
+
+
+def test_mismas_filas_que_rdflib(graph):
+    engine = VectorEngine(graph)
+    for name in ANALYSIS_QUERIES:
+        prepared = prepared_query(name)
+        bindings = query_bindings(PARAMETERS.get(name, {}))
+        result = engine.query(prepared, bindings)
+        assert check_results(result, graph.query(prepared, initBindings=bindings), name)
+
+
+def test_resultado_cortado_sin_claves_proyectadas_no_se_da_por_bueno():
+    a, b, c = (Literal(i) for i in range(3))
+    # Sin las filas completas no hay forma de comprobarlo
+    assert not same_results([(a,), (b,)], [(a,), (c,)], None, truncated=True)
+    assert same_results([(a,), (b,)], [(a,), (c,)], None, truncated=True, complete=[(a,), (b,), (c,)])
+    assert not same_results([(a,), (b,)], [(a,), (a,)], None, truncated=True, complete=[(a,), (b,), (c,)])
+    # Con claves proyectadas, el último grupo de empates también debe salir del resultado completo
+    assert same_results([(a, a), (b, b)], [(a, a), (b, c)], [0], truncated=True, complete=[(a, a), (b, c)])
+    assert not same_results([(a, a), (b, b)], [(a, a), (b, c)], [0], truncated=True, complete=[(a, a), (b, b)])
+
+
+def test_crosscheck_con_limit_compara_sin_el(graph):
+    prepared = prepareQuery(LIMITED_QUERY, initNs=ANALYSIS_NAMESPACES)
+    result = VectorEngine(graph).query(prepared)
+    assert result.truncated and result.order_positions is None and len(result) == 7
+    complete = graph.query(without_slice(prepared))
+    assert len(complete) > 7
+    assert check_results(result, graph.query(prepared), complete=complete)
+
+    # Una fila que rdflib no produce nunca se detecta aunque el orden no pueda compararse
+    tampered = VectorResult(result.vars, result.rows[:-1] + [(URIRef("http://example.org/otra"),)],
+                            result.order_positions, result.truncated)
+    with pytest.raises(CrossCheckError):
+        check_results(tampered, graph.query(prepared), complete=complete)
+    with pytest.raises(CrossCheckError):
+        check_results(result, graph.query(prepared))
+
+    analyzer = quietly(SPARQLPatternAnalyzer, graph, use_cache=False, engine="crosscheck")
+    assert len(analyzer.evaluate(LIMITED_QUERY, {}, prepared)) == 7
+
+
+@pytest.mark.parametrize("store", ["default", STORE_NAME])
+def test_edicion_del_mismo_tamano_reconstruye_los_arreglos(sample_csv, ontology_path, store):
+    graph = run_transformer(sample_csv, ontology_path, vectorized=True, store=store).g
+    analyzer = quietly(SPARQLPatternAnalyzer, graph, engine="crosscheck")
+    quietly(analyzer.analyze_university_popularity)
+    name = analyzer.query_results['popularidad_universidades']['results'][0]['nombre']
+    university = next(s for s, title in graph.subject_objects(DC.title) if str(title) == name)
+
+    size = len(graph)
+    graph.set((university, DC.title, Literal("Universidad renombrada")))
+    assert len(graph) == size
+    # El cross-check compara con rdflib: con los arreglos anteriores fallaría
+    quietly(analyzer.analyze_university_popularity)
+    names = [row['nombre'] for row in analyzer.query_results['popularidad_universidades']['results']]
+    assert "Universidad renombrada" in names and name not in names